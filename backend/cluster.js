@@ -0,0 +1,84 @@
+// Runs server.js in one worker process per core so the API uses every CPU.
+// Workers share the listening port through the cluster module.
+//
+// Worker 0 is the leader. It alone runs the database-wide background jobs:
+// the query plan audit, task generation, the plant health recompute, and
+// seeding, syncing and snapshotting the plant catalogue. Diagnosis jobs are
+// leased per worker, so every worker resumes jobs whose owner has died.
+// Every worker keeps its own caches, view buffer, search indexes
+// and copy of the catalogue snapshot. A worker that crashes is replaced with the same index,
+// with a growing delay if it keeps dying soon after starting.
+//
+// Usage: npm start (CLUSTER_WORKERS=4 to override the core count)
+import 'dotenv/config';
+import cluster from 'cluster';
+import os from 'os';
+
+const WORKERS = parseInt(process.env.CLUSTER_WORKERS, 10) || os.availableParallelism();
+const SHUTDOWN_TIMEOUT_MS = parseInt(process.env.SHUTDOWN_TIMEOUT_MS, 10) || 10000;
+
+// A worker that exits within this long of starting counts as a crash loop
+const CRASH_WINDOW_MS = 5000;
+const MAX_RESTART_DELAY_MS = 30000;
+
+cluster.setupPrimary({ exec: new URL('./server.js', import.meta.url).pathname });
+
+const slots = new Map(); // worker.id -> { index, startedAt }
+const restartDelays = new Array(WORKERS).fill(0);
+let shuttingDown = false;
+
+const fork = (index) => {
+  const worker = cluster.fork({
+    CLUSTER_WORKER_INDEX: String(index),
+    CLUSTER_WORKERS: String(WORKERS)
+  });
+  slots.set(worker.id, { index, startedAt: Date.now() });
+};
+
+cluster.on('exit', (worker, code, signal) => {
+  const slot = slots.get(worker.id);
+  slots.delete(worker.id);
+
+  if (shuttingDown) {
+    if (slots.size === 0) {
+      console.log('👋 All workers stopped');
+      process.exit(0);
+    }
+    return;
+  }
+
+  const { index, startedAt } = slot;
+  const crashLoop = Date.now() - startedAt < CRASH_WINDOW_MS;
+  restartDelays[index] = crashLoop
+    ? Math.min(Math.max(restartDelays[index] * 2, 1000), MAX_RESTART_DELAY_MS)
+    : 0;
+
+  console.error(`❌ Worker ${index} (pid ${worker.process.pid}) exited with ${signal || code}; restarting in ${restartDelays[index]}ms`);
+  setTimeout(() => {
+    if (!shuttingDown) fork(index);
+  }, restartDelays[index]);
+});
+
+// Ask every worker to drain, then exit once they have; force it if a worker
+// is still running well after its own shutdown timeout
+const shutdown = (signal) => {
+  if (shuttingDown) return;
+  shuttingDown = true;
+  console.log(`\n🛑 ${signal} received, draining ${slots.size} workers`);
+
+  if (slots.size === 0) process.exit(0);
+  Object.values(cluster.workers).forEach(worker => worker.process.kill('SIGTERM'));
+
+  setTimeout(() => {
+    console.error('❌ Workers did not stop in time, exiting');
+    process.exit(1);
+  }, SHUTDOWN_TIMEOUT_MS + 5000).unref();
+};
+
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
+
+console.log(`🧵 Primary ${process.pid} starting ${WORKERS} workers`);
+for (let index = 0; index < WORKERS; index++) {
+  fork(index);
+}
@@ -1,15 +1,53 @@
 import mongoose from 'mongoose';
 
-const connectDB = async () => {
-  try {
-    const conn = await mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/urbaneos');
-
-    console.log(`✅ MongoDB Connected: ${conn.connection.host}`);
-    console.log(`📦 Database Name: ${conn.connection.name}`);
-  } catch (error) {
-    console.error(`❌ MongoDB Connection Error: ${error.message}`);
-    process.exit(1);
+// Pool and timeout settings. In cluster mode every worker opens its own pool,
+// so the server-side connection count is workers x MONGO_MAX_POOL_SIZE.
+const envInt = (name, fallback) => {
+  const value = parseInt(process.env[name], 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+const connectionOptions = () => ({
+  maxPoolSize: envInt('MONGO_MAX_POOL_SIZE', 20),
+  minPoolSize: envInt('MONGO_MIN_POOL_SIZE', 0),
+  serverSelectionTimeoutMS: envInt('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000),
+  connectTimeoutMS: envInt('MONGO_CONNECT_TIMEOUT_MS', 10000),
+  socketTimeoutMS: envInt('MONGO_SOCKET_TIMEOUT_MS', 45000)
+});
+
+const MAX_RETRY_DELAY_MS = 30000;
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Connect, retrying with exponential backoff (1s, 2s, 4s ... capped at 30s)
+// while Mongo is unreachable. Throws once `retries` attempts have failed;
+// MONGO_CONNECT_RETRIES=0 retries forever.
+const connectDB = async ({
+  retries = envInt('MONGO_CONNECT_RETRIES', 10),
+  retryDelayMs = envInt('MONGO_RETRY_DELAY_MS', 1000)
+} = {}) => {
+  const uri = process.env.MONGODB_URI || 'mongodb://localhost:27017/urbaneos';
+
+  for (let attempt = 1; ; attempt++) {
+    try {
+      const conn = await mongoose.connect(uri, connectionOptions());
+
+      console.log(`✅ MongoDB Connected: ${conn.connection.host}`);
+      console.log(`📦 Database Name: ${conn.connection.name}`);
+      return conn;
+    } catch (error) {
+      if (retries > 0 && attempt >= retries) {
+        console.error(`❌ MongoDB Connection Error: ${error.message} (giving up after ${attempt} attempts)`);
+        throw error;
+      }
+
+      const delay = Math.min(retryDelayMs * 2 ** (attempt - 1), MAX_RETRY_DELAY_MS);
+      console.error(`❌ MongoDB Connection Error: ${error.message} (attempt ${attempt}, retrying in ${delay}ms)`);
+      await sleep(delay);
+    }
   }
 };
 
+export const disconnectDB = () => mongoose.connection.close();
+
 export default connectDB;
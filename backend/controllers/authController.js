@@ -1,5 +1,6 @@
 import User from '../models/User.js';
 import { generateToken } from '../middleware/auth.js';
+import { invalidateCachedUser } from '../utils/userCache.js';
 import { formatErrorMessage, successResponse, errorResponse } from '../utils/helpers.js';
 
 // @desc    Register new user
@@ -84,6 +85,12 @@ export const login = async (req, res) => {
       return errorResponse(res, 'Invalid email or password', 401);
     }
 
+    // Upgrade the hash if BCRYPT_ROUNDS has changed since it was made;
+    // the pre-save hook rehashes the plaintext at the current cost
+    if (user.passwordNeedsRehash()) {
+      user.password = password;
+    }
+
     // Update last login
     user.lastLogin = Date.now();
     await user.save();
@@ -125,7 +132,10 @@ export const getMe = async (req, res) => {
 export const logout = async (req, res) => {
   try {
     // In a stateless JWT system, logout is handled on the client side
-    // by removing the token. This endpoint is just for confirmation.
+    // by removing the token. Drop the cached user so the next request
+    // re-reads it from the database.
+    invalidateCachedUser(req.user._id);
+
     successResponse(res, null, 'Logout successful');
   } catch (error) {
     console.error('Logout error:', error);
@@ -153,7 +163,7 @@ export const updatePassword = async (req, res) => {
       return errorResponse(res, 'Current password is incorrect', 401);
     }
 
-    // Update password
+    // Update password (the User post-save hook drops the cached user)
     user.password = newPassword;
     await user.save();
 
@@ -1 +1,303 @@
-// TODO: Implement in Phase 5
+import mongoose from 'mongoose';
+import Post from '../models/Post.js';
+import { parsePageLimit } from '../utils/helpers.js';
+import {
+  getFeed,
+  decoratePosts,
+  likePost as like,
+  unlikePost as unlike,
+  addReply as createReply,
+  deleteReply as removeReply,
+  getReplies as fetchReplies,
+  recordView,
+  getCommunityFeedStats,
+  FeedError,
+  AUTHOR_FIELDS
+} from '../services/communityFeed.js';
+import { indexPost, removePost } from '../services/searchService.js';
+import { getImageAsset } from '../services/imageService.js';
+
+// Fields an author may set on create/update
+const POST_FIELDS = ['title', 'content', 'category', 'tags', 'images'];
+
+const pick = (body, fields) => {
+  return Object.fromEntries(fields.filter(field => body[field] !== undefined).map(field => [field, body[field]]));
+};
+
+// Post fields from the request body; images must be ids of uploaded assets
+const readPostFields = async (body) => {
+  const fields = pick(body, POST_FIELDS);
+  if (fields.images === undefined) return fields;
+
+  if (!Array.isArray(fields.images)) throw new FeedError('images must be an array of image ids');
+  const assets = await Promise.all(fields.images.map(getImageAsset));
+  if (assets.some(asset => !asset)) {
+    throw new FeedError('images must be ids returned by POST /api/images');
+  }
+  return fields;
+};
+
+const handleCommunityError = (res, error, message) => {
+  console.error(`${message}:`, error.message);
+  res.status(error.statusCode || (error.name === 'ValidationError' ? 400 : 500)).json({
+    success: false,
+    message,
+    error: error.message
+  });
+};
+
+const postNotFound = (res) => {
+  return res.status(404).json({
+    success: false,
+    message: 'Post not found'
+  });
+};
+
+const sendFeed = async (req, res, options) => {
+  const { items, nextCursor } = await getFeed({
+    ...options,
+    cursor: req.query.cursor,
+    limit: parsePageLimit(req.query.limit)
+  });
+  const posts = await decoratePosts(items, req.user?._id);
+
+  res.status(200).json({
+    success: true,
+    count: posts.length,
+    posts,
+    nextCursor
+  });
+};
+
+// @desc    Community feed, newest first or ranked
+// @route   GET /api/community/posts?sort=recent|hot|top&category=Plant Care&limit=20&cursor=<nextCursor>
+// @access  Public (likedByMe is set when signed in)
+export const getPosts = async (req, res) => {
+  try {
+    await sendFeed(req, res, { sort: req.query.sort, category: req.query.category });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to fetch posts');
+  }
+};
+
+// @desc    Hot posts, optionally within one category
+// @route   GET /api/community/posts/popular?category=Plant Care&cursor=<nextCursor>
+// @access  Public
+export const getPopularPosts = async (req, res) => {
+  try {
+    await sendFeed(req, res, { sort: 'hot', category: req.query.category });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to fetch popular posts');
+  }
+};
+
+// @desc    Posts by the logged-in user, newest first
+// @route   GET /api/community/my-posts?cursor=<nextCursor>
+// @access  Private
+export const getMyPosts = async (req, res) => {
+  try {
+    await sendFeed(req, res, { sort: 'recent', author: req.user._id });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to fetch your posts');
+  }
+};
+
+// @desc    Get a single post and count a view
+// @route   GET /api/community/posts/:id
+// @access  Public
+export const getPostById = async (req, res) => {
+  try {
+    if (!mongoose.isValidObjectId(req.params.id)) return postNotFound(res);
+
+    const post = await Post.findOne({ _id: req.params.id, isActive: true })
+      .populate('author', AUTHOR_FIELDS)
+      .lean();
+
+    if (!post) return postNotFound(res);
+
+    recordView(post._id);
+    const [decorated] = await decoratePosts([post], req.user?._id);
+
+    res.status(200).json({
+      success: true,
+      post: decorated
+    });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to fetch post');
+  }
+};
+
+// @desc    Create a post
+// @route   POST /api/community/posts
+// @access  Private
+export const createPost = async (req, res) => {
+  try {
+    const post = await Post.create({
+      ...(await readPostFields(req.body)),
+      author: req.user._id
+    });
+    indexPost(post);
+
+    res.status(201).json({
+      success: true,
+      message: 'Post created successfully',
+      post
+    });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to create post');
+  }
+};
+
+// @desc    Update own post
+// @route   PUT /api/community/posts/:id
+// @access  Private
+export const updatePost = async (req, res) => {
+  try {
+    if (!mongoose.isValidObjectId(req.params.id)) return postNotFound(res);
+
+    // Loaded and saved (not findOneAndUpdate) so the excerpt is re-derived
+    const post = await Post.findOne({ _id: req.params.id, author: req.user._id, isActive: true });
+
+    if (!post) return postNotFound(res);
+
+    post.set(await readPostFields(req.body));
+    await post.save();
+    indexPost(post);
+
+    res.status(200).json({
+      success: true,
+      message: 'Post updated successfully',
+      post
+    });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to update post');
+  }
+};
+
+// @desc    Delete own post (soft delete)
+// @route   DELETE /api/community/posts/:id
+// @access  Private
+export const deletePost = async (req, res) => {
+  try {
+    if (!mongoose.isValidObjectId(req.params.id)) return postNotFound(res);
+
+    const { matchedCount } = await Post.updateOne(
+      { _id: req.params.id, author: req.user._id, isActive: true },
+      { $set: { isActive: false } }
+    );
+
+    if (matchedCount === 0) return postNotFound(res);
+    removePost(req.params.id);
+
+    res.status(200).json({
+      success: true,
+      message: 'Post deleted successfully'
+    });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to delete post');
+  }
+};
+
+// @desc    Like a post
+// @route   POST /api/community/posts/:id/like
+// @access  Private
+export const likePost = async (req, res) => {
+  try {
+    if (!mongoose.isValidObjectId(req.params.id)) return postNotFound(res);
+
+    const result = await like(req.params.id, req.user._id);
+    res.status(200).json({ success: true, ...result });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to like post');
+  }
+};
+
+// @desc    Remove a like
+// @route   DELETE /api/community/posts/:id/like
+// @access  Private
+export const unlikePost = async (req, res) => {
+  try {
+    if (!mongoose.isValidObjectId(req.params.id)) return postNotFound(res);
+
+    const result = await unlike(req.params.id, req.user._id);
+    res.status(200).json({ success: true, ...result });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to unlike post');
+  }
+};
+
+// @desc    Replies to a post, oldest first
+// @route   GET /api/community/posts/:id/replies?limit=50&cursor=<nextCursor>
+// @access  Public
+export const getReplies = async (req, res) => {
+  try {
+    if (!mongoose.isValidObjectId(req.params.id)) return postNotFound(res);
+
+    const { items: replies, nextCursor } = await fetchReplies(req.params.id, {
+      cursor: req.query.cursor,
+      limit: parsePageLimit(req.query.limit)
+    });
+
+    res.status(200).json({
+      success: true,
+      count: replies.length,
+      replies,
+      nextCursor
+    });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to fetch replies');
+  }
+};
+
+// @desc    Reply to a post
+// @route   POST /api/community/posts/:id/replies
+// @access  Private
+export const addReply = async (req, res) => {
+  try {
+    if (!mongoose.isValidObjectId(req.params.id)) return postNotFound(res);
+
+    const reply = await createReply(req.params.id, req.user._id, req.body.content);
+
+    res.status(201).json({
+      success: true,
+      message: 'Reply added successfully',
+      reply
+    });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to add reply');
+  }
+};
+
+// @desc    Delete own reply
+// @route   DELETE /api/community/posts/:postId/replies/:replyId
+// @access  Private
+export const deleteReply = async (req, res) => {
+  try {
+    const { postId, replyId } = req.params;
+    if (!mongoose.isValidObjectId(postId) || !mongoose.isValidObjectId(replyId)) {
+      return res.status(404).json({
+        success: false,
+        message: 'Reply not found'
+      });
+    }
+
+    await removeReply(postId, replyId, req.user._id);
+
+    res.status(200).json({
+      success: true,
+      message: 'Reply deleted successfully'
+    });
+  } catch (error) {
+    handleCommunityError(res, error, 'Failed to delete reply');
+  }
+};
+
+// @desc    View-buffer counters
+// @route   GET /api/community/stats
+// @access  Public
+export const getCommunityStats = (req, res) => {
+  res.status(200).json({
+    success: true,
+    stats: getCommunityFeedStats()
+  });
+};
@@ -0,0 +1,24 @@
+import { getDashboardSummary as fetchDashboardSummary } from '../services/dashboardService.js';
+
+// @desc    Plant, task and harvest summary for the dashboard in one request
+// @route   GET /api/dashboard/summary
+// @access  Private
+export const getDashboardSummary = async (req, res) => {
+  try {
+    const { summary, cached } = await fetchDashboardSummary(req.user._id);
+
+    res.set('Cache-Control', 'private, no-cache');
+    res.status(200).json({
+      success: true,
+      cached,
+      summary
+    });
+  } catch (error) {
+    console.error('Dashboard summary error:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Failed to load dashboard summary',
+      error: error.message
+    });
+  }
+};
@@ -1 +1,199 @@
-// TODO: Implement in Phase 4
+import PlantDiagnosis from '../models/PlantDiagnosis.js';
+import Plant from '../models/Plant.js';
+import { hashBands } from '../utils/imageHash.js';
+import { storeImage, getImageAsset, imageUrls } from '../services/imageService.js';
+import {
+  findCachedResult,
+  enqueueDiagnosis,
+  diagnosisLease,
+  waitForDiagnosis,
+  getDiagnosisQueueStats
+} from '../services/diagnosisQueue.js';
+
+const MAX_WAIT_SECONDS = 30;
+const DIAGNOSIS_FIELDS = '-perceptualHash -hashBands';
+
+// Legacy JSON uploads: raw base64 or a data URL ("data:image/jpeg;base64,...")
+const decodeImage = (image) => {
+  if (typeof image !== 'string') return null;
+  const buffer = Buffer.from(image.replace(/^data:[^;]+;base64,/, ''), 'base64');
+  return buffer.length ? buffer : null;
+};
+
+// The image comes as a multipart file, the id of an earlier upload, or base64
+const resolveImage = async (req) => {
+  if (req.file) return req.file.asset;
+
+  const { imageId, image } = req.body || {};
+  if (imageId) return getImageAsset(imageId);
+
+  const buffer = decodeImage(image);
+  return buffer ? storeImage(buffer, { uploadedBy: req.user._id }) : null;
+};
+
+// @desc    Submit a plant image for diagnosis
+// @route   POST /api/diagnosis/identify
+// @access  Private
+export const identifyPlant = async (req, res) => {
+  try {
+    const { plantId } = req.body || {};
+
+    if (plantId) {
+      const plant = await Plant.exists({ _id: plantId, user: req.user._id });
+      if (!plant) {
+        return res.status(404).json({
+          success: false,
+          message: 'Plant not found'
+        });
+      }
+    }
+
+    const asset = await resolveImage(req);
+    if (!asset) {
+      return res.status(400).json({
+        success: false,
+        message: 'An image upload, imageId or base64 image is required'
+      });
+    }
+
+    // The blob id is the sha256 of the image bytes
+    const hashes = {
+      imageHash: asset._id,
+      perceptualHash: asset.perceptualHash,
+      hashBands: asset.perceptualHash ? hashBands(asset.perceptualHash) : []
+    };
+    const cachedResult = await findCachedResult(hashes);
+
+    if (cachedResult) {
+      const diagnosis = await PlantDiagnosis.create({
+        user: req.user._id,
+        plant: plantId,
+        image: asset._id,
+        ...hashes,
+        cacheHit: true,
+        status: 'completed',
+        diagnosisResult: cachedResult
+      });
+
+      return res.status(200).json({
+        success: true,
+        message: 'Diagnosis completed',
+        diagnosisId: diagnosis._id,
+        status: diagnosis.status,
+        image: imageUrls(asset._id),
+        cacheHit: true,
+        diagnosisResult: diagnosis.diagnosisResult
+      });
+    }
+
+    const diagnosis = await PlantDiagnosis.create({
+      user: req.user._id,
+      plant: plantId,
+      image: asset._id,
+      ...hashes,
+      ...diagnosisLease()
+    });
+
+    try {
+      enqueueDiagnosis({ id: diagnosis._id, image: asset._id, imageHash: hashes.imageHash });
+    } catch (error) {
+      await PlantDiagnosis.deleteOne({ _id: diagnosis._id });
+      throw error;
+    }
+
+    res.set('Location', `/api/diagnosis/${diagnosis._id}`);
+    res.status(202).json({
+      success: true,
+      message: 'Diagnosis queued',
+      diagnosisId: diagnosis._id,
+      status: diagnosis.status,
+      image: imageUrls(asset._id)
+    });
+  } catch (error) {
+    console.error('Identify plant error:', error);
+    res.status(error.statusCode || 500).json({
+      success: false,
+      message: error.statusCode ? error.message : 'Error submitting diagnosis',
+      error: error.message
+    });
+  }
+};
+
+// @desc    Get a diagnosis; ?wait=N long-polls up to N seconds while processing
+// @route   GET /api/diagnosis/:id
+// @access  Private
+export const getDiagnosis = async (req, res) => {
+  try {
+    const filter = { _id: req.params.id, user: req.user._id };
+    let diagnosis = await PlantDiagnosis.findOne(filter).select(DIAGNOSIS_FIELDS).lean();
+
+    if (!diagnosis) {
+      return res.status(404).json({
+        success: false,
+        message: 'Diagnosis not found'
+      });
+    }
+
+    const waitSeconds = Math.min(parseInt(req.query.wait, 10) || 0, MAX_WAIT_SECONDS);
+    if (diagnosis.status === 'processing' && waitSeconds > 0) {
+      await waitForDiagnosis(diagnosis._id, waitSeconds * 1000);
+      diagnosis = await PlantDiagnosis.findOne(filter).select(DIAGNOSIS_FIELDS).lean();
+    }
+
+    if (diagnosis.status === 'processing') {
+      res.set('Retry-After', '3');
+    }
+
+    res.status(200).json({
+      success: true,
+      diagnosis
+    });
+  } catch (error) {
+    console.error('Get diagnosis error:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Error fetching diagnosis',
+      error: error.message
+    });
+  }
+};
+
+// @desc    Get the user's diagnosis history
+// @route   GET /api/diagnosis/history
+// @access  Private
+export const getDiagnosisHistory = async (req, res) => {
+  try {
+    const filter = { user: req.user._id };
+    if (req.query.plantId) filter.plant = req.query.plantId;
+
+    const limit = Math.min(parseInt(req.query.limit, 10) || 20, 100);
+    const diagnoses = await PlantDiagnosis.find(filter)
+      .select(DIAGNOSIS_FIELDS)
+      .sort({ createdAt: -1 })
+      .limit(limit)
+      .lean();
+
+    res.status(200).json({
+      success: true,
+      count: diagnoses.length,
+      diagnoses
+    });
+  } catch (error) {
+    console.error('Get diagnosis history error:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Error fetching diagnosis history',
+      error: error.message
+    });
+  }
+};
+
+// @desc    Diagnosis queue depth, cache hit and latency metrics
+// @route   GET /api/diagnosis/stats
+// @access  Private
+export const getDiagnosisStats = async (req, res) => {
+  res.status(200).json({
+    success: true,
+    stats: getDiagnosisQueueStats()
+  });
+};
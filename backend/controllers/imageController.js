@@ -0,0 +1,71 @@
+import { blobPath } from '../services/blobStore.js';
+import { getImageAsset, toImageResponse, IMAGE_VARIANTS } from '../services/imageService.js';
+
+// @desc    Upload an image (multipart field `image`)
+// @route   POST /api/images
+// @access  Private
+export const createImage = async (req, res) => {
+  if (!req.file) {
+    return res.status(400).json({
+      success: false,
+      message: 'An image file (JPEG, PNG or WebP) is required in the `image` field'
+    });
+  }
+
+  res.status(201).json({
+    success: true,
+    message: 'Image uploaded successfully',
+    image: toImageResponse(req.file.asset)
+  });
+};
+
+// @desc    Serve an image or one of its resized variants (?size=thumb|medium)
+// @route   GET /api/images/:id
+// @access  Public
+export const getImage = async (req, res) => {
+  try {
+    const { size } = req.query;
+    if (size && !IMAGE_VARIANTS[size]) {
+      return res.status(400).json({
+        success: false,
+        message: `size must be one of: ${Object.keys(IMAGE_VARIANTS).join(', ')}`
+      });
+    }
+
+    const asset = await getImageAsset(req.params.id);
+    const blobId = size ? asset?.variants?.[size] : asset?._id;
+
+    if (!blobId) {
+      return res.status(404).json({
+        success: false,
+        message: 'Image not found'
+      });
+    }
+
+    // Blob ids are content hashes, so the ETag is exact and the bytes never
+    // change; sendFile answers If-None-Match with 304 and handles Range/If-Range
+    res.sendFile(blobPath(blobId), {
+      etag: false,
+      lastModified: false,
+      headers: {
+        'Content-Type': size ? 'image/webp' : asset.contentType,
+        'ETag': `"${blobId}"`,
+        'Cache-Control': 'public, max-age=31536000, immutable'
+      }
+    }, (error) => {
+      if (error && !res.headersSent) {
+        res.status(404).json({
+          success: false,
+          message: 'Image not found'
+        });
+      }
+    });
+  } catch (error) {
+    console.error('Get image error:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Error fetching image',
+      error: error.message
+    });
+  }
+};
@@ -0,0 +1,93 @@
+import { monitorEventLoopDelay } from 'perf_hooks';
+import { registry } from '../utils/metrics.js';
+import logger from '../utils/logger.js';
+import { getUserCacheStats } from '../utils/userCache.js';
+import { getDashboardCacheStats } from '../utils/dashboardCache.js';
+import { getWeatherStats } from '../services/weatherService.js';
+import { getSearchStats } from '../services/searchService.js';
+import { getDiagnosisQueueStats } from '../services/diagnosisQueue.js';
+import { getGatewayStats, PROVIDERS } from '../services/apiGateway.js';
+
+// Gauges below are filled from the services' own stats on each scrape;
+// request and Mongo histograms are recorded as they happen
+// (middleware/requestMetrics.js, utils/mongoMetrics.js).
+const eventLoopDelay = monitorEventLoopDelay({ resolution: 10 });
+eventLoopDelay.enable();
+
+const eventLoopLag = registry.gauge(
+  'nodejs_eventloop_lag_seconds',
+  'Event loop delay since the previous scrape',
+  ['quantile']
+);
+const memory = registry.gauge('nodejs_memory_bytes', 'Process memory usage', ['type']);
+const uptime = registry.gauge('process_uptime_seconds', 'Seconds since the process started');
+
+const cacheHits = registry.counter('app_cache_hits_total', 'Cache lookups served from the cache', ['cache']);
+const cacheMisses = registry.counter('app_cache_misses_total', 'Cache lookups that missed', ['cache']);
+const cacheEntries = registry.gauge('app_cache_entries', 'Entries currently cached', ['cache']);
+const cacheHitRatio = registry.gauge('app_cache_hit_ratio', 'Hits over lookups since start', ['cache']);
+
+const diagnosisQueueDepth = registry.gauge('app_diagnosis_queue_depth', 'Diagnoses waiting for a worker');
+const providerQuotaUsed = registry.gauge('app_provider_quota_used', 'Quota units used this period, as last seen by this process', ['provider']);
+const providerQuotaLimit = registry.gauge('app_provider_quota_limit', 'Quota units allowed per period', ['provider']);
+const providerCircuitOpen = registry.gauge('app_provider_circuit_open', '1 while the provider circuit is open or half-open', ['provider']);
+const logLines = registry.counter('app_log_lines_total', 'Structured log lines', ['result']);
+
+const NS_PER_SECOND = 1e9;
+
+const collect = () => {
+  // Quantiles cover the window since the last scrape, then start over
+  [['0.5', 50], ['0.9', 90], ['0.99', 99]].forEach(([quantile, percentile]) => {
+    eventLoopLag.set({ quantile }, eventLoopDelay.percentile(percentile) / NS_PER_SECOND);
+  });
+  eventLoopLag.set({ quantile: '1' }, eventLoopDelay.max / NS_PER_SECOND);
+  eventLoopDelay.reset();
+
+  const usage = process.memoryUsage();
+  ['rss', 'heapUsed', 'heapTotal', 'external', 'arrayBuffers'].forEach(type => {
+    memory.set({ type }, usage[type]);
+  });
+  uptime.set({}, process.uptime());
+
+  const weather = getWeatherStats();
+  const caches = {
+    users: getUserCacheStats(),
+    dashboard: getDashboardCacheStats(),
+    plant_search: getSearchStats().plantIndexCache,
+    // Stale entries served while refreshing count as hits
+    weather: {
+      hits: weather.hits + weather.staleServed,
+      misses: weather.misses,
+      size: weather.entries,
+      hitRate: weather.hitRate
+    }
+  };
+  Object.entries(caches).forEach(([cache, stats]) => {
+    cacheHits.set({ cache }, stats.hits);
+    cacheMisses.set({ cache }, stats.misses);
+    cacheEntries.set({ cache }, stats.size);
+    cacheHitRatio.set({ cache }, stats.hitRate);
+  });
+
+  diagnosisQueueDepth.set({}, getDiagnosisQueueStats().queueDepth);
+
+  Object.entries(getGatewayStats().providers).forEach(([provider, stats]) => {
+    if (stats.quotaUsed !== null) providerQuotaUsed.set({ provider }, stats.quotaUsed);
+    providerQuotaLimit.set({ provider }, PROVIDERS[provider].quota.limit);
+    providerCircuitOpen.set({ provider }, stats.circuit.state === 'closed' ? 0 : 1);
+  });
+
+  const { written, dropped } = logger.stats();
+  logLines.set({ result: 'written' }, written);
+  logLines.set({ result: 'dropped' }, dropped);
+};
+
+// @desc    Metrics in the Prometheus text format
+// @route   GET /api/metrics
+// @access  Bearer METRICS_TOKEN (open outside production when unset)
+export const getMetrics = (req, res) => {
+  collect();
+  res.set('Content-Type', 'text/plain; version=0.0.4; charset=utf-8');
+  res.set('Cache-Control', 'no-store');
+  res.status(200).send(registry.render());
+};
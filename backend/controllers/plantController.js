@@ -1,18 +1,86 @@
+import mongoose from 'mongoose';
 import Plant from '../models/Plant.js';
+import {
+  parsePageLimit,
+  decodeCursor,
+  keysetFilter,
+  buildPage,
+  parseFields,
+  MAX_BULK_ITEMS,
+  insertManyWithResults
+} from '../utils/helpers.js';
+import { scheduleTaskGeneration, removeScheduledTasks, FINISHED_STATUSES } from '../services/taskScheduler.js';
+import { indexPlant, removePlant } from '../services/searchService.js';
+import { invalidateDashboard } from '../utils/dashboardCache.js';
+import { computePlantHealth } from '../utils/plantHealth.js';
+import { sendConditional } from '../middleware/conditionalGet.js';
+
+// Fields list views may ask for with ?fields=. The notes and harvestLog arrays
+// grow without bound, so they are only returned by GET /api/plants/:id.
+const PLANT_SUMMARY_FIELDS = [
+  'name', 'type', 'variety', 'image', 'plantedDate', 'expectedHarvestDate',
+  'daysGrowing', 'health', 'wateringOverdueDays', 'status', 'location', 'careSchedule', 'createdAt', 'updatedAt'
+];
+
+// Written by the health job without bumping updatedAt, so part of the ETag
+const PLANT_VALIDATOR_FIELDS = ['health', 'daysGrowing', 'wateringOverdueDays'];
+
+// Never taken from the request body. The derived fields are recomputed from
+// the schedule and status on every save, so a client value would be lost.
+const READ_ONLY_FIELDS = new Set(['_id', 'user', 'isActive', 'taskGeneration', ...PLANT_VALIDATOR_FIELDS]);
+
+const writableFields = (body) => {
+  return Object.fromEntries(Object.entries(body).filter(([key]) => !READ_ONLY_FIELDS.has(key)));
+};
+
+// Caps on the embedded logs; $push keeps only the newest entries
+const MAX_PLANT_NOTES = 500;
+const MAX_HARVEST_LOG = 1000;
+
+// Care schedule fields a client may set, per section
+const CARE_SCHEDULE_FIELDS = {
+  watering: ['frequency', 'lastWatered', 'nextWatering'],
+  fertilizing: ['frequency', 'lastFertilized', 'nextFertilizing'],
+  pruning: ['frequency', 'lastPruned']
+};
+
+// Query builders, also explained by the query plan audit (utils/queryPlanAudit.js)
+export const ownPlantFilter = (id, userId) => ({ _id: id, user: userId, isActive: true });
+
+export const plantPageQuery = (userId, cursor, limit) => {
+  return Plant.find({ user: userId, isActive: true, ...(cursor && keysetFilter(cursor, 'createdAt', -1)) })
+    .sort({ createdAt: -1, _id: -1 })
+    .limit(limit + 1);
+};
 
-// @desc    Get all plants for logged-in user
-// @route   GET /api/plants
+// @desc    Get all plants for logged-in user, newest first
+// @route   GET /api/plants?limit=50&cursor=<nextCursor>&fields=name,health,status
 // @access  Private
 export const getAllPlants = async (req, res) => {
   try {
-    const plants = await Plant.find({ user: req.user._id, isActive: true })
-      .sort({ createdAt: -1 });
+    const limit = parsePageLimit(req.query.limit);
+    const projection = parseFields(req.query.fields, PLANT_SUMMARY_FIELDS, PLANT_SUMMARY_FIELDS, ['createdAt', 'updatedAt']);
+    const cursor = req.query.cursor ? decodeCursor(req.query.cursor) : null;
 
-    res.status(200).json({
+    if (req.query.cursor && !cursor) {
+      return res.status(400).json({
+        success: false,
+        message: 'Invalid cursor'
+      });
+    }
+
+    const docs = await plantPageQuery(req.user._id, cursor, limit)
+      .select(projection)
+      .lean();
+
+    const { items: plants, nextCursor } = buildPage(docs, limit, 'createdAt');
+
+    sendConditional(req, res, {
       success: true,
       count: plants.length,
-      plants
-    });
+      plants,
+      nextCursor
+    }, plants, PLANT_VALIDATOR_FIELDS);
   } catch (error) {
     console.error('Get plants error:', error);
     res.status(500).json({
@@ -28,11 +96,7 @@ export const getAllPlants = async (req, res) => {
 // @access  Private
 export const getPlantById = async (req, res) => {
   try {
-    const plant = await Plant.findOne({
-      _id: req.params.id,
-      user: req.user._id,
-      isActive: true
-    });
+    const plant = await Plant.findOne(ownPlantFilter(req.params.id, req.user._id)).lean();
 
     if (!plant) {
       return res.status(404).json({
@@ -41,10 +105,13 @@ export const getPlantById = async (req, res) => {
       });
     }
 
-    res.status(200).json({
+    // The stored values may be up to one health-job interval old
+    Object.assign(plant, computePlantHealth(plant));
+
+    sendConditional(req, res, {
       success: true,
       plant
-    });
+    }, [plant], PLANT_VALIDATOR_FIELDS);
   } catch (error) {
     console.error('Get plant error:', error);
     res.status(500).json({
@@ -61,11 +128,16 @@ export const getPlantById = async (req, res) => {
 export const createPlant = async (req, res) => {
   try {
     const plantData = {
-      ...req.body,
+      ...writableFields(req.body),
       user: req.user._id
     };
 
     const plant = await Plant.create(plantData);
+    indexPlant(plant);
+
+    if (req.body.careSchedule) {
+      scheduleTaskGeneration(plant._id);
+    }
 
     res.status(201).json({
       success: true,
@@ -82,16 +154,58 @@ export const createPlant = async (req, res) => {
   }
 };
 
+// @desc    Create many plants in one request
+// @route   POST /api/plants/bulk
+// @access  Private
+export const createPlantsBulk = async (req, res) => {
+  try {
+    const { plants } = req.body;
+
+    if (!Array.isArray(plants) || plants.length === 0 || plants.length > MAX_BULK_ITEMS) {
+      return res.status(400).json({
+        success: false,
+        message: `Provide between 1 and ${MAX_BULK_ITEMS} plants`
+      });
+    }
+
+    // insertMany skips save hooks, so derive daysGrowing and health here
+    const entries = plants.map(plantData => {
+      const plant = new Plant({ ...writableFields(plantData), user: req.user._id });
+      plant.updateDerivedFields();
+      return plant;
+    });
+
+    const results = (await insertManyWithResults(Plant, entries)).map(({ doc, ...result }) => {
+      if (!doc) return result;
+      indexPlant(doc);
+      return { ...result, plant: doc };
+    });
+    invalidateDashboard(req.user._id);
+    const created = results.filter(result => result.success).length;
+
+    res.status(created > 0 ? 201 : 400).json({
+      success: created > 0,
+      message: `${created} of ${plants.length} plants added`,
+      created,
+      failed: plants.length - created,
+      results
+    });
+  } catch (error) {
+    console.error('Bulk create plants error:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Failed to create plants',
+      error: error.message
+    });
+  }
+};
+
 // @desc    Update plant
 // @route   PUT /api/plants/:id
 // @access  Private
 export const updatePlant = async (req, res) => {
   try {
-    const plant = await Plant.findOne({
-      _id: req.params.id,
-      user: req.user._id,
-      isActive: true
-    });
+    const plant = await Plant.findOne(ownPlantFilter(req.params.id, req.user._id));
 
     if (!plant) {
       return res.status(404).json({
@@ -101,13 +215,19 @@ export const updatePlant = async (req, res) => {
     }
 
     // Update plant fields
-    Object.keys(req.body).forEach(key => {
-      if (key !== 'user' && key !== '_id') {
-        plant[key] = req.body[key];
-      }
+    Object.entries(writableFields(req.body)).forEach(([key, value]) => {
+      plant[key] = value;
     });
 
+    const finished = plant.isModified('status') && FINISHED_STATUSES.includes(plant.status);
     await plant.save();
+    indexPlant(plant);
+
+    if (finished) {
+      await removeScheduledTasks(plant);
+    } else if (req.body.careSchedule) {
+      scheduleTaskGeneration(plant._id);
+    }
 
     res.status(200).json({
       success: true,
@@ -129,11 +249,7 @@ export const updatePlant = async (req, res) => {
 // @access  Private
 export const deletePlant = async (req, res) => {
   try {
-    const plant = await Plant.findOne({
-      _id: req.params.id,
-      user: req.user._id,
-      isActive: true
-    });
+    const plant = await Plant.findOne(ownPlantFilter(req.params.id, req.user._id));
 
     if (!plant) {
       return res.status(404).json({
@@ -145,6 +261,8 @@ export const deletePlant = async (req, res) => {
     // Soft delete
     plant.isActive = false;
     await plant.save();
+    removePlant(req.user._id, plant._id);
+    await removeScheduledTasks(plant);
 
     res.status(200).json({
       success: true,
@@ -165,11 +283,19 @@ export const deletePlant = async (req, res) => {
 // @access  Private
 export const addPlantNote = async (req, res) => {
   try {
-    const plant = await Plant.findOne({
-      _id: req.params.id,
-      user: req.user._id,
-      isActive: true
-    });
+    const note = {
+      _id: new mongoose.Types.ObjectId(),
+      date: new Date(),
+      content: req.body.content,
+      type: req.body.type || 'observation'
+    };
+
+    // Single atomic $push, so notes logged from two devices at once both land
+    const plant = await Plant.findOneAndUpdate(
+      ownPlantFilter(req.params.id, req.user._id),
+      { $push: { notes: { $each: [note], $slice: -MAX_PLANT_NOTES } } },
+      { new: true, runValidators: true, projection: { _id: 1 } }
+    ).lean();
 
     if (!plant) {
       return res.status(404).json({
@@ -178,19 +304,10 @@ export const addPlantNote = async (req, res) => {
       });
     }
 
-    const note = {
-      date: new Date(),
-      content: req.body.content,
-      type: req.body.type || 'observation'
-    };
-
-    plant.notes.push(note);
-    await plant.save();
-
     res.status(200).json({
       success: true,
       message: 'Note added successfully',
-      plant
+      note
     });
   } catch (error) {
     console.error('Add note error:', error);
@@ -207,47 +324,44 @@ export const addPlantNote = async (req, res) => {
 // @access  Private
 export const updateCareSchedule = async (req, res) => {
   try {
-    const plant = await Plant.findOne({
-      _id: req.params.id,
-      user: req.user._id,
-      isActive: true
+    // Only the fields sent are $set; the rest of each section is left alone
+    const update = {};
+    Object.entries(CARE_SCHEDULE_FIELDS).forEach(([section, fields]) => {
+      if (!req.body[section]) return;
+
+      fields.forEach(field => {
+        if (req.body[section][field] !== undefined) {
+          update[`careSchedule.${section}.${field}`] = req.body[section][field];
+        }
+      });
     });
 
-    if (!plant) {
-      return res.status(404).json({
+    if (Object.keys(update).length === 0) {
+      return res.status(400).json({
         success: false,
-        message: 'Plant not found'
+        message: 'No care schedule fields provided'
       });
     }
 
-    // Update care schedule
-    if (req.body.watering) {
-      plant.careSchedule.watering = {
-        ...plant.careSchedule.watering,
-        ...req.body.watering
-      };
-    }
-
-    if (req.body.fertilizing) {
-      plant.careSchedule.fertilizing = {
-        ...plant.careSchedule.fertilizing,
-        ...req.body.fertilizing
-      };
-    }
+    const plant = await Plant.findOneAndUpdate(
+      ownPlantFilter(req.params.id, req.user._id),
+      { $set: update },
+      { new: true, runValidators: true, projection: { careSchedule: 1 } }
+    ).lean();
 
-    if (req.body.pruning) {
-      plant.careSchedule.pruning = {
-        ...plant.careSchedule.pruning,
-        ...req.body.pruning
-      };
+    if (!plant) {
+      return res.status(404).json({
+        success: false,
+        message: 'Plant not found'
+      });
     }
 
-    await plant.save();
+    scheduleTaskGeneration(plant._id);
 
     res.status(200).json({
       success: true,
       message: 'Care schedule updated successfully',
-      plant
+      careSchedule: plant.careSchedule
     });
   } catch (error) {
     console.error('Update care schedule error:', error);
@@ -264,34 +378,32 @@ export const updateCareSchedule = async (req, res) => {
 // @access  Private
 export const addHarvestLog = async (req, res) => {
   try {
-    const plant = await Plant.findOne({
-      _id: req.params.id,
-      user: req.user._id,
-      isActive: true
-    });
-
-    if (!plant) {
-      return res.status(404).json({
-        success: false,
-        message: 'Plant not found'
-      });
-    }
-
     const harvestEntry = {
-      date: req.body.date || new Date(),
+      _id: new mongoose.Types.ObjectId(),
+      date: req.body.date ? new Date(req.body.date) : new Date(),
       quantity: req.body.quantity,
       unit: req.body.unit,
       quality: req.body.quality,
       notes: req.body.notes
     };
 
-    plant.harvestLog.push(harvestEntry);
-    await plant.save();
+    const plant = await Plant.findOneAndUpdate(
+      ownPlantFilter(req.params.id, req.user._id),
+      { $push: { harvestLog: { $each: [harvestEntry], $slice: -MAX_HARVEST_LOG } } },
+      { new: true, runValidators: true, projection: { _id: 1 } }
+    ).lean();
+
+    if (!plant) {
+      return res.status(404).json({
+        success: false,
+        message: 'Plant not found'
+      });
+    }
 
     res.status(200).json({
       success: true,
       message: 'Harvest log added successfully',
-      plant
+      harvest: harvestEntry
     });
   } catch (error) {
     console.error('Add harvest log error:', error);
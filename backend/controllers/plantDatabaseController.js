@@ -0,0 +1,94 @@
+import mongoose from 'mongoose';
+import { parsePageLimit } from '../utils/helpers.js';
+import { listCatalogPlants, getCatalogPlant } from '../services/plantCatalog.js';
+import { searchCatalog } from '../services/searchService.js';
+import { parseSearchQuery, missingQuery } from './searchController.js';
+
+// contracts.md: plant database responses are cacheable for 24 hours
+const CATALOG_CACHE_CONTROL = 'public, max-age=86400';
+
+const handleCatalogError = (res, error, message) => {
+  console.error(`${message}:`, error.message);
+  res.status(error.statusCode || 500).json({
+    success: false,
+    message,
+    error: error.message
+  });
+};
+
+// @desc    Browse the plant catalogue by name
+// @route   GET /api/database/plants?type=Vegetable&difficulty=Easy&season=current&limit=20&cursor=<nextCursor>
+// @access  Public
+export const getCatalogPlants = async (req, res) => {
+  try {
+    const { items: plants, nextCursor } = await listCatalogPlants({
+      type: req.query.type,
+      difficulty: req.query.difficulty,
+      season: req.query.season,
+      cursor: req.query.cursor,
+      limit: parsePageLimit(req.query.limit)
+    });
+
+    res.set('Cache-Control', CATALOG_CACHE_CONTROL);
+    res.status(200).json({
+      success: true,
+      count: plants.length,
+      plants,
+      nextCursor
+    });
+  } catch (error) {
+    handleCatalogError(res, error, 'Failed to fetch plant database');
+  }
+};
+
+// @desc    Search the plant catalogue
+// @route   GET /api/database/plants/search?q=basil&type=Herb&difficulty=Easy
+// @access  Public
+export const searchCatalogPlants = async (req, res) => {
+  const params = parseSearchQuery(req.query);
+  if (!params) return missingQuery(res);
+
+  try {
+    const { total, items: plants, facets, tookMs } = await searchCatalog(params.q, {
+      ...params,
+      type: req.query.type,
+      difficulty: req.query.difficulty
+    });
+
+    res.set('Cache-Control', CATALOG_CACHE_CONTROL);
+    res.status(200).json({
+      success: true,
+      count: plants.length,
+      total,
+      plants,
+      facets,
+      tookMs
+    });
+  } catch (error) {
+    handleCatalogError(res, error, 'Failed to search plant database');
+  }
+};
+
+// @desc    Get one catalogue entry
+// @route   GET /api/database/plants/:id
+// @access  Public
+export const getCatalogPlantById = async (req, res) => {
+  try {
+    const plant = mongoose.isValidObjectId(req.params.id) ? await getCatalogPlant(req.params.id) : null;
+
+    if (!plant) {
+      return res.status(404).json({
+        success: false,
+        message: 'Plant not found'
+      });
+    }
+
+    res.set('Cache-Control', CATALOG_CACHE_CONTROL);
+    res.status(200).json({
+      success: true,
+      plant
+    });
+  } catch (error) {
+    handleCatalogError(res, error, 'Failed to fetch plant');
+  }
+};
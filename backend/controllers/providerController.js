@@ -0,0 +1,24 @@
+import { getProviderUsage as fetchProviderUsage, getGatewayStats } from '../services/apiGateway.js';
+
+// @desc    Quota used this period per external provider (shared across
+//          workers), plus this process's call, failure and failover counters
+// @route   GET /api/providers/usage
+// @access  Bearer METRICS_TOKEN (open outside production when unset)
+export const getProviderUsage = async (req, res) => {
+  try {
+    const usage = await fetchProviderUsage();
+
+    res.status(200).json({
+      success: true,
+      usage,
+      stats: getGatewayStats()
+    });
+  } catch (error) {
+    console.error('Provider usage error:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Failed to fetch provider usage',
+      error: error.message
+    });
+  }
+};
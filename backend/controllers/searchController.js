@@ -0,0 +1,86 @@
+import { parsePageLimit } from '../utils/helpers.js';
+import {
+  searchPosts,
+  searchPlants,
+  searchCatalog,
+  getSearchStats as fetchSearchStats,
+  MAX_SEARCH_LIMIT,
+  SEARCH_SCOPES
+} from '../services/searchService.js';
+
+// Deepest result a client may page to with ?offset=
+const MAX_SEARCH_OFFSET = 1000;
+
+// Shared ?q=&limit=&offset= parsing; returns null if q is missing
+export const parseSearchQuery = (query) => {
+  const q = typeof query.q === 'string' ? query.q.trim() : '';
+  if (!q) return null;
+
+  const offset = parseInt(query.offset, 10);
+  return {
+    q,
+    limit: Math.min(parsePageLimit(query.limit), MAX_SEARCH_LIMIT),
+    offset: Number.isNaN(offset) || offset < 0 ? 0 : Math.min(offset, MAX_SEARCH_OFFSET)
+  };
+};
+
+export const missingQuery = (res) => {
+  return res.status(400).json({
+    success: false,
+    message: 'Search query q is required'
+  });
+};
+
+// @desc    Search posts, the user's plants and the plant catalogue at once
+// @route   GET /api/search?q=tomato&scope=posts,plants,catalog&category=&type=&status=&difficulty=&limit=20&offset=0
+// @access  Public (plants are only searched when signed in)
+export const search = async (req, res) => {
+  const params = parseSearchQuery(req.query);
+  if (!params) return missingQuery(res);
+
+  const requested = typeof req.query.scope === 'string'
+    ? req.query.scope.split(',').map(scope => scope.trim()).filter(scope => SEARCH_SCOPES.includes(scope))
+    : SEARCH_SCOPES;
+  const scopes = requested.filter(scope => scope !== 'plants' || req.user);
+
+  if (scopes.length === 0) {
+    return res.status(400).json({
+      success: false,
+      message: `scope must list one or more of: ${SEARCH_SCOPES.join(', ')} (plants requires sign-in)`
+    });
+  }
+
+  const { category, type, status, difficulty } = req.query;
+  const runners = {
+    posts: () => searchPosts(params.q, { ...params, category }),
+    plants: () => searchPlants(req.user._id, params.q, { ...params, type, status }),
+    catalog: () => searchCatalog(params.q, { ...params, type, difficulty })
+  };
+
+  try {
+    const results = await Promise.all(scopes.map(scope => runners[scope]()));
+
+    res.status(200).json({
+      success: true,
+      query: params.q,
+      results: Object.fromEntries(scopes.map((scope, index) => [scope, results[index]]))
+    });
+  } catch (error) {
+    console.error('Search error:', error.message);
+    res.status(error.statusCode || 500).json({
+      success: false,
+      message: 'Search failed',
+      error: error.message
+    });
+  }
+};
+
+// @desc    Search index sizes and query timings
+// @route   GET /api/search/stats
+// @access  Public
+export const getSearchStats = (req, res) => {
+  res.status(200).json({
+    success: true,
+    stats: fetchSearchStats()
+  });
+};
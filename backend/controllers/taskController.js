@@ -1,41 +1,117 @@
+import mongoose from 'mongoose';
 import Task from '../models/Task.js';
 import Plant from '../models/Plant.js';
+import { invalidateDashboard } from '../utils/dashboardCache.js';
+import {
+  parsePageLimit,
+  decodeCursor,
+  keysetFilter,
+  buildPage,
+  parseFields,
+  MAX_BULK_ITEMS,
+  insertManyWithResults
+} from '../utils/helpers.js';
+import { sendConditional } from '../middleware/conditionalGet.js';
+import { dismissScheduledTask } from '../services/taskScheduler.js';
+import { ownPlantFilter } from './plantController.js';
+
+// Fields list views may ask for with ?fields=
+const TASK_FIELDS = [
+  'plant', 'plantName', 'task', 'taskType', 'priority', 'status', 'dueDate', 'time',
+  'completedAt', 'notes', 'reminder', 'recurring', 'createdAt', 'updatedAt'
+];
+
+// The populated plant can change without touching the task's updatedAt
+const TASK_VALIDATOR_FIELDS = ['plant'];
+
+// Only populate the plant when the caller asked for it
+const withPlant = (query, projection) => {
+  return projection.split(' ').includes('plant')
+    ? query.populate('plant', 'name type image')
+    : query;
+};
+
+// Never taken from the request body; generated tasks are identified by
+// source and scheduleKey, which only the scheduler may set
+const READ_ONLY_FIELDS = new Set(['_id', 'user', 'source', 'scheduleKey']);
+
+const writableFields = (body) => {
+  return Object.fromEntries(Object.entries(body).filter(([key]) => !READ_ONLY_FIELDS.has(key)));
+};
+
+// Query builders, also explained by the query plan audit (utils/queryPlanAudit.js)
+export const ownTaskFilter = (id, userId) => ({ _id: id, user: userId });
+
+// `date` (a day) and `cursor` (decoded) are optional
+export const taskListFilter = (userId, { status, priority, date, cursor } = {}) => {
+  const query = { user: userId };
+
+  if (status) {
+    query.status = status;
+  }
+
+  if (priority) {
+    query.priority = priority;
+  }
+
+  if (date) {
+    const startDate = new Date(date);
+    startDate.setHours(0, 0, 0, 0);
+    const endDate = new Date(date);
+    endDate.setHours(23, 59, 59, 999);
+    query.dueDate = { $gte: startDate, $lte: endDate };
+  }
+
+  if (cursor) {
+    Object.assign(query, keysetFilter(cursor, 'dueDate', 1));
+  }
+
+  return query;
+};
+
+export const taskPageQuery = (filter, limit) => {
+  return Task.find(filter)
+    .sort({ dueDate: 1, _id: 1 })
+    .limit(limit + 1);
+};
+
+export const tasksDueBetweenQuery = (userId, start, end) => {
+  return Task.find({ user: userId, dueDate: { $gte: start, $lte: end } })
+    .sort({ dueDate: 1 });
+};
 
 // @desc    Get all tasks for logged-in user
-// @route   GET /api/tasks?status=pending&priority=high&date=2024-01-15
+// @route   GET /api/tasks?status=pending&priority=high&date=2024-01-15&limit=50&cursor=<nextCursor>&fields=task,status,dueDate
 // @access  Private
 export const getAllTasks = async (req, res) => {
   try {
     const { status, priority, date } = req.query;
-    
-    // Build query
-    const query = { user: req.user._id };
-    
-    if (status) {
-      query.status = status;
-    }
-    
-    if (priority) {
-      query.priority = priority;
-    }
-    
-    if (date) {
-      const startDate = new Date(date);
-      startDate.setHours(0, 0, 0, 0);
-      const endDate = new Date(date);
-      endDate.setHours(23, 59, 59, 999);
-      query.dueDate = { $gte: startDate, $lte: endDate };
+    const limit = parsePageLimit(req.query.limit);
+    const projection = parseFields(req.query.fields, TASK_FIELDS, TASK_FIELDS, ['dueDate', 'updatedAt']);
+    const cursor = req.query.cursor ? decodeCursor(req.query.cursor) : null;
+
+    if (req.query.cursor && !cursor) {
+      return res.status(400).json({
+        success: false,
+        message: 'Invalid cursor'
+      });
     }
 
-    const tasks = await Task.find(query)
-      .populate('plant', 'name type image')
-      .sort({ dueDate: 1, priority: -1 });
+    const docs = await withPlant(
+      taskPageQuery(taskListFilter(req.user._id, { status, priority, date, cursor }), limit)
+        .select(projection)
+        .lean(),
+      projection
+    );
 
-    res.status(200).json({
+    const { items: tasks, nextCursor } = buildPage(docs, limit, 'dueDate');
+
+    sendConditional(req, res, {
       success: true,
       count: tasks.length,
-      tasks
-    });
+      tasks,
+      nextCursor
+    }, tasks, TASK_VALIDATOR_FIELDS);
   } catch (error) {
     console.error('Get tasks error:', error);
     res.status(500).json({
@@ -51,10 +127,9 @@ export const getAllTasks = async (req, res) => {
 // @access  Private
 export const getTaskById = async (req, res) => {
   try {
-    const task = await Task.findOne({
-      _id: req.params.id,
-      user: req.user._id
-    }).populate('plant', 'name type image');
+    const task = await Task.findOne(ownTaskFilter(req.params.id, req.user._id))
+      .populate('plant', 'name type image')
+      .lean();
 
     if (!task) {
       return res.status(404).json({
@@ -63,10 +138,10 @@ export const getTaskById = async (req, res) => {
       });
     }
 
-    res.status(200).json({
+    sendConditional(req, res, {
       success: true,
       task
-    });
+    }, [task], TASK_VALIDATOR_FIELDS);
   } catch (error) {
     console.error('Get task error:', error);
     res.status(500).json({
@@ -83,17 +158,13 @@ export const getTaskById = async (req, res) => {
 export const createTask = async (req, res) => {
   try {
     const taskData = {
-      ...req.body,
+      ...writableFields(req.body),
       user: req.user._id
     };
 
     // If plant ID is provided, verify it exists and belongs to user
     if (taskData.plant) {
-      const plant = await Plant.findOne({
-        _id: taskData.plant,
-        user: req.user._id,
-        isActive: true
-      });
+      const plant = await Plant.findOne(ownPlantFilter(taskData.plant, req.user._id));
 
       if (!plant) {
         return res.status(404).json({
@@ -128,15 +199,164 @@ export const createTask = async (req, res) => {
   }
 };
 
+// @desc    Create many tasks in one request
+// @route   POST /api/tasks/bulk
+// @access  Private
+export const createTasksBulk = async (req, res) => {
+  try {
+    const { tasks } = req.body;
+
+    if (!Array.isArray(tasks) || tasks.length === 0 || tasks.length > MAX_BULK_ITEMS) {
+      return res.status(400).json({
+        success: false,
+        message: `Provide between 1 and ${MAX_BULK_ITEMS} tasks`
+      });
+    }
+
+    // Check ownership of every referenced plant with a single $in query
+    const plantIds = [...new Set(
+      tasks
+        .map(taskData => taskData && taskData.plant)
+        .filter(id => id && mongoose.isValidObjectId(id))
+        .map(String)
+    )];
+
+    const ownedPlants = plantIds.length > 0
+      ? await Plant.find({ _id: { $in: plantIds }, user: req.user._id, isActive: true })
+        .select('name')
+        .lean()
+      : [];
+    const plantNames = new Map(ownedPlants.map(plant => [String(plant._id), plant.name]));
+
+    const entries = tasks.map(taskData => {
+      const data = { ...writableFields(taskData), user: req.user._id };
+
+      if (data.plant) {
+        if (!plantNames.has(String(data.plant))) {
+          return { error: 'Plant not found' };
+        }
+        if (!data.plantName) {
+          data.plantName = plantNames.get(String(data.plant));
+        }
+      }
+
+      return new Task(data);
+    });
+
+    const results = (await insertManyWithResults(Task, entries)).map(({ doc, ...result }) => {
+      return doc ? { ...result, task: doc } : result;
+    });
+    invalidateDashboard(req.user._id);
+    const created = results.filter(result => result.success).length;
+
+    res.status(created > 0 ? 201 : 400).json({
+      success: created > 0,
+      message: `${created} of ${tasks.length} tasks created`,
+      created,
+      failed: tasks.length - created,
+      results
+    });
+  } catch (error) {
+    console.error('Bulk create tasks error:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Failed to create tasks',
+      error: error.message
+    });
+  }
+};
+
+// @desc    Update the status of many tasks in one request
+// @route   PUT /api/tasks/bulk/status
+// @access  Private
+export const updateTaskStatusBulk = async (req, res) => {
+  try {
+    const { updates } = req.body;
+    const statuses = Task.schema.path('status').enumValues;
+
+    if (!Array.isArray(updates) || updates.length === 0 || updates.length > MAX_BULK_ITEMS) {
+      return res.status(400).json({
+        success: false,
+        message: `Provide between 1 and ${MAX_BULK_ITEMS} updates`
+      });
+    }
+
+    const ids = updates
+      .map(update => update && update.id)
+      .filter(id => id && mongoose.isValidObjectId(id));
+
+    // One $in read for ownership and current status, then one bulkWrite
+    const owned = await Task.find({ _id: { $in: ids }, user: req.user._id })
+      .select('status')
+      .lean();
+    const currentStatus = new Map(owned.map(task => [String(task._id), task.status]));
+
+    const now = new Date();
+    const operations = [];
+    const seen = new Set();
+    const results = updates.map((update, index) => {
+      const id = update && update.id ? String(update.id) : null;
+
+      if (!id || !currentStatus.has(id)) {
+        return { index, id, success: false, error: 'Task not found' };
+      }
+      // completedAt is worked out from the status read above, so a second
+      // update for the same task in this request would be based on stale state
+      if (seen.has(id)) {
+        return { index, id, success: false, error: 'Duplicate task id' };
+      }
+      seen.add(id);
+      if (!statuses.includes(update.status)) {
+        return { index, id, success: false, error: `Status must be one of: ${statuses.join(', ')}` };
+      }
+
+      // Same completedAt rules as updateTask
+      const set = { status: update.status };
+      const wasCompleted = currentStatus.get(id) === 'completed';
+      if (update.status === 'completed' && !wasCompleted) set.completedAt = now;
+      if (update.status !== 'completed' && wasCompleted) set.completedAt = null;
+
+      operations.push({
+        updateOne: {
+          filter: { _id: id, user: req.user._id },
+          update: { $set: set }
+        }
+      });
+
+      return { index, id, success: true, status: update.status };
+    });
+
+    if (operations.length > 0) {
+      // bulkWrite skips the model's query hooks
+      await Task.bulkWrite(operations, { ordered: false });
+      invalidateDashboard(req.user._id);
+    }
+
+    const updated = results.filter(result => result.success).length;
+
+    res.status(updated > 0 ? 200 : 400).json({
+      success: updated > 0,
+      message: `${updated} of ${updates.length} tasks updated`,
+      updated,
+      failed: updates.length - updated,
+      results
+    });
+  } catch (error) {
+    console.error('Bulk update task status error:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Failed to update tasks',
+      error: error.message
+    });
+  }
+};
+
 // @desc    Update task
 // @route   PUT /api/tasks/:id
 // @access  Private
 export const updateTask = async (req, res) => {
   try {
-    const task = await Task.findOne({
-      _id: req.params.id,
-      user: req.user._id
-    });
+    const task = await Task.findOne(ownTaskFilter(req.params.id, req.user._id));
 
     if (!task) {
       return res.status(404).json({
@@ -145,21 +365,37 @@ export const updateTask = async (req, res) => {
       });
     }
 
+    const updates = writableFields(req.body);
+
+    // A task can only be moved to another of the user's own plants
+    if (updates.plant && String(updates.plant) !== String(task.plant)) {
+      const plant = await Plant.findOne(ownPlantFilter(updates.plant, req.user._id));
+
+      if (!plant) {
+        return res.status(404).json({
+          success: false,
+          message: 'Plant not found'
+        });
+      }
+
+      if (!updates.plantName) {
+        updates.plantName = plant.name;
+      }
+    }
+
     // If status is being changed to completed, set completedAt
-    if (req.body.status === 'completed' && task.status !== 'completed') {
-      req.body.completedAt = new Date();
+    if (updates.status === 'completed' && task.status !== 'completed') {
+      updates.completedAt = new Date();
     }
 
     // If status is being changed from completed, clear completedAt
-    if (req.body.status && req.body.status !== 'completed' && task.status === 'completed') {
-      req.body.completedAt = null;
+    if (updates.status && updates.status !== 'completed' && task.status === 'completed') {
+      updates.completedAt = null;
     }
 
     // Update task fields
-    Object.keys(req.body).forEach(key => {
-      if (key !== 'user' && key !== '_id') {
-        task[key] = req.body[key];
-      }
+    Object.entries(updates).forEach(([key, value]) => {
+      task[key] = value;
     });
 
     await task.save();
@@ -185,10 +421,7 @@ export const updateTask = async (req, res) => {
 // @access  Private
 export const deleteTask = async (req, res) => {
   try {
-    const task = await Task.findOne({
-      _id: req.params.id,
-      user: req.user._id
-    });
+    const task = await Task.findOne(ownTaskFilter(req.params.id, req.user._id));
 
     if (!task) {
       return res.status(404).json({
@@ -197,6 +430,7 @@ export const deleteTask = async (req, res) => {
       });
     }
 
+    await dismissScheduledTask(task);
     await task.deleteOne();
 
     res.status(200).json({
@@ -214,11 +448,12 @@ export const deleteTask = async (req, res) => {
 };
 
 // @desc    Get tasks by date range
-// @route   GET /api/tasks/range
+// @route   GET /api/tasks/range?startDate=2024-01-01&endDate=2024-01-31&fields=task,status,dueDate
 // @access  Private
 export const getTasksByDateRange = async (req, res) => {
   try {
     const { startDate, endDate } = req.query;
+    const projection = parseFields(req.query.fields, TASK_FIELDS, TASK_FIELDS);
 
     if (!startDate || !endDate) {
       return res.status(400).json({
@@ -233,12 +468,12 @@ export const getTasksByDateRange = async (req, res) => {
     const end = new Date(endDate);
     end.setHours(23, 59, 59, 999);
 
-    const tasks = await Task.find({
-      user: req.user._id,
-      dueDate: { $gte: start, $lte: end }
-    })
-      .populate('plant', 'name type image')
-      .sort({ dueDate: 1 });
+    const tasks = await withPlant(
+      tasksDueBetweenQuery(req.user._id, start, end)
+        .select(projection)
+        .lean(),
+      projection
+    );
 
     res.status(200).json({
       success: true,
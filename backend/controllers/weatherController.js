@@ -1 +1,110 @@
-// TODO: Implement in Phase 4
+import {
+  resolveLocation,
+  getCurrentWeather as fetchCurrentWeather,
+  getForecast,
+  getWeatherAlerts as fetchWeatherAlerts,
+  getWeatherStats as fetchWeatherStats
+} from '../services/weatherService.js';
+
+const DEFAULT_CITY = 'Dhaka';
+
+// Location from ?lat=&lon=, ?city=, the signed-in user's profile, or Dhaka.
+// An explicit location must be valid; a profile city that is not a district
+// falls through to the profile district and then to Dhaka.
+const locationFor = (req) => {
+  const { lat, lon, city } = req.query;
+  if (lat || lon || city) return resolveLocation({ lat, lon, city });
+
+  const profile = req.user?.location;
+  return resolveLocation({ city: profile?.city }) ||
+    resolveLocation({ city: profile?.district }) ||
+    resolveLocation({ city: DEFAULT_CITY });
+};
+
+// Responses for an explicit location are shared. Without one the answer
+// depends on who is asking, so shared caches must key on Authorization and
+// a profile-based answer is cacheable only by the user's own browser.
+const sendWeather = (req, res, result, key) => {
+  const { lat, lon, city } = req.query;
+  if (lat || lon || city) {
+    res.set('Cache-Control', 'public, max-age=300');
+  } else {
+    res.vary('Authorization');
+    res.set('Cache-Control', `${req.user?.location ? 'private' : 'public'}, max-age=300`);
+  }
+  res.status(200).json({
+    success: true,
+    cached: result.cached,
+    stale: result.stale,
+    fetchedAt: new Date(result.fetchedAt).toISOString(),
+    [key]: result.data
+  });
+};
+
+const handleWeatherError = (res, error, message) => {
+  console.error(`${message}:`, error.message);
+  res.status(error.statusCode || 500).json({
+    success: false,
+    message,
+    error: error.message
+  });
+};
+
+const invalidLocation = (res) => {
+  return res.status(400).json({
+    success: false,
+    message: 'Provide a lat/lon inside Bangladesh or a Bangladesh district as city'
+  });
+};
+
+// @desc    Get current weather
+// @route   GET /api/weather/current?lat=23.81&lon=90.41 | ?city=Dhaka
+// @access  Public (uses profile location when signed in)
+export const getCurrentWeather = async (req, res) => {
+  const location = locationFor(req);
+  if (!location) return invalidLocation(res);
+
+  try {
+    sendWeather(req, res, await fetchCurrentWeather(location), 'weather');
+  } catch (error) {
+    handleWeatherError(res, error, 'Failed to fetch weather');
+  }
+};
+
+// @desc    Get 5-day forecast, one entry per day
+// @route   GET /api/weather/forecast?lat=23.81&lon=90.41 | ?city=Dhaka
+// @access  Public (uses profile location when signed in)
+export const getWeatherForecast = async (req, res) => {
+  const location = locationFor(req);
+  if (!location) return invalidLocation(res);
+
+  try {
+    sendWeather(req, res, await getForecast(location), 'forecast');
+  } catch (error) {
+    handleWeatherError(res, error, 'Failed to fetch forecast');
+  }
+};
+
+// @desc    Get gardening alerts derived from the forecast
+// @route   GET /api/weather/alerts?city=Dhaka
+// @access  Public (uses profile location when signed in)
+export const getWeatherAlerts = async (req, res) => {
+  const location = locationFor(req);
+  if (!location) return invalidLocation(res);
+
+  try {
+    sendWeather(req, res, await fetchWeatherAlerts(location), 'alerts');
+  } catch (error) {
+    handleWeatherError(res, error, 'Failed to fetch weather alerts');
+  }
+};
+
+// @desc    Weather cache and upstream usage counters
+// @route   GET /api/weather/stats
+// @access  Public
+export const getWeatherStats = (req, res) => {
+  res.status(200).json({
+    success: true,
+    stats: fetchWeatherStats()
+  });
+};
@@ -1,5 +1,20 @@
 import jwt from 'jsonwebtoken';
 import User from '../models/User.js';
+import { userCache } from '../utils/userCache.js';
+
+// Load a user by id, served from the in-process cache when possible.
+// Cached users are plain objects shared between requests - treat as read-only.
+export const getCachedUser = async (id) => {
+  const key = String(id);
+  const cached = userCache.get(key);
+  if (cached) return cached;
+
+  const user = await User.findById(id).select('-password').lean();
+  if (user) {
+    userCache.set(key, user);
+  }
+  return user;
+};
 
 // Protect routes - verify JWT token
 export const protect = async (req, res, next) => {
@@ -23,7 +38,7 @@ export const protect = async (req, res, next) => {
       const decoded = jwt.verify(token, process.env.JWT_SECRET);
 
       // Get user from token
-      req.user = await User.findById(decoded.id).select('-password');
+      req.user = await getCachedUser(decoded.id);
 
       if (!req.user) {
         return res.status(401).json({
@@ -67,7 +82,7 @@ export const optionalAuth = async (req, res, next) => {
     if (token) {
       try {
         const decoded = jwt.verify(token, process.env.JWT_SECRET);
-        req.user = await User.findById(decoded.id).select('-password');
+        req.user = await getCachedUser(decoded.id);
       } catch (error) {
         // Token invalid but continue anyway
         req.user = null;
@@ -80,6 +95,29 @@ export const optionalAuth = async (req, res, next) => {
   }
 };
 
+// Operational endpoints (metrics, provider usage) - bearer METRICS_TOKEN.
+// Open when the token is unset, except in production where they stay closed.
+export const metricsAuth = (req, res, next) => {
+  const token = process.env.METRICS_TOKEN;
+
+  if (!token) {
+    if (process.env.NODE_ENV !== 'production') return next();
+    return res.status(403).json({
+      success: false,
+      message: 'METRICS_TOKEN must be set to use this route in production'
+    });
+  }
+
+  if (req.headers.authorization !== `Bearer ${token}`) {
+    return res.status(401).json({
+      success: false,
+      message: 'Not authorized to access this route'
+    });
+  }
+
+  next();
+};
+
 // Generate JWT token
 export const generateToken = (id) => {
   return jwt.sign({ id }, process.env.JWT_SECRET, {
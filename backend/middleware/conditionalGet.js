@@ -0,0 +1,40 @@
+import crypto from 'crypto';
+
+// Strong ETags for JSON list/detail responses, built from each document's
+// _id and updatedAt instead of by hashing the serialized body. A request
+// whose If-None-Match still matches gets a bodyless 304, so the payload is
+// neither serialized nor sent.
+//
+// `extraFields` lists fields that can change without bumping updatedAt
+// (values derived at read time, batch-job writes with timestamps off,
+// populated documents). They are folded into the tag when present.
+export const documentsETag = (req, docs, extraFields = []) => {
+  const hash = crypto.createHash('sha1');
+  hash.update(req.originalUrl);
+  hash.update(`|${docs.length}`);
+
+  docs.forEach(doc => {
+    const updatedAt = doc.updatedAt instanceof Date ? doc.updatedAt.getTime() : doc.updatedAt;
+    hash.update(`|${doc._id}:${updatedAt}`);
+    extraFields.forEach(field => {
+      if (doc[field] !== undefined) hash.update(`:${JSON.stringify(doc[field])}`);
+    });
+  });
+
+  return `"${hash.digest('base64url').slice(0, 27)}"`;
+};
+
+// Send `body` as JSON, or 304 if the client's copy is current. `docs` are
+// the documents the body was built from.
+export const sendConditional = (req, res, body, docs, extraFields) => {
+  res.set({
+    ETag: documentsETag(req, docs, extraFields),
+    // Responses are per user; clients must revalidate before reusing one
+    'Cache-Control': 'private, no-cache'
+  });
+
+  if (req.fresh) {
+    return res.status(304).end();
+  }
+  return res.status(200).json(body);
+};
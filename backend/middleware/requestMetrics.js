@@ -0,0 +1,59 @@
+import { registry, requestContext, routeTemplate } from '../utils/metrics.js';
+import logger from '../utils/logger.js';
+
+// Per-request latency and Mongo time, labelled by route template. Each
+// request runs inside a requestContext so the Mongoose timing hooks
+// (utils/mongoMetrics.js) can add their time to it.
+export const httpRequestDuration = registry.histogram(
+  'http_request_duration_seconds',
+  'Time from request start to the response being sent, by route template',
+  ['method', 'route', 'status']
+);
+
+export const httpRequestDbDuration = registry.histogram(
+  'http_request_db_seconds',
+  'Summed Mongo time per request, by route template',
+  ['method', 'route']
+);
+
+// Successful, fast requests are logged at LOG_SAMPLE_RATE; server errors and
+// requests slower than LOG_SLOW_MS are always logged
+const SAMPLE_RATE = parseFloat(process.env.LOG_SAMPLE_RATE ?? '0.1');
+const SLOW_MS = parseInt(process.env.LOG_SLOW_MS, 10) || 1000;
+
+const logRequest = (req, res, route, ms, context) => {
+  const slow = ms >= SLOW_MS;
+  const failed = res.statusCode >= 500;
+  if (!slow && !failed && Math.random() >= SAMPLE_RATE) return;
+
+  logger.log(failed ? 'error' : slow ? 'warn' : 'info', 'request', {
+    method: req.method,
+    route,
+    url: req.originalUrl,
+    status: res.statusCode,
+    ms: Math.round(ms * 10) / 10,
+    dbMs: Math.round(context.dbMs * 10) / 10,
+    dbQueries: context.dbQueries,
+    user: req.user?._id ? String(req.user._id) : undefined,
+    sampled: !slow && !failed
+  });
+};
+
+// `log` turns on the structured request log (production); otherwise only
+// metrics are recorded
+export const requestMetrics = ({ log = false } = {}) => (req, res, next) => {
+  const started = process.hrtime.bigint();
+  const context = { req, dbMs: 0, dbQueries: 0 };
+
+  res.on('finish', () => {
+    const ms = Number(process.hrtime.bigint() - started) / 1e6;
+    const route = routeTemplate(req);
+
+    httpRequestDuration.observe({ method: req.method, route, status: res.statusCode }, ms / 1000);
+    httpRequestDbDuration.observe({ method: req.method, route }, context.dbMs / 1000);
+
+    if (log) logRequest(req, res, route, ms, context);
+  });
+
+  requestContext.run(context, next);
+};
@@ -0,0 +1,43 @@
+import multer from 'multer';
+import { storeImage, MAX_IMAGE_BYTES, IMAGE_CONTENT_TYPES } from '../services/imageService.js';
+
+// Multer storage engine that streams each file straight into the blob store,
+// so an upload never sits in memory as a whole
+const imageStorage = {
+  _handleFile(req, file, cb) {
+    storeImage(file.stream, { uploadedBy: req.user?._id })
+      .then(asset => cb(null, { asset, size: asset.size }))
+      .catch(cb);
+  },
+  // Blobs are shared between uploads by content, so nothing is removed here
+  _removeFile(req, file, cb) {
+    cb(null);
+  }
+};
+
+const imageUpload = multer({
+  storage: imageStorage,
+  limits: { fileSize: MAX_IMAGE_BYTES, files: 1 },
+  fileFilter: (req, file, cb) => {
+    cb(null, IMAGE_CONTENT_TYPES.includes(file.mimetype));
+  }
+});
+
+// Accept one multipart image in `field`; req.file.asset is the stored ImageAsset.
+// Non-multipart requests pass straight through.
+export const uploadImage = (field = 'image') => {
+  const handler = imageUpload.single(field);
+
+  return (req, res, next) => {
+    handler(req, res, (error) => {
+      if (!error) return next();
+
+      const tooLarge = error.code === 'LIMIT_FILE_SIZE' || error.statusCode === 413;
+      res.status(tooLarge ? 413 : error.statusCode || 400).json({
+        success: false,
+        message: tooLarge ? `Image must be under ${Math.round(MAX_IMAGE_BYTES / 1024 / 1024)}MB` : 'Image upload failed',
+        error: error.message
+      });
+    });
+  };
+};
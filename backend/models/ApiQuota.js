@@ -0,0 +1,29 @@
+import mongoose from 'mongoose';
+
+// Calls made to an external provider in one quota period ('2025-01' for a
+// monthly quota, '2025-01-15' for a daily one). Shared by every server
+// process, so the free-tier limits hold across cluster workers and restarts.
+const apiQuotaSchema = new mongoose.Schema({
+  provider: {
+    type: String,
+    required: true
+  },
+  period: {
+    type: String,
+    required: true
+  },
+  used: {
+    type: Number,
+    default: 0
+  },
+  limit: Number
+}, {
+  timestamps: true
+});
+
+// Reservations upsert on (provider, period); see services/apiGateway.js
+apiQuotaSchema.index({ provider: 1, period: 1 }, { unique: true });
+
+const ApiQuota = mongoose.model('ApiQuota', apiQuotaSchema);
+
+export default ApiQuota;
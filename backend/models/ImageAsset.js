@@ -0,0 +1,35 @@
+import mongoose from 'mongoose';
+
+// Metadata for an image in the blob store. The _id is the sha256 of the
+// original bytes (its blob id); documents elsewhere store only this id.
+const imageAssetSchema = new mongoose.Schema({
+  _id: {
+    type: String,
+    match: /^[a-f0-9]{64}$/
+  },
+  contentType: {
+    type: String,
+    required: true
+  },
+  size: Number,
+  width: Number,
+  height: Number,
+  // Resized WebP copies, generated once at upload: { thumb: blobId, medium: blobId }
+  variants: {
+    type: Map,
+    of: String,
+    default: {}
+  },
+  // 64-bit difference hash, used to match near-duplicate diagnosis images
+  perceptualHash: String,
+  uploadedBy: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'User'
+  }
+}, {
+  timestamps: true
+});
+
+const ImageAsset = mongoose.model('ImageAsset', imageAssetSchema);
+
+export default ImageAsset;
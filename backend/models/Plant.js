@@ -1,4 +1,6 @@
 import mongoose from 'mongoose';
+import { invalidateDashboardOnWrite } from '../utils/dashboardCache.js';
+import { computePlantHealth } from '../utils/plantHealth.js';
 
 const plantSchema = new mongoose.Schema({
   user: {
@@ -26,6 +28,8 @@ const plantSchema = new mongoose.Schema({
     default: Date.now
   },
   expectedHarvestDate: Date,
+  // daysGrowing, health and wateringOverdueDays are derived (utils/plantHealth.js):
+  // set on save and refreshed for every plant by services/plantHealthJob.js
   daysGrowing: {
     type: Number,
     default: 0
@@ -36,6 +40,10 @@ const plantSchema = new mongoose.Schema({
     max: 100,
     default: 100
   },
+  wateringOverdueDays: {
+    type: Number,
+    default: 0
+  },
   status: {
     type: String,
     enum: ['healthy', 'attention', 'sick', 'harvested', 'dead'],
@@ -79,6 +87,13 @@ const plantSchema = new mongoose.Schema({
     quality: String,
     notes: String
   }],
+  // Bookkeeping for the task scheduler (services/taskScheduler.js)
+  taskGeneration: {
+    generatedAt: Date,
+    generatedUntil: Date,
+    // scheduleKeys of generated tasks the user deleted, never recreated
+    dismissedKeys: [String]
+  },
   isActive: {
     type: Boolean,
     default: true
@@ -87,15 +102,24 @@ const plantSchema = new mongoose.Schema({
   timestamps: true
 });
 
-// Calculate days growing
+// Indexes for efficient querying
+// Every plant route filters on { user, isActive }; the list endpoint then
+// sorts and pages on (createdAt, _id). Lookups by id use the _id index.
+plantSchema.index({ user: 1, isActive: 1, createdAt: -1, _id: -1 });
+
+// Recalculate daysGrowing, wateringOverdueDays and health
+plantSchema.methods.updateDerivedFields = function(now = new Date()) {
+  Object.assign(this, computePlantHealth(this, now));
+};
+
 plantSchema.pre('save', function(next) {
-  if (this.plantedDate) {
-    const daysDiff = Math.floor((Date.now() - this.plantedDate.getTime()) / (1000 * 60 * 60 * 24));
-    this.daysGrowing = daysDiff;
-  }
+  this.updateDerivedFields();
   next();
 });
 
+// Keep GET /api/dashboard/summary in step with writes
+invalidateDashboardOnWrite(plantSchema);
+
 const Plant = mongoose.model('Plant', plantSchema);
 
 export default Plant;
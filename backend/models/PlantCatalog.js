@@ -0,0 +1,61 @@
+import mongoose from 'mongoose';
+import { SEASONS } from '../utils/growingSeason.js';
+
+// Reference catalogue of plants with care information, served by
+// /api/database/plants. Seeded from data/plantCatalog.json and mirrored
+// from the Perenual species list (services/catalogSync.js).
+const plantCatalogSchema = new mongoose.Schema({
+  name: {
+    type: String,
+    required: [true, 'Plant name is required'],
+    trim: true
+  },
+  scientificName: String,
+  type: {
+    type: String,
+    enum: ['Herb', 'Vegetable', 'Fruit', 'Flower', 'Other'],
+    required: true
+  },
+  difficulty: {
+    type: String,
+    enum: ['Easy', 'Moderate', 'Hard'],
+    default: 'Easy'
+  },
+  sunNeeds: String,
+  water: String,
+  growthTime: String,
+  // Bangladesh growing seasons (utils/growingSeason.js)
+  seasons: [{
+    type: String,
+    enum: SEASONS
+  }],
+  cycle: String,
+  otherNames: [String],
+  image: {
+    type: String,
+    default: '🌱'
+  },
+  description: String,
+  source: {
+    type: String,
+    default: 'local'
+  },
+  // Perenual species id and a hash of the mapped fields, so a sync only
+  // writes entries that changed upstream
+  externalId: Number,
+  syncHash: String
+}, {
+  timestamps: true
+});
+
+// Browsing pages on (name, _id), optionally within a type
+plantCatalogSchema.index({ name: 1 }, { unique: true });
+plantCatalogSchema.index({ type: 1, name: 1, _id: 1 });
+plantCatalogSchema.index({ seasons: 1, name: 1, _id: 1 });
+plantCatalogSchema.index({ externalId: 1 }, { unique: true, partialFilterExpression: { externalId: { $exists: true } } });
+// Newest change, to tell whether the on-disk snapshot is current
+plantCatalogSchema.index({ updatedAt: -1 });
+
+const PlantCatalog = mongoose.model('PlantCatalog', plantCatalogSchema);
+
+export default PlantCatalog;
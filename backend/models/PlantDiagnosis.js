@@ -10,10 +10,23 @@ const plantDiagnosisSchema = new mongoose.Schema({
     type: mongoose.Schema.Types.ObjectId,
     ref: 'Plant'
   },
+  // ImageAsset id (blob store key); diagnoses from before the blob store
+  // may still hold base64 until `npm run migrate:images` is run
   image: {
     type: String,
     required: true
   },
+  // sha256 of the image bytes, for exact-duplicate lookups
+  imageHash: String,
+  // 64-bit difference hash (hex) and its four 16-bit bands; near-duplicate
+  // images share at least one band (see utils/imageHash.js)
+  perceptualHash: String,
+  hashBands: [String],
+  // Result reused from an earlier diagnosis instead of calling the provider
+  cacheHit: {
+    type: Boolean,
+    default: false
+  },
   diagnosisResult: {
     confidence: {
       type: Number,
@@ -49,6 +62,10 @@ const plantDiagnosisSchema = new mongoose.Schema({
     enum: ['processing', 'completed', 'failed'],
     default: 'processing'
   },
+  // Lease on a 'processing' job: the process running it, renewed while it
+  // runs. Jobs whose lease has expired are picked up by another process.
+  claimedBy: String,
+  claimedAt: Date,
   error: String
 }, {
   timestamps: true
@@ -57,6 +74,10 @@ const plantDiagnosisSchema = new mongoose.Schema({
 // Indexes
 plantDiagnosisSchema.index({ user: 1, createdAt: -1 });
 plantDiagnosisSchema.index({ plant: 1 });
+plantDiagnosisSchema.index({ imageHash: 1, status: 1 });
+plantDiagnosisSchema.index({ hashBands: 1, status: 1 });
+plantDiagnosisSchema.index({ status: 1, createdAt: 1 });
+plantDiagnosisSchema.index({ status: 1, claimedAt: 1 });
 
 const PlantDiagnosis = mongoose.model('PlantDiagnosis', plantDiagnosisSchema);
 
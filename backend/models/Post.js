@@ -1,4 +1,7 @@
 import mongoose from 'mongoose';
+import { engagementScore, hotScore } from '../utils/ranking.js';
+
+const EXCERPT_LENGTH = 200;
 
 const postSchema = new mongoose.Schema({
   author: {
@@ -23,40 +26,32 @@ const postSchema = new mongoose.Schema({
     default: 'General'
   },
   tags: [String],
+  // ImageAsset ids from POST /api/images, never inline image data
   images: [String],
-  likes: [{
-    user: {
-      type: mongoose.Schema.Types.ObjectId,
-      ref: 'User'
-    },
-    likedAt: {
-      type: Date,
-      default: Date.now
-    }
-  }],
-  replies: [{
-    author: {
-      type: mongoose.Schema.Types.ObjectId,
-      ref: 'User',
-      required: true
-    },
-    content: {
-      type: String,
-      required: true
-    },
-    createdAt: {
-      type: Date,
-      default: Date.now
-    },
-    likes: [{
-      type: mongoose.Schema.Types.ObjectId,
-      ref: 'User'
-    }]
-  }],
+  // Short preview for feed lists, kept in sync with content on save
+  excerpt: String,
+  // Denormalized counters. Likes live in PostLike and replies in Reply, so
+  // feed reads never load per-user arrays.
+  likeCount: {
+    type: Number,
+    default: 0
+  },
+  replyCount: {
+    type: Number,
+    default: 0
+  },
+  // Incremented in batches by services/communityFeed.js
   views: {
     type: Number,
     default: 0
   },
+  // Ranking fields, re-derived on every like/reply (see utils/ranking.js)
+  score: {
+    type: Number,
+    default: 0
+  },
+  hotScore: Number,
+  lastActivityAt: Date,
   isPinned: {
     type: Boolean,
     default: false
@@ -73,11 +68,33 @@ const postSchema = new mongoose.Schema({
   timestamps: true
 });
 
+postSchema.pre('save', function(next) {
+  if (this.isModified('content')) {
+    this.excerpt = this.content.length > EXCERPT_LENGTH
+      ? `${this.content.slice(0, EXCERPT_LENGTH).trimEnd()}…`
+      : this.content;
+  }
+
+  if (this.isNew) {
+    this.score = engagementScore(this.likeCount, this.replyCount);
+    this.hotScore = hotScore(this.score, this.createdAt || new Date());
+    this.lastActivityAt = this.createdAt || new Date();
+  }
+  next();
+});
+
 // Indexes for efficient querying
-postSchema.index({ author: 1, createdAt: -1 });
-postSchema.index({ category: 1, createdAt: -1 });
+// Feed indexes end in _id so keyset pagination never needs an in-memory sort
+postSchema.index({ author: 1, createdAt: -1, _id: -1 });
+postSchema.index({ category: 1, createdAt: -1, _id: -1 });
 postSchema.index({ tags: 1 });
-postSchema.index({ createdAt: -1 });
+postSchema.index({ createdAt: -1, _id: -1 });
+postSchema.index({ hotScore: -1, _id: -1 });
+postSchema.index({ category: 1, hotScore: -1, _id: -1 });
+postSchema.index({ score: -1, _id: -1 });
+postSchema.index({ category: 1, score: -1, _id: -1 });
+// Search index refresh picks up posts edited since its last run
+postSchema.index({ updatedAt: 1 });
 
 const Post = mongoose.model('Post', postSchema);
 
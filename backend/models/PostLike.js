@@ -0,0 +1,25 @@
+import mongoose from 'mongoose';
+
+// One document per (post, user) like. The unique index makes liking
+// idempotent and "has this user liked it" a single index lookup.
+const postLikeSchema = new mongoose.Schema({
+  post: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'Post',
+    required: true
+  },
+  user: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'User',
+    required: true
+  }
+}, {
+  timestamps: { createdAt: true, updatedAt: false }
+});
+
+postLikeSchema.index({ post: 1, user: 1 }, { unique: true });
+postLikeSchema.index({ user: 1, post: 1 });
+
+const PostLike = mongoose.model('PostLike', postLikeSchema);
+
+export default PostLike;
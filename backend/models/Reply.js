@@ -0,0 +1,29 @@
+import mongoose from 'mongoose';
+
+const replySchema = new mongoose.Schema({
+  post: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'Post',
+    required: true
+  },
+  author: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'User',
+    required: true
+  },
+  content: {
+    type: String,
+    required: [true, 'Reply content is required'],
+    trim: true,
+    maxlength: [5000, 'Reply cannot exceed 5000 characters']
+  }
+}, {
+  timestamps: true
+});
+
+// Replies are read oldest first, one page at a time
+replySchema.index({ post: 1, createdAt: 1, _id: 1 });
+
+const Reply = mongoose.model('Reply', replySchema);
+
+export default Reply;
@@ -0,0 +1,22 @@
+import mongoose from 'mongoose';
+
+// Progress of a resumable sync job, one document per job (_id is the job
+// name), so an interrupted run continues where it stopped
+const syncStateSchema = new mongoose.Schema({
+  _id: String,
+  nextPage: {
+    type: Number,
+    default: 1
+  },
+  lastPage: Number,
+  passStartedAt: Date,
+  completedAt: Date,
+  lastRunAt: Date,
+  lastError: String
+}, {
+  timestamps: true
+});
+
+const SyncState = mongoose.model('SyncState', syncStateSchema);
+
+export default SyncState;
@@ -1,4 +1,5 @@
 import mongoose from 'mongoose';
+import { invalidateDashboardOnWrite } from '../utils/dashboardCache.js';
 
 const taskSchema = new mongoose.Schema({
   user: {
@@ -62,14 +63,31 @@ const taskSchema = new mongoose.Schema({
       enum: ['daily', 'weekly', 'biweekly', 'monthly']
     },
     nextOccurrence: Date
-  }
+  },
+  // 'schedule' tasks are materialized from the plant's care schedule
+  source: {
+    type: String,
+    enum: ['user', 'schedule'],
+    default: 'user'
+  },
+  scheduleKey: String
 }, {
   timestamps: true
 });
 
 // Index for efficient querying
-taskSchema.index({ user: 1, dueDate: 1 });
+// (user, dueDate, _id) also backs keyset pagination of GET /api/tasks
+taskSchema.index({ user: 1, dueDate: 1, _id: 1 });
 taskSchema.index({ user: 1, status: 1 });
+// Generated tasks are keyed per user, so no other account can hold a key
+taskSchema.index(
+  { user: 1, scheduleKey: 1 },
+  { unique: true, partialFilterExpression: { scheduleKey: { $type: 'string' } } }
+);
+taskSchema.index({ plant: 1, source: 1, dueDate: 1 });
+
+// Keep GET /api/dashboard/summary in step with writes
+invalidateDashboardOnWrite(taskSchema);
 
 const Task = mongoose.model('Task', taskSchema);
 
@@ -1,5 +1,6 @@
 import mongoose from 'mongoose';
-import bcrypt from 'bcryptjs';
+import { hashPassword, verifyPassword, passwordNeedsRehash } from '../utils/passwordHasher.js';
+import { userCache, invalidateCachedUser } from '../utils/userCache.js';
 
 const userSchema = new mongoose.Schema({
   fullName: {
@@ -82,14 +83,37 @@ userSchema.pre('save', async function(next) {
     return next();
   }
   
-  const salt = await bcrypt.genSalt(10);
-  this.password = await bcrypt.hash(this.password, salt);
+  // Hashed on a worker thread so logins don't block the event loop
+  this.password = await hashPassword(this.password);
   next();
 });
 
+// Keep the auth middleware's user cache in step with writes
+userSchema.post('save', function(doc) {
+  invalidateCachedUser(doc._id);
+});
+
+userSchema.post(['updateOne', 'findOneAndUpdate', 'deleteOne', 'findOneAndDelete'], function() {
+  const filter = this.getFilter();
+  if (filter._id) {
+    invalidateCachedUser(filter._id);
+  } else {
+    userCache.clear();
+  }
+});
+
+userSchema.post(['updateMany', 'deleteMany'], function() {
+  userCache.clear();
+});
+
 // Method to compare passwords
 userSchema.methods.comparePassword = async function(candidatePassword) {
-  return await bcrypt.compare(candidatePassword, this.password);
+  return await verifyPassword(candidatePassword, this.password);
+};
+
+// True if the stored hash was made with a different bcrypt cost than configured
+userSchema.methods.passwordNeedsRehash = function() {
+  return passwordNeedsRehash(this.password);
 };
 
 // Update level based on points
@@ -1,9 +1,46 @@
 import express from 'express';
+import { protect, optionalAuth } from '../middleware/auth.js';
+import {
+  getPosts,
+  getPopularPosts,
+  getMyPosts,
+  getPostById,
+  createPost,
+  updatePost,
+  deletePost,
+  likePost,
+  unlikePost,
+  getReplies,
+  addReply,
+  deleteReply,
+  getCommunityStats
+} from '../controllers/communityController.js';
+
 const router = express.Router();
 
-// TODO: Implement in Phase 5
-router.get('/posts', (req, res) => {
-  res.status(501).json({ message: 'Community endpoint - Coming in Phase 5' });
-});
+router.get('/stats', getCommunityStats);
+router.get('/my-posts', protect, getMyPosts);
+
+router.route('/posts')
+  .get(optionalAuth, getPosts)
+  .post(protect, createPost);
+
+// Must come before /posts/:id
+router.get('/posts/popular', optionalAuth, getPopularPosts);
+
+router.route('/posts/:id')
+  .get(optionalAuth, getPostById)
+  .put(protect, updatePost)
+  .delete(protect, deletePost);
+
+router.route('/posts/:id/like')
+  .post(protect, likePost)
+  .delete(protect, unlikePost);
+
+router.route('/posts/:id/replies')
+  .get(getReplies)
+  .post(protect, addReply);
+
+router.delete('/posts/:postId/replies/:replyId', protect, deleteReply);
 
-export default router;
\ No newline at end of file
+export default router;
@@ -0,0 +1,15 @@
+import express from 'express';
+import {
+  getCatalogPlants,
+  searchCatalogPlants,
+  getCatalogPlantById
+} from '../controllers/plantDatabaseController.js';
+
+const router = express.Router();
+
+router.get('/plants', getCatalogPlants);
+// Must come before /plants/:id
+router.get('/plants/search', searchCatalogPlants);
+router.get('/plants/:id', getCatalogPlantById);
+
+export default router;
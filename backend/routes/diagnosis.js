@@ -1,9 +1,21 @@
 import express from 'express';
+import {
+  identifyPlant,
+  getDiagnosis,
+  getDiagnosisHistory,
+  getDiagnosisStats
+} from '../controllers/diagnosisController.js';
+import { protect } from '../middleware/auth.js';
+import { uploadImage } from '../middleware/upload.js';
+
 const router = express.Router();
 
-// TODO: Implement in Phase 4
-router.post('/identify', (req, res) => {
-  res.status(501).json({ message: 'Diagnosis endpoint - Coming in Phase 4' });
-});
+// All routes are protected
+router.use(protect);
+
+router.post('/identify', uploadImage('image'), identifyPlant);
+router.get('/history', getDiagnosisHistory);
+router.get('/stats', getDiagnosisStats);
+router.get('/:id', getDiagnosis);
 
-export default router;
\ No newline at end of file
+export default router;
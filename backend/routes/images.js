@@ -0,0 +1,11 @@
+import express from 'express';
+import { protect } from '../middleware/auth.js';
+import { uploadImage } from '../middleware/upload.js';
+import { createImage, getImage } from '../controllers/imageController.js';
+
+const router = express.Router();
+
+router.post('/', protect, uploadImage('image'), createImage);
+router.get('/:id', getImage);
+
+export default router;
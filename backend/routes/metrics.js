@@ -0,0 +1,9 @@
+import express from 'express';
+import { getMetrics } from '../controllers/metricsController.js';
+import { metricsAuth } from '../middleware/auth.js';
+
+const router = express.Router();
+
+router.get('/', metricsAuth, getMetrics);
+
+export default router;
@@ -4,6 +4,7 @@ import {
   getAllPlants,
   getPlantById,
   createPlant,
+  createPlantsBulk,
   updatePlant,
   deletePlant,
   addPlantNote,
@@ -21,6 +22,8 @@ router.route('/')
   .get(getAllPlants)
   .post(createPlant);
 
+router.post('/bulk', createPlantsBulk);
+
 router.route('/:id')
   .get(getPlantById)
   .put(updatePlant)
@@ -0,0 +1,9 @@
+import express from 'express';
+import { getProviderUsage } from '../controllers/providerController.js';
+import { metricsAuth } from '../middleware/auth.js';
+
+const router = express.Router();
+
+router.get('/usage', metricsAuth, getProviderUsage);
+
+export default router;
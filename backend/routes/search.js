@@ -0,0 +1,10 @@
+import express from 'express';
+import { optionalAuth } from '../middleware/auth.js';
+import { search, getSearchStats } from '../controllers/searchController.js';
+
+const router = express.Router();
+
+router.get('/', optionalAuth, search);
+router.get('/stats', getSearchStats);
+
+export default router;
@@ -4,7 +4,9 @@ import {
   getAllTasks,
   getTaskById,
   createTask,
+  createTasksBulk,
   updateTask,
+  updateTaskStatusBulk,
   deleteTask,
   getTasksByDateRange
 } from '../controllers/taskController.js';
@@ -20,6 +22,8 @@ router.route('/')
   .post(createTask);
 
 router.get('/range', getTasksByDateRange);
+router.post('/bulk', createTasksBulk);
+router.put('/bulk/status', updateTaskStatusBulk);
 
 router.route('/:id')
   .get(getTaskById)
@@ -1,9 +1,21 @@
 import express from 'express';
+import { optionalAuth } from '../middleware/auth.js';
+import {
+  getCurrentWeather,
+  getWeatherForecast,
+  getWeatherAlerts,
+  getWeatherStats
+} from '../controllers/weatherController.js';
+
 const router = express.Router();
 
-// TODO: Implement in Phase 4
-router.get('/', (req, res) => {
-  res.status(501).json({ message: 'Weather endpoint - Coming in Phase 4' });
-});
+// Public routes; a signed-in user's profile location is used as the default
+router.use(optionalAuth);
+
+router.get('/', getCurrentWeather);
+router.get('/current', getCurrentWeather);
+router.get('/forecast', getWeatherForecast);
+router.get('/alerts', getWeatherAlerts);
+router.get('/stats', getWeatherStats);
 
-export default router;
\ No newline at end of file
+export default router;
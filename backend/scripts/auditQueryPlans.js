@@ -0,0 +1,13 @@
+// Runs explain() on the queries built by the controllers and services and exits
+// non-zero if any of them would scan the whole collection.
+// Usage: npm run audit:indexes
+import 'dotenv/config';
+import mongoose from 'mongoose';
+import connectDB from '../config/database.js';
+import { auditQueryPlans, reportQueryPlans } from '../utils/queryPlanAudit.js';
+
+await connectDB();
+const ok = reportQueryPlans(await auditQueryPlans());
+await mongoose.disconnect();
+
+process.exit(ok ? 0 : 1);
@@ -0,0 +1,93 @@
+// Builds the post search index over synthetic posts and times a query mix
+// (exact, prefix, typo, multi-word, faceted). Exits non-zero if p99 latency
+// is over budget. Needs no database.
+// Usage: npm run bench:search [-- --posts 100000] [-- --queries 2000] [-- --budget 50]
+import { SearchIndex } from '../utils/searchIndex.js';
+import { percentile } from '../utils/helpers.js';
+
+const args = process.argv.slice(2);
+const option = (name, fallback) => {
+  const index = args.indexOf(`--${name}`);
+  return index >= 0 ? parseInt(args[index + 1], 10) : fallback;
+};
+
+const POSTS = option('posts', 100000);
+const QUERIES = option('queries', 2000);
+const BUDGET_MS = option('budget', 50);
+
+const CATEGORIES = ['General', 'Beginner Questions', 'Plant Care', 'Success Stories', 'Problems', 'DIY Projects', 'Seasonal Tips'];
+const PLANTS = ['tomato', 'basil', 'mint', 'chili', 'spinach', 'lettuce', 'cucumber', 'marigold', 'coriander', 'radish', 'okra', 'eggplant', 'gourd', 'papaya', 'lemon', 'guava', 'rose', 'jasmine', 'aloe', 'money plant'];
+const WORDS = ['balcony', 'rooftop', 'water', 'leaves', 'yellow', 'soil', 'compost', 'pot', 'sunlight', 'shade', 'monsoon', 'winter', 'summer', 'pest', 'aphids', 'fungus', 'fertilizer', 'seedling', 'harvest', 'prune', 'drainage', 'mulch', 'organic', 'neem', 'flower', 'fruit', 'growth', 'roots', 'wilting', 'humidity', 'heat', 'rain', 'wind', 'trellis', 'container', 'germination', 'cutting', 'repotting', 'spray', 'morning', 'evening', 'dhaka', 'chittagong', 'sylhet', 'tips', 'help', 'first', 'success', 'problem', 'question'];
+
+// The vocabulary is deliberately small: every word appears in thousands of
+// posts, which is the slow case for an inverted index.
+// Deterministic PRNG so every run indexes the same corpus
+let seed = 42;
+const random = () => {
+  seed = (seed * 1664525 + 1013904223) % 4294967296;
+  return seed / 4294967296;
+};
+const pickOne = (list) => list[Math.floor(random() * list.length)];
+const sentence = (length) => Array.from({ length }, () => (random() < 0.2 ? pickOne(PLANTS) : pickOne(WORDS))).join(' ');
+
+const QUERY_MIX = [
+  () => ({ q: pickOne(PLANTS) }),
+  () => ({ q: pickOne(WORDS).slice(0, 3) }),
+  () => ({ q: `${pickOne(PLANTS)} ${pickOne(WORDS)}` }),
+  () => {
+    // Drop one letter to simulate a typo
+    const word = pickOne(WORDS.filter(candidate => candidate.length >= 5));
+    const at = 1 + Math.floor(random() * (word.length - 1));
+    return { q: word.slice(0, at) + word.slice(at + 1) };
+  },
+  () => ({ q: `${pickOne(WORDS)} ${pickOne(WORDS)}`, filters: { category: pickOne(CATEGORIES) } })
+];
+
+const index = new SearchIndex({
+  fields: { title: 3, tags: 2, category: 1, content: 1 },
+  facets: ['category']
+});
+
+const buildStart = process.hrtime.bigint();
+for (let i = 0; i < POSTS; i++) {
+  index.add(`post${i}`, {
+    title: sentence(6),
+    content: sentence(40),
+    tags: [pickOne(PLANTS), pickOne(WORDS)],
+    category: pickOne(CATEGORIES),
+    rank: i
+  });
+}
+const buildMs = Number(process.hrtime.bigint() - buildStart) / 1e6;
+const heapMb = process.memoryUsage().heapUsed / 1024 / 1024;
+
+console.log(`\n🔍 Indexed ${POSTS} posts (${index.postings.size} terms) in ${buildMs.toFixed(0)}ms, heap ${heapMb.toFixed(0)}MB`);
+
+// Warm up the JIT before measuring
+for (let i = 0; i < 200; i++) {
+  const { q, filters } = pickOne(QUERY_MIX)();
+  index.search(q, { filters, limit: 20 });
+}
+
+const timings = [];
+let matched = 0;
+for (let i = 0; i < QUERIES; i++) {
+  const { q, filters } = QUERY_MIX[i % QUERY_MIX.length]();
+  const start = process.hrtime.bigint();
+  const result = index.search(q, { filters, limit: 20 });
+  timings.push(Number(process.hrtime.bigint() - start) / 1e6);
+  matched += result.total;
+}
+
+const p50 = percentile(timings, 50);
+const p95 = percentile(timings, 95);
+const p99 = percentile(timings, 99);
+console.log(`   ${QUERIES} queries, avg ${Math.round(matched / QUERIES)} matches each`);
+console.log(`   p50 ${p50.toFixed(2)}ms  p95 ${p95.toFixed(2)}ms  p99 ${p99.toFixed(2)}ms  max ${Math.max(...timings).toFixed(2)}ms`);
+
+if (p99 > BUDGET_MS) {
+  console.log(`\n❌ p99 ${p99.toFixed(2)}ms is over the ${BUDGET_MS}ms budget\n`);
+  process.exit(1);
+}
+
+console.log(`\n✅ p99 within the ${BUDGET_MS}ms budget\n`);
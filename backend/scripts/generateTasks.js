@@ -0,0 +1,29 @@
+// Materializes upcoming tasks from every plant's care schedule in one pass.
+// Usage: npm run generate:tasks [-- --all] [-- --days 14]
+import 'dotenv/config';
+import mongoose from 'mongoose';
+import connectDB from '../config/database.js';
+import Plant from '../models/Plant.js';
+import { generateScheduledTasks, SCHEDULE_WINDOW_DAYS } from '../services/taskScheduler.js';
+
+const args = process.argv.slice(2);
+const daysIndex = args.indexOf('--days');
+const windowDays = daysIndex >= 0 ? parseInt(args[daysIndex + 1], 10) : SCHEDULE_WINDOW_DAYS;
+
+await connectDB();
+
+// --all forgets previous runs so every active plant is regenerated.
+// Dismissed (user-deleted) tasks stay dismissed.
+if (args.includes('--all')) {
+  await Plant.updateMany(
+    {},
+    { $unset: { 'taskGeneration.generatedAt': 1, 'taskGeneration.generatedUntil': 1 } },
+    { timestamps: false }
+  );
+}
+
+const stats = await generateScheduledTasks({ windowDays });
+console.log(`🗓️  Scanned ${stats.plantsScanned} plants in ${stats.durationMs}ms`);
+console.log(`   ${stats.tasksUpserted} tasks created, ${stats.tasksRemoved} stale tasks removed`);
+
+await mongoose.disconnect();
@@ -0,0 +1,77 @@
+// Moves base64 images stored inside diagnosis and post documents into the
+// blob store, leaving only ImageAsset ids behind.
+// Usage: npm run migrate:images
+import 'dotenv/config';
+import mongoose from 'mongoose';
+import connectDB from '../config/database.js';
+import PlantDiagnosis from '../models/PlantDiagnosis.js';
+import Post from '../models/Post.js';
+import { storeImage } from '../services/imageService.js';
+import { hashBands } from '../utils/imageHash.js';
+
+const BLOB_ID = /^[a-f0-9]{64}$/;
+
+// Existing images are kept whatever their size (maxBytes 0 disables the limit)
+const storeInline = (image, uploadedBy) => {
+  const buffer = Buffer.from(image.replace(/^data:[^;]+;base64,/, ''), 'base64');
+  return storeImage(buffer, { uploadedBy, maxBytes: 0 });
+};
+
+await connectDB();
+
+let diagnoses = 0;
+let posts = 0;
+let failed = 0;
+
+// One document at a time, so only a single image is in memory
+const diagnosisCursor = PlantDiagnosis.find({ image: { $not: BLOB_ID } })
+  .select('image user')
+  .lean()
+  .cursor();
+
+for await (const diagnosis of diagnosisCursor) {
+  try {
+    const asset = await storeInline(diagnosis.image, diagnosis.user);
+    await PlantDiagnosis.updateOne({ _id: diagnosis._id }, {
+      $set: {
+        image: asset._id,
+        imageHash: asset._id,
+        perceptualHash: asset.perceptualHash,
+        hashBands: asset.perceptualHash ? hashBands(asset.perceptualHash) : []
+      }
+    }, { timestamps: false });
+    diagnoses++;
+  } catch (error) {
+    failed++;
+    console.error(`❌ Diagnosis ${diagnosis._id}: ${error.message}`);
+  }
+}
+
+// Post images may also be external URLs; only inline data is moved
+const postCursor = Post.find({ images: /^data:/ })
+  .select('images author')
+  .lean()
+  .cursor();
+
+for await (const post of postCursor) {
+  try {
+    const images = [];
+    for (const image of post.images) {
+      if (!image.startsWith('data:')) {
+        images.push(image);
+        continue;
+      }
+      const asset = await storeInline(image, post.author);
+      images.push(asset._id);
+    }
+    await Post.updateOne({ _id: post._id }, { $set: { images } }, { timestamps: false });
+    posts++;
+  } catch (error) {
+    failed++;
+    console.error(`❌ Post ${post._id}: ${error.message}`);
+  }
+}
+
+console.log(`🖼️  Moved images for ${diagnoses} diagnoses and ${posts} posts (${failed} failed)`);
+
+await mongoose.disconnect();
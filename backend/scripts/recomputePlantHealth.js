@@ -0,0 +1,25 @@
+// Recomputes daysGrowing, watering overdue days and health for every active
+// plant in chunked bulkWrites, printing progress as it goes.
+// Usage: npm run recompute:health [-- --batch 1000]
+import 'dotenv/config';
+import mongoose from 'mongoose';
+import connectDB from '../config/database.js';
+import { recomputePlantHealth, HEALTH_BATCH_SIZE } from '../services/plantHealthJob.js';
+
+const args = process.argv.slice(2);
+const batchIndex = args.indexOf('--batch');
+const batchSize = batchIndex >= 0 ? parseInt(args[batchIndex + 1], 10) : HEALTH_BATCH_SIZE;
+
+await connectDB();
+
+const stats = await recomputePlantHealth({
+  batchSize,
+  onProgress: progress => {
+    const rate = progress.durationMs > 0 ? Math.round(progress.plantsScanned / (progress.durationMs / 1000)) : 0;
+    console.log(`   ${progress.plantsScanned} scanned, ${progress.plantsUpdated} updated (${rate} plants/s)`);
+  }
+});
+console.log(`🌿 Scanned ${stats.plantsScanned} plants in ${stats.durationMs}ms`);
+console.log(`   ${stats.plantsUpdated} plants updated in ${stats.batches} batches`);
+
+await mongoose.disconnect();
@@ -1,34 +1,205 @@
+// Load .env before any module reads process.env at import time
+import 'dotenv/config';
+// Registers the Mongoose timing plugin; must load before any model
+import './utils/mongoMetrics.js';
 import express from 'express';
+import mongoose from 'mongoose';
 import cors from 'cors';
-import dotenv from 'dotenv';
+import compression from 'compression';
+import zlib from 'zlib';
 import morgan from 'morgan';
-import connectDB from './config/database.js';
-
-// Load environment variables
-dotenv.config();
+import connectDB, { disconnectDB } from './config/database.js';
+import { requestMetrics } from './middleware/requestMetrics.js';
+import { metricsAuth } from './middleware/auth.js';
+import logger from './utils/logger.js';
+import { getUserCacheStats } from './utils/userCache.js';
+import { getDashboardCacheStats } from './utils/dashboardCache.js';
+import { generateScheduledTasks } from './services/taskScheduler.js';
+import { recomputePlantHealth } from './services/plantHealthJob.js';
+import { getWeatherStats } from './services/weatherService.js';
+import { getGatewayStats } from './services/apiGateway.js';
+import { startDiagnosisLeases, getDiagnosisQueueStats } from './services/diagnosisQueue.js';
+import { startViewFlusher, flushViews, getCommunityFeedStats } from './services/communityFeed.js';
+import { seedPlantCatalog } from './services/plantCatalog.js';
+import {
+  loadCatalogSnapshot,
+  writeCatalogSnapshot,
+  isSnapshotStale,
+  watchCatalogSnapshot,
+  onCatalogLoaded,
+  getCatalogMirrorStats
+} from './services/catalogMirror.js';
+import { syncCatalog } from './services/catalogSync.js';
+import {
+  buildSearchIndexes,
+  startSearchRefresher,
+  rebuildCatalogIndex,
+  getSearchStats
+} from './services/searchService.js';
+import { auditQueryPlans, reportQueryPlans } from './utils/queryPlanAudit.js';
 
 // Initialize Express app
 const app = express();
 
-// Connect to MongoDB
-connectDB();
+// List and detail routes set their own ETags from document timestamps
+// (middleware/conditionalGet.js); don't hash every response body
+app.set('etag', false);
+
+// Serve the plant catalogue from its on-disk snapshot straight away, before
+// Mongo is even connected; the search index follows every reload
+onCatalogLoaded(rebuildCatalogIndex);
+loadCatalogSnapshot()
+  .then(count => count !== null && console.log(`🌱 Catalogue snapshot: ${count} plants`))
+  .catch(error => console.error('❌ Catalogue snapshot load failed:', error.message))
+  .finally(watchCatalogSnapshot);
+
+// Under cluster.js only worker 0 runs the database-wide jobs; a single
+// `node server.js` process runs everything
+const isLeader = (process.env.CLUSTER_WORKER_INDEX || '0') === '0';
+
+// Jobs that work over the whole database and must run in one process only
+const startLeaderJobs = () => {
+  // Optionally check that controller queries are index-backed
+  if (process.env.QUERY_PLAN_AUDIT === 'true') {
+    auditQueryPlans()
+      .then(reportQueryPlans)
+      .catch(error => console.error('❌ Query plan audit failed:', error.message));
+  }
+
+  // Periodically materialize upcoming tasks from plant care schedules
+  const taskGenerationInterval = parseInt(process.env.TASK_GENERATION_INTERVAL_MS, 10);
+  if (taskGenerationInterval > 0) {
+    const runTaskGeneration = () => {
+      generateScheduledTasks()
+        .then(stats => console.log(`🗓️  Task generation: ${stats.plantsScanned} plants, +${stats.tasksUpserted} / -${stats.tasksRemoved} tasks in ${stats.durationMs}ms`))
+        .catch(error => console.error('❌ Task generation failed:', error.message));
+    };
+    runTaskGeneration();
+    setInterval(runTaskGeneration, taskGenerationInterval).unref();
+  }
+
+  // Keep daysGrowing and health current for plants nobody has edited.
+  // On by default (hourly); PLANT_HEALTH_INTERVAL_MS=0 turns it off.
+  const healthInterval = parseInt(process.env.PLANT_HEALTH_INTERVAL_MS ?? '3600000', 10);
+  if (healthInterval > 0) {
+    const runHealthRecompute = () => {
+      recomputePlantHealth()
+        .then(stats => console.log(`🌿 Plant health: ${stats.plantsScanned} plants, ${stats.plantsUpdated} updated in ${stats.durationMs}ms`))
+        .catch(error => console.error('❌ Plant health recompute failed:', error.message));
+    };
+    runHealthRecompute();
+    setInterval(runHealthRecompute, healthInterval).unref();
+  }
+
+  // Mirror the Perenual species list a few pages at a time (every 6 hours
+  // by default; CATALOG_SYNC_INTERVAL_MS=0 turns it off)
+  const catalogSyncInterval = parseInt(process.env.CATALOG_SYNC_INTERVAL_MS ?? '21600000', 10);
+  if (catalogSyncInterval > 0) {
+    const runCatalogSync = () => {
+      syncCatalog()
+        .then(stats => stats.pages > 0 && console.log(`🌱 Catalogue sync: ${stats.pages} pages, ${stats.written} plants written${stats.completed ? ', pass complete' : ''}`))
+        .catch(error => console.error('❌ Catalogue sync failed:', error.message));
+    };
+    runCatalogSync();
+    setInterval(runCatalogSync, catalogSyncInterval).unref();
+  }
+};
+
+// Seed the bundled catalogue entries and rewrite the snapshot if Mongo has
+// changes it is missing; the other workers pick the new file up
+const refreshCatalogSnapshot = async () => {
+  const seeded = await seedPlantCatalog();
+  if (seeded > 0 || await isSnapshotStale()) {
+    const { count, bytes, durationMs } = await writeCatalogSnapshot();
+    console.log(`🌱 Catalogue snapshot written: ${count} plants, ${bytes} bytes in ${durationMs}ms`);
+    await loadCatalogSnapshot();
+  }
+};
+
+// Connect to MongoDB (retrying with backoff), then start background work.
+// If Mongo stays unreachable the process exits; cluster.js restarts it.
+connectDB()
+  .then(() => {
+    if (isLeader) startLeaderJobs();
+
+    // Renew this worker's diagnosis leases and resume jobs whose owner died
+    startDiagnosisLeases();
+
+    // Write buffered post view counts in batches
+    startViewFlusher();
+
+    // Load posts and the plant catalogue into the in-process search indexes
+    (isLeader ? refreshCatalogSnapshot() : Promise.resolve())
+      .then(buildSearchIndexes)
+      .then(({ posts, catalog, durationMs }) => {
+        console.log(`🔍 Search index: ${posts} posts, ${catalog} catalogue plants in ${durationMs}ms`);
+        startSearchRefresher();
+      })
+      .catch(error => console.error('❌ Search index build failed:', error.message));
+  })
+  .catch(() => process.exit(1));
+
+const isProduction = process.env.NODE_ENV === 'production';
+
+// Set once SIGTERM arrives: /api/health reports 503 so load balancers stop
+// routing here, and responses close their connections
+let draining = false;
 
 // Middleware
+// Latency and Mongo time per route for /api/metrics. In production this also
+// writes the sampled JSON request log that replaces morgan.
+app.use(requestMetrics({ log: isProduction }));
+app.use((req, res, next) => {
+  if (draining) res.set('Connection', 'close');
+  next();
+});
+// gzip or brotli (by Accept-Encoding) for responses above the threshold;
+// small JSON bodies aren't worth the CPU
+app.use(compression({
+  threshold: parseInt(process.env.COMPRESSION_THRESHOLD, 10) || 1024,
+  brotli: { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 4 } }
+}));
+// Legacy diagnosis uploads carry a base64 image, well over the default 100kb
+// body limit; multipart uploads stream to the blob store instead
+app.use('/api/diagnosis/identify', express.json({ limit: process.env.DIAGNOSIS_BODY_LIMIT || '10mb' }));
 app.use(express.json());
 app.use(express.urlencoded({ extended: true }));
 app.use(cors({
   origin: process.env.FRONTEND_URL || 'http://localhost:5173', // ✅ FIXED
   credentials: true
 }));
-app.use(morgan('dev'));
+if (!isProduction) {
+  app.use(morgan('dev'));
+}
 
-// Health check endpoint
+// Health check endpoint - liveness only, safe to leave public
 app.get('/api/health', (req, res) => {
+  res.status(draining ? 503 : 200).json({
+    success: !draining,
+    message: draining ? 'UrbanEos API Server is shutting down' : 'UrbanEos API Server is running',
+    worker: process.env.CLUSTER_WORKER_INDEX ? { index: Number(process.env.CLUSTER_WORKER_INDEX), pid: process.pid } : undefined,
+    timestamp: new Date().toISOString(),
+    uptime: Math.round(process.uptime()),
+    database: mongoose.STATES[mongoose.connection.readyState]
+  });
+});
+
+// Cache, queue, search and provider stats for this process (bearer METRICS_TOKEN)
+app.get('/api/health/details', metricsAuth, (req, res) => {
+  res.set('Cache-Control', 'no-store');
   res.status(200).json({
     success: true,
-    message: 'UrbanEos API Server is running',
-    timestamp: new Date().toISOString(),
-    environment: process.env.NODE_ENV || 'development'
+    environment: process.env.NODE_ENV || 'development',
+    caches: {
+      users: getUserCacheStats(),
+      dashboard: getDashboardCacheStats(),
+      weather: getWeatherStats()
+    },
+    diagnosisQueue: getDiagnosisQueueStats(),
+    communityViews: getCommunityFeedStats(),
+    search: getSearchStats(),
+    catalog: getCatalogMirrorStats(),
+    providers: getGatewayStats()
   });
 });
 
@@ -40,6 +211,12 @@ import diagnosisRoutes from './routes/diagnosis.js';
 import weatherRoutes from './routes/weather.js';
 import communityRoutes from './routes/community.js';
 import quoteRoutes from './routes/quotes.js';
+import imageRoutes from './routes/images.js';
+import searchRoutes from './routes/search.js';
+import databaseRoutes from './routes/database.js';
+import dashboardRoutes from './routes/dashboard.js';
+import metricsRoutes from './routes/metrics.js';
+import providerRoutes from './routes/providers.js';
 
 // API Routes (✅ ALL routes registered)
 app.use('/api/auth', authRoutes);
@@ -49,6 +226,12 @@ app.use('/api/diagnosis', diagnosisRoutes);
 app.use('/api/weather', weatherRoutes);
 app.use('/api/community', communityRoutes);
 app.use('/api/quotes', quoteRoutes);
+app.use('/api/images', imageRoutes);
+app.use('/api/search', searchRoutes);
+app.use('/api/database', databaseRoutes);
+app.use('/api/dashboard', dashboardRoutes);
+app.use('/api/metrics', metricsRoutes);
+app.use('/api/providers', providerRoutes);
 
 // 404 Handler
 app.use((req, res) => {
@@ -60,8 +243,12 @@ app.use((req, res) => {
 
 // Global Error Handler
 app.use((err, req, res, next) => {
-  console.error('❌ Error:', err.stack);
-  
+  if (isProduction) {
+    logger.error('unhandled error', { method: req.method, url: req.originalUrl, error: err.message, stack: err.stack });
+  } else {
+    console.error('❌ Error:', err.stack);
+  }
+
   res.status(err.statusCode || 500).json({
     success: false,
     message: err.message || 'Internal Server Error',
@@ -71,11 +258,50 @@ app.use((err, req, res, next) => {
 
 // Start Server
 const PORT = process.env.PORT || 5000; // ✅ FIXED
-app.listen(PORT, '0.0.0.0', () => {
+const server = app.listen(PORT, '0.0.0.0', () => {
   console.log(`\n🚀 UrbanEos API Server Started!`);
   console.log(`📡 Server running on http://0.0.0.0:${PORT}`);
   console.log(`🌍 Environment: ${process.env.NODE_ENV || 'development'}`);
   console.log(`⏰ Started at: ${new Date().toLocaleString()}\n`);
 });
 
+// Graceful shutdown: stop accepting connections, let in-flight requests
+// finish, write out buffered view counts and logs, then close Mongo.
+// Connections still open after SHUTDOWN_TIMEOUT_MS are cut.
+const SHUTDOWN_TIMEOUT_MS = parseInt(process.env.SHUTDOWN_TIMEOUT_MS, 10) || 10000;
+
+const shutdown = (signal) => {
+  if (draining) return;
+  draining = true;
+  console.log(`🛑 ${signal} received, draining connections`);
+
+  const forceExit = setTimeout(() => {
+    console.error('❌ Requests still in flight after shutdown timeout, closing connections');
+    server.closeAllConnections();
+    logger.flush();
+    process.exit(1);
+  }, SHUTDOWN_TIMEOUT_MS);
+  forceExit.unref();
+
+  // close() waits for in-flight requests; idle keep-alive sockets are closed now
+  server.close(async () => {
+    try {
+      // The first call may only wait for a flush that was already running
+      await flushViews();
+      await flushViews();
+    } catch (error) {
+      console.error('❌ Final view flush failed:', error.message);
+    }
+    await disconnectDB().catch(() => {});
+    logger.flush();
+    console.log('👋 Server stopped');
+    process.exit(0);
+  });
+};
+
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
+// A worker whose primary has gone away drains and exits too
+process.on('disconnect', () => shutdown('Primary disconnect'));
+
 export default app;
\ No newline at end of file
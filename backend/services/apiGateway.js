@@ -0,0 +1,404 @@
+import http from 'http';
+import https from 'https';
+import axios from 'axios';
+import ApiQuota from '../models/ApiQuota.js';
+import CircuitBreaker from '../utils/circuitBreaker.js';
+import { registry } from '../utils/metrics.js';
+
+// Every call to an external API goes through here. The gateway provides:
+// - keep-alive connection pools, so repeat calls skip the TCP/TLS handshake
+// - free-tier quotas (contracts.md) counted in Mongo, so every cluster
+//   worker draws from the same allowance and the counts survive restarts.
+//   Each call reserves one unit before it is sent.
+// - a circuit breaker per provider. Errors and calls slower than `slowMs`
+//   count as failures, so a provider whose latency spikes is skipped for a
+//   while, the same as one that is down.
+// - callWithFailover(): try providers in order, moving on when one is out of
+//   quota, open, failing or timing out. If a provider has not answered after
+//   its `hedgeAfterMs`, the next one starts in parallel and the first
+//   answer wins.
+//
+// Each <PROVIDER>_BASE_URL can point at a local fake server, so tests never
+// spend real quota.
+const envInt = (name, fallback) => {
+  const value = parseInt(process.env[name], 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+export const PROVIDERS = {
+  plantid: {
+    label: 'Plant.id',
+    baseUrl: process.env.PLANT_ID_BASE_URL || 'https://api.plant.id/v2',
+    apiKey: process.env.PLANT_ID_API_KEY,
+    auth: key => ({ headers: { 'Api-Key': key } }),
+    quota: { limit: envInt('PLANT_ID_QUOTA', 100), period: 'month' },
+    timeoutMs: envInt('PLANT_ID_TIMEOUT_MS', 30000),
+    slowMs: envInt('PLANT_ID_SLOW_MS', 15000),
+    hedgeAfterMs: envInt('PLANT_ID_HEDGE_MS', 20000)
+  },
+  huggingface: {
+    label: 'Hugging Face',
+    baseUrl: process.env.HUGGING_FACE_BASE_URL || 'https://api-inference.huggingface.co/models',
+    apiKey: process.env.HUGGING_FACE_API_KEY,
+    auth: key => ({ headers: { Authorization: `Bearer ${key}` } }),
+    quota: { limit: envInt('HUGGING_FACE_QUOTA', 30000), period: 'month' },
+    timeoutMs: envInt('HUGGING_FACE_TIMEOUT_MS', 30000),
+    slowMs: envInt('HUGGING_FACE_SLOW_MS', 15000),
+    hedgeAfterMs: 0
+  },
+  openweather: {
+    label: 'OpenWeatherMap',
+    baseUrl: process.env.OPENWEATHER_BASE_URL || 'https://api.openweathermap.org/data/2.5',
+    apiKey: process.env.OPENWEATHER_API_KEY,
+    auth: key => ({ params: { appid: key } }),
+    quota: { limit: envInt('OPENWEATHER_QUOTA', 1000), period: 'day' },
+    timeoutMs: envInt('WEATHER_UPSTREAM_TIMEOUT_MS', 10000),
+    slowMs: envInt('OPENWEATHER_SLOW_MS', 3000),
+    hedgeAfterMs: 0
+  },
+  perenual: {
+    label: 'Perenual',
+    baseUrl: process.env.PERENUAL_BASE_URL || 'https://perenual.com/api',
+    apiKey: process.env.PERENUAL_API_KEY,
+    auth: key => ({ params: { key } }),
+    quota: { limit: envInt('PERENUAL_QUOTA', 100), period: 'day' },
+    timeoutMs: envInt('PERENUAL_TIMEOUT_MS', 10000),
+    slowMs: envInt('PERENUAL_SLOW_MS', 5000),
+    hedgeAfterMs: 0
+  }
+};
+
+const BASE_URL_ENV = {
+  plantid: 'PLANT_ID_BASE_URL',
+  huggingface: 'HUGGING_FACE_BASE_URL',
+  openweather: 'OPENWEATHER_BASE_URL',
+  perenual: 'PERENUAL_BASE_URL'
+};
+
+const MAX_SOCKETS = envInt('GATEWAY_MAX_SOCKETS', 50);
+
+const client = axios.create({
+  httpAgent: new http.Agent({ keepAlive: true, maxSockets: MAX_SOCKETS }),
+  httpsAgent: new https.Agent({ keepAlive: true, maxSockets: MAX_SOCKETS })
+});
+
+export class GatewayError extends Error {
+  constructor(message, { provider, code, statusCode = 502, status } = {}) {
+    super(message);
+    this.provider = provider;
+    this.code = code;
+    this.statusCode = statusCode;
+    // HTTP status the provider answered with, if it answered
+    this.status = status;
+  }
+}
+
+const providerCalls = registry.counter(
+  'app_provider_requests_total',
+  'Outbound provider calls by outcome',
+  ['provider', 'outcome']
+);
+const providerDuration = registry.histogram(
+  'app_provider_request_duration_seconds',
+  'Outbound provider call latency',
+  ['provider']
+);
+
+const breakers = new Map(Object.keys(PROVIDERS).map(name => [name, new CircuitBreaker({
+  failureThreshold: envInt('GATEWAY_FAILURE_THRESHOLD', 5),
+  cooldownMs: envInt('GATEWAY_COOLDOWN_MS', 30000)
+})]));
+
+const newStats = () => ({
+  calls: 0,
+  succeeded: 0,
+  failed: 0,
+  slow: 0,
+  timeouts: 0,
+  cancelled: 0,
+  quotaRejected: 0,
+  circuitRejected: 0,
+  avgMs: 0,
+  quotaUsed: null,
+  quotaPeriod: null
+});
+const stats = Object.fromEntries(Object.keys(PROVIDERS).map(name => [name, newStats()]));
+const failoverStats = { calls: 0, failovers: 0, hedges: 0, exhausted: 0 };
+
+// Period a quota counts against, and when it ends (UTC)
+const quotaPeriod = (period, now = new Date()) => {
+  const year = now.getUTCFullYear();
+  const month = now.getUTCMonth();
+  if (period === 'day') {
+    const day = now.getUTCDate();
+    return { key: now.toISOString().slice(0, 10), endsAt: Date.UTC(year, month, day + 1) };
+  }
+  return { key: now.toISOString().slice(0, 7), endsAt: Date.UTC(year, month + 1, 1) };
+};
+
+// Providers known to be out of quota, until their period ends, so further
+// calls are refused without a Mongo round-trip
+const exhaustedUntil = new Map();
+
+// Take one unit of the provider's quota. Returns false if none is left.
+// The filter only matches while used < limit, so the first call of a
+// period upserts the (provider, period) document. A duplicate-key error
+// means the document already exists: either another process created it
+// first, or the limit was reached and the upsert tried to insert a second
+// one. The update is retried without upsert to tell which.
+const takeQuotaUnit = (name, key, limit, upsert) => {
+  return ApiQuota.findOneAndUpdate(
+    { provider: name, period: key, used: { $lt: limit } },
+    { $inc: { used: 1 }, $set: { limit } },
+    { upsert, new: true }
+  ).lean();
+};
+
+const reserveQuota = async (name, { limit, period }) => {
+  const { key, endsAt } = quotaPeriod(period);
+  if ((exhaustedUntil.get(name) || 0) > Date.now()) return false;
+
+  let quota;
+  try {
+    quota = await takeQuotaUnit(name, key, limit, true);
+  } catch (error) {
+    if (error.code !== 11000) throw error;
+    quota = await takeQuotaUnit(name, key, limit, false);
+  }
+
+  stats[name].quotaPeriod = key;
+  if (!quota) {
+    // The document exists and used >= limit
+    exhaustedUntil.set(name, endsAt);
+    stats[name].quotaUsed = limit;
+    return false;
+  }
+  stats[name].quotaUsed = quota.used;
+  return true;
+};
+
+export const isConfigured = (name) => {
+  const provider = PROVIDERS[name];
+  return Boolean(provider.apiKey || process.env[BASE_URL_ENV[name]]);
+};
+
+const record = (name, outcome, ms) => {
+  providerCalls.inc({ provider: name, outcome });
+  if (ms !== undefined) {
+    providerDuration.observe({ provider: name }, ms / 1000);
+    const providerStats = stats[name];
+    // Moving average, weighted towards recent calls
+    providerStats.avgMs = providerStats.avgMs === 0 ? ms : providerStats.avgMs * 0.8 + ms * 0.2;
+  }
+};
+
+// One call to one provider. `request` is an axios config relative to the
+// provider's base URL; auth is added here. Resolves with the axios response.
+export const callProvider = async (name, request, { signal } = {}) => {
+  const provider = PROVIDERS[name];
+  if (!provider) {
+    throw new GatewayError(`Unknown provider ${name}`, { provider: name, code: 'UNKNOWN_PROVIDER', statusCode: 500 });
+  }
+  if (!isConfigured(name)) {
+    throw new GatewayError(`${provider.label} is not configured`, { provider: name, code: 'NOT_CONFIGURED', statusCode: 503 });
+  }
+
+  const providerStats = stats[name];
+  const breaker = breakers.get(name);
+
+  if (!breaker.allow()) {
+    providerStats.circuitRejected++;
+    record(name, 'circuit_open');
+    throw new GatewayError(`${provider.label} is temporarily unavailable`, { provider: name, code: 'CIRCUIT_OPEN', statusCode: 503 });
+  }
+
+  let reserved;
+  try {
+    reserved = await reserveQuota(name, provider.quota);
+  } catch (error) {
+    // Without the shared count the quota can't be enforced; don't call
+    breaker.release();
+    throw new GatewayError(`${provider.label} quota check failed: ${error.message}`, { provider: name, code: 'QUOTA_UNAVAILABLE', statusCode: 503 });
+  }
+  if (!reserved) {
+    breaker.release();
+    providerStats.quotaRejected++;
+    record(name, 'quota_exhausted');
+    throw new GatewayError(`${provider.label} quota is used up for this ${provider.quota.period}`, { provider: name, code: 'QUOTA_EXHAUSTED', statusCode: 503 });
+  }
+
+  const auth = provider.apiKey ? provider.auth(provider.apiKey) : {};
+  const started = Date.now();
+  providerStats.calls++;
+
+  try {
+    const response = await client.request({
+      ...request,
+      baseURL: provider.baseUrl,
+      timeout: provider.timeoutMs,
+      signal,
+      headers: { ...auth.headers, ...request.headers },
+      params: { ...auth.params, ...request.params }
+    });
+
+    const ms = Date.now() - started;
+    providerStats.succeeded++;
+    if (ms > provider.slowMs) {
+      // Use the answer, but count it against the provider
+      providerStats.slow++;
+      breaker.failure();
+      record(name, 'slow', ms);
+    } else {
+      breaker.success();
+      record(name, 'success', ms);
+    }
+    return response;
+  } catch (error) {
+    const ms = Date.now() - started;
+
+    if (axios.isCancel(error)) {
+      // Lost a hedged race; says nothing about the provider's health
+      providerStats.cancelled++;
+      breaker.release();
+      record(name, 'cancelled');
+      throw new GatewayError(`${provider.label} call cancelled`, { provider: name, code: 'CANCELLED' });
+    }
+
+    const status = error.response?.status;
+    const timedOut = error.code === 'ECONNABORTED' || error.code === 'ETIMEDOUT';
+    // 4xx other than 429 means the request was bad, not the provider
+    const clientError = status >= 400 && status < 500 && status !== 429;
+
+    if (clientError) {
+      breaker.success();
+    } else {
+      breaker.failure();
+    }
+    providerStats.failed++;
+    if (timedOut) providerStats.timeouts++;
+    record(name, timedOut ? 'timeout' : 'error', ms);
+
+    throw new GatewayError(`${provider.label} error: ${error.message}`, {
+      provider: name,
+      code: timedOut ? 'TIMEOUT' : clientError ? 'REJECTED' : 'UPSTREAM_ERROR',
+      status
+    });
+  }
+};
+
+// Errors worth trying the next provider for. A request the provider
+// rejected as invalid (4xx) would be just as invalid elsewhere.
+const shouldFailover = (error) => error.code !== 'REJECTED';
+
+// Try `attempts` ([{ provider, request, transform }]) in order until one
+// succeeds. Resolves with { provider, data }, where data is the transformed
+// response body. Rejects with the last error once every provider has failed.
+export const callWithFailover = (attempts) => new Promise((resolve, reject) => {
+  const errors = [];
+  const controllers = [];
+  let next = 0;
+  let running = 0;
+  let settled = false;
+  let hedgeTimer = null;
+
+  failoverStats.calls++;
+
+  const settle = (winner) => {
+    settled = true;
+    clearTimeout(hedgeTimer);
+    controllers.forEach(controller => controller !== winner && controller.abort());
+  };
+
+  const giveUp = () => {
+    settle(null);
+    failoverStats.exhausted++;
+    const unavailable = errors.every(error => error.statusCode === 503);
+    const summary = errors.map(error => `${PROVIDERS[error.provider]?.label || error.provider}: ${error.message}`).join('; ');
+    reject(new GatewayError(`No provider could handle the request (${summary})`, {
+      provider: errors[errors.length - 1]?.provider,
+      code: 'ALL_PROVIDERS_FAILED',
+      statusCode: unavailable ? 503 : 502
+    }));
+  };
+
+  const launch = () => {
+    if (settled || next >= attempts.length) return;
+
+    const { provider, request, transform } = attempts[next++];
+    if (next > 1) failoverStats.failovers++;
+
+    const controller = new AbortController();
+    controllers.push(controller);
+    running++;
+
+    // Start the next provider alongside this one if it is slow to answer
+    clearTimeout(hedgeTimer);
+    const hedgeAfterMs = PROVIDERS[provider]?.hedgeAfterMs;
+    if (hedgeAfterMs > 0 && next < attempts.length) {
+      hedgeTimer = setTimeout(() => {
+        failoverStats.hedges++;
+        launch();
+      }, hedgeAfterMs);
+    }
+
+    callProvider(provider, request, { signal: controller.signal })
+      .then(response => (transform ? transform(response.data) : response.data))
+      .then(data => {
+        running--;
+        if (settled) return;
+        settle(controller);
+        resolve({ provider, data });
+      })
+      .catch(error => {
+        running--;
+        if (settled) return;
+        errors.push(error instanceof GatewayError ? error : new GatewayError(error.message, { provider, code: 'TRANSFORM_FAILED' }));
+
+        if (!shouldFailover(error)) {
+          settle(null);
+          reject(error);
+          return;
+        }
+        launch();
+        if (running === 0 && next >= attempts.length) giveUp();
+      });
+  };
+
+  launch();
+});
+
+// Quota usage for the current periods, as stored in Mongo
+export const getProviderUsage = async () => {
+  const current = Object.entries(PROVIDERS).map(([name, provider]) => ({
+    name,
+    provider,
+    period: quotaPeriod(provider.quota.period).key
+  }));
+  const docs = await ApiQuota.find({ $or: current.map(({ name, period }) => ({ provider: name, period })) }).lean();
+
+  return current.map(({ name, provider, period }) => {
+    const used = docs.find(doc => doc.provider === name)?.used || 0;
+    return {
+      provider: name,
+      label: provider.label,
+      configured: isConfigured(name),
+      period,
+      limit: provider.quota.limit,
+      used,
+      remaining: Math.max(0, provider.quota.limit - used),
+      circuit: breakers.get(name).stats().state
+    };
+  });
+};
+
+// In-process counters since start (per worker)
+export const getGatewayStats = () => {
+  return {
+    providers: Object.fromEntries(Object.entries(stats).map(([name, providerStats]) => [name, {
+      ...providerStats,
+      avgMs: Math.round(providerStats.avgMs),
+      circuit: breakers.get(name).stats()
+    }])),
+    failover: { ...failoverStats }
+  };
+};
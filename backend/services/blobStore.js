@@ -0,0 +1,83 @@
+import crypto from 'crypto';
+import fs from 'fs';
+import path from 'path';
+import { Readable, Transform } from 'stream';
+import { pipeline } from 'stream/promises';
+import { fileURLToPath } from 'url';
+
+// Content-addressed blob store on the local filesystem. A blob's id is the
+// sha256 of its bytes, so identical uploads are stored once and a blob never
+// changes after it is written - ids double as strong ETags.
+const BLOB_DIR = process.env.BLOB_DIR
+  || path.join(path.dirname(fileURLToPath(import.meta.url)), '..', 'uploads', 'blobs');
+const TMP_DIR = path.join(BLOB_DIR, 'tmp');
+
+const BLOB_ID_PATTERN = /^[a-f0-9]{64}$/;
+
+export const isBlobId = (id) => typeof id === 'string' && BLOB_ID_PATTERN.test(id);
+
+// blobs/ab/abcdef... keeps directories small
+export const blobPath = (id) => path.join(BLOB_DIR, id.slice(0, 2), id);
+
+export const blobExists = async (id) => {
+  try {
+    await fs.promises.access(blobPath(id));
+    return true;
+  } catch (error) {
+    return false;
+  }
+};
+
+// Stream bytes into the store, hashing on the way through. Accepts a Buffer or
+// a readable stream; only one chunk is held in memory at a time.
+export const writeBlob = async (source, { maxBytes } = {}) => {
+  const input = Buffer.isBuffer(source) ? Readable.from(source) : source;
+  const hash = crypto.createHash('sha256');
+  let size = 0;
+
+  const hasher = new Transform({
+    transform(chunk, encoding, callback) {
+      size += chunk.length;
+      if (maxBytes && size > maxBytes) {
+        const error = new Error(`Upload exceeds ${maxBytes} bytes`);
+        error.statusCode = 413;
+        return callback(error);
+      }
+      hash.update(chunk);
+      callback(null, chunk);
+    }
+  });
+
+  await fs.promises.mkdir(TMP_DIR, { recursive: true });
+  const tmpPath = path.join(TMP_DIR, crypto.randomUUID());
+
+  try {
+    await pipeline(input, hasher, fs.createWriteStream(tmpPath));
+
+    // busboy cuts file streams off at multer's fileSize limit
+    if (input.truncated) {
+      const error = new Error('Upload exceeds the size limit');
+      error.statusCode = 413;
+      throw error;
+    }
+
+    const id = hash.digest('hex');
+    const target = blobPath(id);
+
+    if (await blobExists(id)) {
+      await fs.promises.unlink(tmpPath);
+    } else {
+      await fs.promises.mkdir(path.dirname(target), { recursive: true });
+      await fs.promises.rename(tmpPath, target);
+    }
+
+    return { id, size };
+  } catch (error) {
+    await fs.promises.unlink(tmpPath).catch(() => {});
+    throw error;
+  }
+};
+
+export const readBlob = (id) => fs.promises.readFile(blobPath(id));
+
+export const deleteBlob = (id) => fs.promises.unlink(blobPath(id)).catch(() => {});
@@ -0,0 +1,177 @@
+import { readFile, writeFile, rename, stat } from 'fs/promises';
+import { fileURLToPath } from 'url';
+import PlantCatalog from '../models/PlantCatalog.js';
+import { encodeCatalog, decodeCatalog } from '../utils/catalogSnapshot.js';
+import { decodeCursor, encodeCursor } from '../utils/helpers.js';
+
+// In-memory copy of the plant catalogue, loaded from an on-disk snapshot
+// (utils/catalogSnapshot.js) so catalogue reads never leave the process.
+// The leader writes the snapshot from Mongo after seeding or syncing; every
+// worker loads it at startup and reloads it when the file changes.
+const SNAPSHOT_PATH = process.env.CATALOG_SNAPSHOT_PATH
+  || fileURLToPath(new URL('../data/catalogSnapshot.bin', import.meta.url));
+const CHECK_INTERVAL_MS = parseInt(process.env.CATALOG_SNAPSHOT_CHECK_MS, 10) || 60 * 1000;
+
+// Fields served by /api/database/plants, and kept in the snapshot
+export const CATALOG_FIELDS = 'name scientificName type difficulty sunNeeds water growthTime seasons cycle otherNames image description source externalId';
+
+let catalog = null;
+const listeners = [];
+
+const stats = {
+  loads: 0,
+  lastLoadMs: 0,
+  writes: 0,
+  lastWriteMs: 0,
+  loadErrors: 0
+};
+
+// Same order as the Mongo (name, _id) index, so cursors work on either
+const compareEntries = (a, b) => {
+  if (a.name !== b.name) return a.name < b.name ? -1 : 1;
+  if (a._id === b._id) return 0;
+  return a._id < b._id ? -1 : 1;
+};
+
+const buildCatalog = ({ builtAt, entries }, mtimeMs) => {
+  entries.sort(compareEntries);
+  const byId = new Map();
+  entries.forEach(entry => byId.set(entry._id, entry));
+  return { builtAt, mtimeMs, entries, byId };
+};
+
+// Called with the entries each time a snapshot is (re)loaded
+export const onCatalogLoaded = (listener) => {
+  listeners.push(listener);
+};
+
+export const isCatalogLoaded = () => catalog !== null;
+
+// Load the snapshot if it exists and differs from the one in memory.
+// Returns the number of entries loaded, or null if nothing was loaded.
+export const loadCatalogSnapshot = async () => {
+  let info;
+  try {
+    info = await stat(SNAPSHOT_PATH);
+  } catch (error) {
+    if (error.code === 'ENOENT') return null;
+    throw error;
+  }
+  if (catalog && catalog.mtimeMs === info.mtimeMs) return null;
+
+  const started = Date.now();
+  try {
+    catalog = buildCatalog(decodeCatalog(await readFile(SNAPSHOT_PATH)), info.mtimeMs);
+  } catch (error) {
+    // Keep serving the previous copy (or Mongo) rather than a broken one
+    stats.loadErrors++;
+    throw error;
+  }
+  stats.loads++;
+  stats.lastLoadMs = Date.now() - started;
+
+  listeners.forEach(listener => listener(catalog.entries));
+  return catalog.entries.length;
+};
+
+// Write a fresh snapshot from Mongo. The file is written beside the target
+// and renamed into place, so readers never see a partial snapshot.
+export const writeCatalogSnapshot = async () => {
+  const started = Date.now();
+  const builtAt = Date.now();
+  const entries = await PlantCatalog.find()
+    .select(CATALOG_FIELDS)
+    .sort({ name: 1, _id: 1 })
+    .lean();
+
+  const buffer = encodeCatalog(entries, builtAt);
+  const temporary = `${SNAPSHOT_PATH}.${process.pid}.tmp`;
+  await writeFile(temporary, buffer);
+  await rename(temporary, SNAPSHOT_PATH);
+
+  stats.writes++;
+  stats.lastWriteMs = Date.now() - started;
+  return { count: entries.length, bytes: buffer.length, durationMs: stats.lastWriteMs };
+};
+
+// True when the snapshot is missing or older than the newest catalogue
+// change, or the entry counts differ (a deletion leaves updatedAt alone)
+export const isSnapshotStale = async () => {
+  if (!catalog) {
+    await loadCatalogSnapshot().catch(() => null);
+    if (!catalog) return true;
+  }
+
+  const [newest, count] = await Promise.all([
+    PlantCatalog.findOne().sort({ updatedAt: -1 }).select('updatedAt').lean(),
+    PlantCatalog.estimatedDocumentCount()
+  ]);
+  return count !== catalog.entries.length
+    || Boolean(newest && newest.updatedAt.getTime() > catalog.builtAt);
+};
+
+// Reload whenever another process (the leader) replaces the snapshot
+export const watchCatalogSnapshot = () => {
+  const timer = setInterval(() => {
+    loadCatalogSnapshot()
+      .then(count => count !== null && console.log(`🌱 Catalogue snapshot reloaded: ${count} plants`))
+      .catch(error => console.error('❌ Catalogue snapshot reload failed:', error.message));
+  }, CHECK_INTERVAL_MS);
+  timer.unref();
+  return timer;
+};
+
+// Keyset page over (name, _id), filtered in memory. Same contract as the
+// Mongo-backed listCatalogPlants: returns { items, nextCursor }, or null
+// for a malformed cursor.
+export const listMirroredPlants = ({ type, difficulty, season, cursor, limit }) => {
+  let start = 0;
+  if (cursor) {
+    const position = decodeCursor(cursor, 'string');
+    if (!position) return null;
+
+    // First entry after the cursor
+    const after = { name: position.value, _id: String(position.id) };
+    let low = 0;
+    let high = catalog.entries.length;
+    while (low < high) {
+      const mid = (low + high) >>> 1;
+      if (compareEntries(catalog.entries[mid], after) <= 0) low = mid + 1;
+      else high = mid;
+    }
+    start = low;
+  }
+
+  const items = [];
+  let hasMore = false;
+  for (let i = start; i < catalog.entries.length; i++) {
+    const entry = catalog.entries[i];
+    if (type && entry.type !== type) continue;
+    if (difficulty && entry.difficulty !== difficulty) continue;
+    if (season && !entry.seasons.includes(season)) continue;
+
+    if (items.length === limit) {
+      hasMore = true;
+      break;
+    }
+    items.push(entry);
+  }
+
+  return {
+    items,
+    nextCursor: hasMore ? encodeCursor(items[items.length - 1], 'name') : null
+  };
+};
+
+export const getMirroredPlant = (id) => catalog.byId.get(String(id)) || null;
+
+export const getMirroredPlants = (ids) => ids.map(id => catalog.byId.get(String(id))).filter(Boolean);
+
+export const getCatalogMirrorStats = () => {
+  return {
+    ...stats,
+    loaded: catalog !== null,
+    entries: catalog ? catalog.entries.length : 0,
+    builtAt: catalog ? new Date(catalog.builtAt).toISOString() : null
+  };
+};
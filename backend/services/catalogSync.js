@@ -0,0 +1,165 @@
+import crypto from 'crypto';
+import PlantCatalog from '../models/PlantCatalog.js';
+import SyncState from '../models/SyncState.js';
+import { callProvider, isConfigured } from './apiGateway.js';
+import { writeCatalogSnapshot, loadCatalogSnapshot } from './catalogMirror.js';
+
+// Mirrors the Perenual species list into PlantCatalog, a few pages per run.
+// Perenual allows 100 calls a day, so a run stops after
+// CATALOG_SYNC_PAGES_PER_RUN pages or as soon as the gateway reports the
+// quota used up. Progress is stored in SyncState after every page, so the
+// next run resumes where this one stopped. Once a full pass completes, the
+// next pass starts after CATALOG_RESYNC_MS (contracts.md: 24 hours).
+const JOB_ID = 'perenual-species';
+const PAGES_PER_RUN = parseInt(process.env.CATALOG_SYNC_PAGES_PER_RUN, 10) || 10;
+const PAGE_DELAY_MS = parseInt(process.env.CATALOG_SYNC_PAGE_DELAY_MS, 10) || 1000;
+const RESYNC_MS = parseInt(process.env.CATALOG_RESYNC_MS, 10) || 24 * 60 * 60 * 1000;
+
+// The gateway refuses these without calling Perenual; try again next run
+const STOP_CODES = ['QUOTA_EXHAUSTED', 'CIRCUIT_OPEN', 'QUOTA_UNAVAILABLE', 'NOT_CONFIGURED'];
+
+let running = null;
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+const firstOf = (value) => (Array.isArray(value) ? value.filter(Boolean).join(', ') : value) || undefined;
+
+// Perenual species-list item -> PlantCatalog fields. The list has no crop
+// type or season, so synced entries are 'Other' until someone curates them.
+export const toCatalogEntry = (species) => {
+  const entry = {
+    externalId: species.id,
+    name: String(species.common_name || '').trim(),
+    scientificName: firstOf(species.scientific_name),
+    otherNames: (species.other_name || []).filter(Boolean),
+    cycle: species.cycle || undefined,
+    water: species.watering || undefined,
+    sunNeeds: firstOf(species.sunlight),
+    source: 'perenual'
+  };
+  const image = species.default_image?.thumbnail;
+  if (image) entry.image = image;
+  return entry;
+};
+
+const hashEntry = (entry) => crypto.createHash('sha1').update(JSON.stringify(entry)).digest('hex');
+
+// Upsert one page of species, skipping entries whose content is unchanged.
+// Names that clash with an existing entry (e.g. a bundled one) are skipped.
+const applyPage = async (species) => {
+  const entries = species
+    .filter(item => item.id && item.common_name)
+    .map(toCatalogEntry)
+    .map(entry => ({ ...entry, syncHash: hashEntry(entry) }));
+
+  const existing = await PlantCatalog.find({ externalId: { $in: entries.map(entry => entry.externalId) } })
+    .select('externalId syncHash')
+    .lean();
+  const hashes = new Map(existing.map(doc => [doc.externalId, doc.syncHash]));
+  const changed = entries.filter(entry => hashes.get(entry.externalId) !== entry.syncHash);
+  if (changed.length === 0) return { written: 0, conflicts: 0 };
+
+  try {
+    const result = await PlantCatalog.bulkWrite(
+      changed.map(({ externalId, ...fields }) => ({
+        updateOne: {
+          filter: { externalId },
+          update: { $set: fields, $setOnInsert: { type: 'Other' } },
+          upsert: true
+        }
+      })),
+      { ordered: false }
+    );
+    return { written: result.upsertedCount + result.modifiedCount, conflicts: 0 };
+  } catch (error) {
+    if (!error.writeErrors || error.writeErrors.some(writeError => writeError.code !== 11000)) throw error;
+    const result = error.result;
+    return {
+      written: (result?.upsertedCount || 0) + (result?.modifiedCount || 0),
+      conflicts: error.writeErrors.length
+    };
+  }
+};
+
+const runSync = async ({ maxPages, now }) => {
+  const started = Date.now();
+  const summary = { pages: 0, written: 0, conflicts: 0, completed: false, stoppedBy: null, snapshot: null };
+
+  let state = await SyncState.findById(JOB_ID).lean();
+  if (state?.completedAt && now - state.completedAt < RESYNC_MS) {
+    return { ...summary, stoppedBy: 'up to date', durationMs: Date.now() - started };
+  }
+  if (!state || state.completedAt) {
+    // Start a new pass
+    state = await SyncState.findByIdAndUpdate(
+      JOB_ID,
+      { $set: { nextPage: 1, passStartedAt: now }, $unset: { completedAt: 1, lastPage: 1 } },
+      { upsert: true, new: true }
+    ).lean();
+  }
+
+  let page = state.nextPage;
+  while (summary.pages < maxPages) {
+    if (summary.pages > 0) await sleep(PAGE_DELAY_MS);
+
+    let body;
+    try {
+      const response = await callProvider('perenual', { method: 'get', url: '/species-list', params: { page } });
+      body = response.data;
+    } catch (error) {
+      summary.stoppedBy = STOP_CODES.includes(error.code) ? error.code : 'error';
+      await SyncState.updateOne({ _id: JOB_ID }, { $set: { lastRunAt: now, lastError: error.message } });
+      if (summary.stoppedBy === 'error') console.error('❌ Catalogue sync page failed:', error.message);
+      break;
+    }
+
+    const { written, conflicts } = await applyPage(body.data || []);
+    summary.pages++;
+    summary.written += written;
+    summary.conflicts += conflicts;
+
+    const lastPage = body.last_page || page;
+    const completed = page >= lastPage;
+    await SyncState.updateOne(
+      { _id: JOB_ID },
+      {
+        $set: {
+          nextPage: completed ? 1 : page + 1,
+          lastPage,
+          lastRunAt: now,
+          ...(completed && { completedAt: new Date() })
+        },
+        $unset: { lastError: 1 }
+      }
+    );
+
+    if (completed) {
+      summary.completed = true;
+      break;
+    }
+    page++;
+  }
+
+  // Publish changes to every worker through the snapshot
+  if (summary.written > 0) {
+    summary.snapshot = await writeCatalogSnapshot();
+    await loadCatalogSnapshot();
+  }
+
+  return { ...summary, durationMs: Date.now() - started };
+};
+
+// One run at a time per process; the leader is the only process that runs it
+export const syncCatalog = ({ maxPages = PAGES_PER_RUN, now = new Date() } = {}) => {
+  if (!isConfigured('perenual')) {
+    return Promise.resolve({ pages: 0, written: 0, conflicts: 0, completed: false, stoppedBy: 'NOT_CONFIGURED' });
+  }
+  if (running) return running;
+
+  running = runSync({ maxPages, now }).finally(() => {
+    running = null;
+  });
+  return running;
+};
+
+export const getCatalogSyncState = () => SyncState.findById(JOB_ID).lean();
@@ -0,0 +1,239 @@
+import mongoose from 'mongoose';
+import Post from '../models/Post.js';
+import PostLike from '../models/PostLike.js';
+import Reply from '../models/Reply.js';
+import { engagementPipeline } from '../utils/ranking.js';
+import { decodeCursor, keysetFilter, buildPage } from '../utils/helpers.js';
+
+// Views are counted in memory and written as one $inc per post every few
+// seconds, so a post going viral costs one write per interval instead of one
+// per page view. Counts buffered when the process dies are lost - views are
+// an estimate, not a ledger.
+const VIEW_FLUSH_INTERVAL_MS = parseInt(process.env.VIEW_FLUSH_INTERVAL_MS, 10) || 5000;
+
+// Feed orders and the Post field each one is served from. Every order has a
+// matching (sortField, _id) index, with and without a leading category.
+export const FEED_SORTS = {
+  recent: { field: 'createdAt', type: 'date' },
+  hot: { field: 'hotScore', type: 'number' },
+  top: { field: 'score', type: 'number' }
+};
+
+// Fields returned for each post in a feed; full content only on the detail view
+export const FEED_FIELDS = 'author title excerpt category tags images likeCount replyCount views score hotScore isPinned isResolved lastActivityAt createdAt';
+export const AUTHOR_FIELDS = 'fullName avatar level';
+
+export class FeedError extends Error {
+  constructor(message, statusCode = 400) {
+    super(message);
+    this.statusCode = statusCode;
+  }
+}
+
+const pendingViews = new Map();
+let flushing = null;
+
+const stats = {
+  viewsRecorded: 0,
+  viewsFlushed: 0,
+  flushes: 0,
+  flushErrors: 0
+};
+
+// Query builders, also explained by the query plan audit (utils/queryPlanAudit.js).
+// `position` is an already decoded cursor.
+export const feedQuery = ({ sort = 'recent', category, author, position, limit }) => {
+  const { field } = FEED_SORTS[sort];
+  const query = { isActive: true };
+  if (category) query.category = category;
+  if (author) query.author = author;
+  if (position) Object.assign(query, keysetFilter(position, field, -1));
+
+  return Post.find(query)
+    .sort({ [field]: -1, _id: -1 })
+    .limit(limit + 1);
+};
+
+export const likedPostsQuery = (userId, postIds) => {
+  return PostLike.find({ user: userId, post: { $in: postIds } });
+};
+
+export const repliesQuery = (postId, position, limit) => {
+  return Reply.find({ post: postId, ...(position && keysetFilter(position, 'createdAt', 1)) })
+    .sort({ createdAt: 1, _id: 1 })
+    .limit(limit + 1);
+};
+
+// One page of active posts in the given order, optionally for one category
+// or author. Returns { items, nextCursor } like the plant and task lists.
+export const getFeed = async ({ sort = 'recent', category, author, cursor, limit }) => {
+  const order = FEED_SORTS[sort];
+  if (!order) {
+    throw new FeedError(`sort must be one of: ${Object.keys(FEED_SORTS).join(', ')}`);
+  }
+
+  const position = cursor ? decodeCursor(cursor, order.type) : null;
+  if (cursor && !position) {
+    throw new FeedError('Invalid cursor');
+  }
+
+  const docs = await feedQuery({ sort, category, author, position, limit })
+    .select(FEED_FIELDS)
+    .populate('author', AUTHOR_FIELDS)
+    .lean();
+
+  return buildPage(docs, limit, order.field);
+};
+
+// Mark which of `posts` the user has liked with one indexed $in lookup,
+// and fold in views that are still waiting to be flushed
+export const decoratePosts = async (posts, userId) => {
+  let liked = new Set();
+
+  if (userId && posts.length > 0) {
+    const likes = await likedPostsQuery(userId, posts.map(post => post._id))
+      .select('post')
+      .lean();
+    liked = new Set(likes.map(like => String(like.post)));
+  }
+
+  return posts.map(post => ({
+    ...post,
+    views: (post.views || 0) + (pendingViews.get(String(post._id)) || 0),
+    likedByMe: liked.has(String(post._id))
+  }));
+};
+
+// Apply counter deltas to an active post and re-rank it in the same write
+const bumpEngagement = (postId, deltas) => {
+  return Post.updateOne(
+    { _id: postId, isActive: true },
+    engagementPipeline(deltas, { lastActivityAt: new Date() }),
+    { timestamps: false }
+  );
+};
+
+// Idempotent: liking twice leaves one PostLike and counts once
+export const likePost = async (postId, userId) => {
+  const exists = await Post.exists({ _id: postId, isActive: true });
+  if (!exists) {
+    throw new FeedError('Post not found', 404);
+  }
+
+  try {
+    await PostLike.create({ post: postId, user: userId });
+  } catch (error) {
+    if (error.code === 11000) return { liked: true, changed: false };
+    throw error;
+  }
+
+  await bumpEngagement(postId, { likes: 1 });
+  return { liked: true, changed: true };
+};
+
+export const unlikePost = async (postId, userId) => {
+  const { deletedCount } = await PostLike.deleteOne({ post: postId, user: userId });
+  if (deletedCount === 0) return { liked: false, changed: false };
+
+  await bumpEngagement(postId, { likes: -1 });
+  return { liked: false, changed: true };
+};
+
+export const addReply = async (postId, userId, content) => {
+  const exists = await Post.exists({ _id: postId, isActive: true });
+  if (!exists) {
+    throw new FeedError('Post not found', 404);
+  }
+
+  const reply = await Reply.create({ post: postId, author: userId, content });
+  await bumpEngagement(postId, { replies: 1 });
+  return reply;
+};
+
+// Authors may delete their own replies
+export const deleteReply = async (postId, replyId, userId) => {
+  const reply = await Reply.findOneAndDelete({ _id: replyId, post: postId, author: userId });
+  if (!reply) {
+    throw new FeedError('Reply not found', 404);
+  }
+
+  await bumpEngagement(postId, { replies: -1 });
+  return reply;
+};
+
+// Replies oldest first, paged on (createdAt, _id)
+export const getReplies = async (postId, { cursor, limit }) => {
+  const position = cursor ? decodeCursor(cursor) : null;
+  if (cursor && !position) {
+    throw new FeedError('Invalid cursor');
+  }
+
+  const docs = await repliesQuery(postId, position, limit)
+    .populate('author', AUTHOR_FIELDS)
+    .lean();
+
+  return buildPage(docs, limit, 'createdAt');
+};
+
+// Count a view in memory; written to Mongo by flushViews()
+export const recordView = (postId) => {
+  const key = String(postId);
+  pendingViews.set(key, (pendingViews.get(key) || 0) + 1);
+  stats.viewsRecorded++;
+};
+
+// Write all buffered view counts in one unordered bulkWrite
+export const flushViews = async () => {
+  if (flushing) return flushing;
+  if (pendingViews.size === 0) return 0;
+
+  const batch = [...pendingViews.entries()];
+  pendingViews.clear();
+
+  flushing = Post.bulkWrite(
+    batch.map(([id, count]) => ({
+      updateOne: {
+        filter: { _id: new mongoose.Types.ObjectId(id) },
+        update: { $inc: { views: count } },
+        timestamps: false
+      }
+    })),
+    { ordered: false }
+  )
+    .then(() => {
+      const flushed = batch.reduce((sum, [, count]) => sum + count, 0);
+      stats.flushes++;
+      stats.viewsFlushed += flushed;
+      return flushed;
+    })
+    .catch(error => {
+      // Put the counts back so the next flush retries them
+      stats.flushErrors++;
+      batch.forEach(([id, count]) => {
+        pendingViews.set(id, (pendingViews.get(id) || 0) + count);
+      });
+      throw error;
+    })
+    .finally(() => {
+      flushing = null;
+    });
+
+  return flushing;
+};
+
+export const startViewFlusher = () => {
+  const timer = setInterval(() => {
+    flushViews().catch(error => console.error('❌ View flush failed:', error.message));
+  }, VIEW_FLUSH_INTERVAL_MS);
+  timer.unref();
+  return timer;
+};
+
+export const getCommunityFeedStats = () => {
+  return {
+    ...stats,
+    pendingPosts: pendingViews.size,
+    pendingViews: [...pendingViews.values()].reduce((sum, count) => sum + count, 0),
+    flushIntervalMs: VIEW_FLUSH_INTERVAL_MS
+  };
+};
@@ -0,0 +1,147 @@
+import Plant from '../models/Plant.js';
+import Task from '../models/Task.js';
+import { dashboardCache } from '../utils/dashboardCache.js';
+import { plantHealthStages } from '../utils/plantHealth.js';
+
+// How many tasks/harvests the summary lists; the counts cover everything
+const LIST_LIMIT = 10;
+const HARVEST_LIMIT = 5;
+
+const OPEN_STATUSES = ['pending', 'in-progress'];
+const TASK_LIST_FIELDS = { task: 1, plant: 1, plantName: 1, taskType: 1, priority: 1, status: 1, dueDate: 1, time: 1 };
+
+// Day boundaries in server time, like the ?date= filter on GET /api/tasks
+const dayBounds = (now) => {
+  const start = new Date(now);
+  start.setHours(0, 0, 0, 0);
+  const end = new Date(now);
+  end.setHours(23, 59, 59, 999);
+  return { start, end };
+};
+
+const countIf = (condition) => ({ $sum: { $cond: [condition, 1, 0] } });
+
+// One pass over the user's active plants ({ user, isActive } index).
+// Health is computed as of now rather than read from the last health job.
+const plantSummary = (userId, { start, end }, now) => {
+  return Plant.aggregate([
+    { $match: { user: userId, isActive: true } },
+    ...plantHealthStages(now),
+    {
+      $facet: {
+        totals: [
+          {
+            $group: {
+              _id: null,
+              total: { $sum: 1 },
+              avgHealth: { $avg: '$health' },
+              needsWatering: countIf({
+                $and: [
+                  { $ifNull: ['$careSchedule.watering.nextWatering', false] },
+                  { $lte: ['$careSchedule.watering.nextWatering', end] }
+                ]
+              }),
+              wateringOverdue: countIf({ $gt: ['$wateringOverdueDays', 0] })
+            }
+          }
+        ],
+        byStatus: [
+          { $group: { _id: '$status', count: { $sum: 1 } } }
+        ],
+        upcomingHarvests: [
+          { $match: { expectedHarvestDate: { $gte: start }, status: { $nin: ['harvested', 'dead'] } } },
+          { $sort: { expectedHarvestDate: 1 } },
+          { $limit: HARVEST_LIMIT },
+          { $project: { name: 1, type: 1, image: 1, expectedHarvestDate: 1 } }
+        ]
+      }
+    }
+  ]);
+};
+
+// Also explained by the query plan audit (utils/queryPlanAudit.js)
+export const openTasksFilter = (userId) => ({ user: userId, status: { $in: OPEN_STATUSES } });
+
+// One pass over the user's open tasks ({ user, status } index)
+const taskSummary = (userId, { start, end }) => {
+  return Task.aggregate([
+    { $match: openTasksFilter(userId) },
+    {
+      $facet: {
+        counts: [
+          {
+            $group: {
+              _id: null,
+              open: { $sum: 1 },
+              pending: countIf({ $eq: ['$status', 'pending'] }),
+              inProgress: countIf({ $eq: ['$status', 'in-progress'] }),
+              today: countIf({ $and: [{ $gte: ['$dueDate', start] }, { $lte: ['$dueDate', end] }] }),
+              overdue: countIf({ $lt: ['$dueDate', start] })
+            }
+          }
+        ],
+        today: [
+          { $match: { dueDate: { $gte: start, $lte: end } } },
+          { $sort: { dueDate: 1, _id: 1 } },
+          { $limit: LIST_LIMIT },
+          { $project: TASK_LIST_FIELDS }
+        ],
+        overdue: [
+          { $match: { dueDate: { $lt: start } } },
+          { $sort: { dueDate: 1, _id: 1 } },
+          { $limit: LIST_LIMIT },
+          { $project: TASK_LIST_FIELDS }
+        ]
+      }
+    }
+  ]);
+};
+
+const daysBetween = (from, to) => Math.ceil((new Date(to) - from) / (24 * 60 * 60 * 1000));
+
+export const buildDashboardSummary = async (userId, now = new Date()) => {
+  const bounds = dayBounds(now);
+  const [[plants], [tasks]] = await Promise.all([
+    plantSummary(userId, bounds, now),
+    taskSummary(userId, bounds)
+  ]);
+
+  const plantTotals = plants.totals[0] || { total: 0, avgHealth: null, needsWatering: 0, wateringOverdue: 0 };
+  const taskCounts = tasks.counts[0] || { open: 0, pending: 0, inProgress: 0, today: 0, overdue: 0 };
+  const nextHarvest = plants.upcomingHarvests[0];
+
+  return {
+    plants: {
+      total: plantTotals.total,
+      byStatus: Object.fromEntries(plants.byStatus.map(({ _id, count }) => [_id, count])),
+      avgHealth: plantTotals.avgHealth === null ? 0 : Math.round(plantTotals.avgHealth),
+      needsWatering: plantTotals.needsWatering,
+      wateringOverdue: plantTotals.wateringOverdue
+    },
+    tasks: {
+      open: taskCounts.open,
+      pending: taskCounts.pending,
+      inProgress: taskCounts.inProgress,
+      today: taskCounts.today,
+      overdue: taskCounts.overdue,
+      todayList: tasks.today,
+      overdueList: tasks.overdue
+    },
+    harvests: {
+      upcoming: plants.upcomingHarvests,
+      daysUntilNext: nextHarvest ? daysBetween(now, nextHarvest.expectedHarvestDate) : null
+    },
+    generatedAt: now.toISOString()
+  };
+};
+
+// Cached per user; the entry is dropped on any plant/task write by the user
+export const getDashboardSummary = async (userId) => {
+  const key = String(userId);
+  const cached = dashboardCache.get(key);
+  if (cached) return { summary: cached, cached: true };
+
+  const summary = await buildDashboardSummary(userId);
+  dashboardCache.set(key, summary);
+  return { summary, cached: false };
+};
@@ -0,0 +1,129 @@
+import { callWithFailover } from './apiGateway.js';
+
+// Plant health assessment: Plant.id first, with a Hugging Face image
+// classifier as the backup (contracts.md) when Plant.id is out of its
+// 100/month quota, failing or slow. Quotas, timeouts and base URLs are
+// configured in services/apiGateway.js.
+const HUGGING_FACE_MODEL = process.env.HUGGING_FACE_MODEL || 'linkanjarad/mobilenet_v2_1.0_224-plant-disease-identification';
+
+const severityFor = (probability) => {
+  if (probability >= 0.85) return 'Severe';
+  if (probability >= 0.6) return 'Moderate';
+  return 'Mild';
+};
+
+const RECOVERY = {
+  Mild: '3-7 days',
+  Moderate: '1-2 weeks',
+  Severe: '2-4 weeks',
+  Critical: '4+ weeks'
+};
+
+// Map a Plant.id health_assessment response onto PlantDiagnosis.diagnosisResult
+export const toDiagnosisResult = (raw, aiModel = 'plant.id') => {
+  const assessment = raw.health_assessment || {};
+  const diseases = [...(assessment.diseases || [])].sort((a, b) => b.probability - a.probability);
+  const top = diseases[0];
+
+  if (assessment.is_healthy || !top) {
+    return {
+      confidence: Math.round((assessment.is_healthy_probability ?? 1) * 100),
+      issue: 'Healthy',
+      severity: 'Mild',
+      causes: [],
+      treatment: ['No treatment needed - keep up the current care routine'],
+      recovery: 'N/A',
+      aiModel,
+      processedAt: new Date()
+    };
+  }
+
+  const severity = severityFor(top.probability);
+  const treatment = top.disease_details?.treatment || {};
+
+  return {
+    confidence: Math.round(top.probability * 100),
+    issue: top.name,
+    severity,
+    causes: diseases.slice(0, 5).map(disease => ({
+      cause: disease.name,
+      probability: Math.round(disease.probability * 100)
+    })),
+    treatment: [
+      ...(treatment.biological || []),
+      ...(treatment.chemical || []),
+      ...(treatment.prevention || [])
+    ],
+    recovery: RECOVERY[severity],
+    aiModel,
+    processedAt: new Date()
+  };
+};
+
+// Map an image-classification response ([{ label, score }], PlantVillage
+// style labels such as 'Tomato___Late_blight') onto diagnosisResult. The
+// classifier gives no treatment advice, only the likely issue.
+export const fromImageClassification = (predictions, aiModel) => {
+  const readable = (label) => label.replace(/_+/g, ' ').replace(/\s+/g, ' ').trim();
+  const sorted = [...(Array.isArray(predictions) ? predictions : [])].sort((a, b) => b.score - a.score);
+  const top = sorted[0];
+
+  if (!top || /healthy/i.test(top.label)) {
+    return {
+      confidence: Math.round((top?.score ?? 0) * 100),
+      issue: 'Healthy',
+      severity: 'Mild',
+      causes: [],
+      treatment: ['No treatment needed - keep up the current care routine'],
+      recovery: 'N/A',
+      aiModel,
+      processedAt: new Date()
+    };
+  }
+
+  const severity = severityFor(top.score);
+  return {
+    confidence: Math.round(top.score * 100),
+    issue: readable(top.label),
+    severity,
+    causes: sorted.slice(0, 5).map(prediction => ({
+      cause: readable(prediction.label),
+      probability: Math.round(prediction.score * 100)
+    })),
+    treatment: [],
+    recovery: RECOVERY[severity],
+    aiModel,
+    processedAt: new Date()
+  };
+};
+
+// Send one base64 image for health assessment
+export const assessPlantHealth = async (imageBase64) => {
+  const { data } = await callWithFailover([
+    {
+      provider: 'plantid',
+      request: {
+        method: 'post',
+        url: '/health_assessment',
+        data: {
+          images: [imageBase64],
+          modifiers: ['similar_images'],
+          disease_details: ['description', 'treatment']
+        }
+      },
+      transform: raw => toDiagnosisResult(raw)
+    },
+    {
+      provider: 'huggingface',
+      request: {
+        method: 'post',
+        url: `/${HUGGING_FACE_MODEL}`,
+        data: Buffer.from(imageBase64, 'base64'),
+        headers: { 'Content-Type': 'application/octet-stream' }
+      },
+      transform: raw => fromImageClassification(raw, `huggingface:${HUGGING_FACE_MODEL}`)
+    }
+  ]);
+
+  return data;
+};
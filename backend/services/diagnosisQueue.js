@@ -0,0 +1,261 @@
+import crypto from 'crypto';
+import { EventEmitter } from 'events';
+import os from 'os';
+import PlantDiagnosis from '../models/PlantDiagnosis.js';
+import { assessPlantHealth } from './diagnosisProvider.js';
+import { isBlobId, readBlob } from './blobStore.js';
+import { hammingDistance, NEAR_DUPLICATE_DISTANCE } from '../utils/imageHash.js';
+import { percentile } from '../utils/helpers.js';
+
+// Provider calls take 3-10s, so they never run inside a request handler.
+// Jobs wait in a bounded in-process queue and a fixed number of them call
+// the provider at once.
+const CONCURRENCY = parseInt(process.env.DIAGNOSIS_CONCURRENCY, 10) || 2;
+const MAX_QUEUE = parseInt(process.env.DIAGNOSIS_QUEUE_MAX, 10) || 100;
+
+// contracts.md: diagnosis results are reusable for 7 days
+const RESULT_CACHE_MS = 7 * 24 * 60 * 60 * 1000;
+
+// A 'processing' job belongs to the process holding its lease. The lease
+// is renewed every LEASE_MS / 3 while the job is queued or running; once
+// it is older than LEASE_MS (the owner crashed or was restarted) any
+// process may claim the job. The owner id is unique per process start, so
+// a restarted worker does not mistake its predecessor's jobs for its own.
+const LEASE_MS = parseInt(process.env.DIAGNOSIS_LEASE_MS, 10) || 60 * 1000;
+const OWNER = `${os.hostname()}:${process.pid}:${crypto.randomBytes(4).toString('hex')}`;
+
+// Recent latencies kept for percentile metrics
+const LATENCY_SAMPLES = 500;
+
+export class QueueFullError extends Error {
+  constructor() {
+    super('Diagnosis queue is full, please retry shortly');
+    this.statusCode = 503;
+  }
+}
+
+const queue = [];
+// Ids of jobs this process holds the lease on (queued or running)
+const held = new Set();
+const inflightByHash = new Map();
+const events = new EventEmitter();
+events.setMaxListeners(0);
+let active = 0;
+
+const metrics = {
+  enqueued: 0,
+  completed: 0,
+  failed: 0,
+  rejected: 0,
+  recovered: 0,
+  exactCacheHits: 0,
+  nearCacheHits: 0,
+  coalesced: 0,
+  providerCalls: 0,
+  waitMs: [],
+  processMs: []
+};
+
+const sample = (list, value) => {
+  list.push(value);
+  if (list.length > LATENCY_SAMPLES) list.shift();
+};
+
+// Reuse an earlier result for the same or a visually near-identical image
+export const findCachedResult = async ({ imageHash, perceptualHash, hashBands }) => {
+  const fresh = {
+    status: 'completed',
+    cacheHit: false,
+    'diagnosisResult.processedAt': { $gte: new Date(Date.now() - RESULT_CACHE_MS) }
+  };
+
+  const exact = await PlantDiagnosis.findOne({ imageHash, ...fresh })
+    .select('diagnosisResult')
+    .lean();
+  if (exact) {
+    metrics.exactCacheHits++;
+    return exact.diagnosisResult;
+  }
+
+  if (!perceptualHash) return null;
+
+  const candidates = await PlantDiagnosis.find({ hashBands: { $in: hashBands }, ...fresh })
+    .select('perceptualHash diagnosisResult')
+    .sort({ createdAt: -1 })
+    .limit(50)
+    .lean();
+
+  let best = null;
+  candidates.forEach(candidate => {
+    const distance = hammingDistance(perceptualHash, candidate.perceptualHash);
+    if (distance <= NEAR_DUPLICATE_DISTANCE && (!best || distance < best.distance)) {
+      best = { distance, result: candidate.diagnosisResult };
+    }
+  });
+
+  if (best) {
+    metrics.nearCacheHits++;
+    return best.result;
+  }
+  return null;
+};
+
+// Jobs carry a blob id; diagnoses created before the blob store hold base64
+const loadImage = async (image) => {
+  if (!isBlobId(image)) return image;
+  const buffer = await readBlob(image);
+  return buffer.toString('base64');
+};
+
+// Identical images queued at the same time share one provider call
+const diagnoseOnce = (job) => {
+  if (inflightByHash.has(job.imageHash)) {
+    metrics.coalesced++;
+    return inflightByHash.get(job.imageHash);
+  }
+
+  metrics.providerCalls++;
+  const call = loadImage(job.image)
+    .then(assessPlantHealth)
+    .finally(() => inflightByHash.delete(job.imageHash));
+
+  inflightByHash.set(job.imageHash, call);
+  return call;
+};
+
+const runJob = async (job) => {
+  const startedAt = Date.now();
+  sample(metrics.waitMs, startedAt - job.enqueuedAt);
+
+  try {
+    const diagnosisResult = await diagnoseOnce(job);
+    await PlantDiagnosis.updateOne(
+      { _id: job.id },
+      { $set: { status: 'completed', diagnosisResult } }
+    );
+    metrics.completed++;
+  } catch (error) {
+    await PlantDiagnosis.updateOne(
+      { _id: job.id },
+      { $set: { status: 'failed', error: error.message } }
+    ).catch(() => {});
+    metrics.failed++;
+  } finally {
+    held.delete(job.id);
+    sample(metrics.processMs, Date.now() - startedAt);
+    events.emit(String(job.id));
+  }
+};
+
+const drain = () => {
+  while (active < CONCURRENCY && queue.length > 0) {
+    const job = queue.shift();
+    active++;
+    runJob(job).finally(() => {
+      active--;
+      drain();
+    });
+  }
+};
+
+// Lease fields for a diagnosis this process is about to create and queue
+export const diagnosisLease = () => ({ claimedBy: OWNER, claimedAt: new Date() });
+
+// Queue a saved 'processing' diagnosis (`image` is its blob id) whose lease
+// this process holds; throws QueueFullError when at capacity
+export const enqueueDiagnosis = ({ id, image, imageHash }) => {
+  if (queue.length >= MAX_QUEUE) {
+    metrics.rejected++;
+    throw new QueueFullError();
+  }
+
+  metrics.enqueued++;
+  held.add(String(id));
+  queue.push({ id: String(id), image, imageHash, enqueuedAt: Date.now() });
+  drain();
+};
+
+// Resolve when the job finishes or after `timeoutMs`, whichever comes first
+export const waitForDiagnosis = (id, timeoutMs) => {
+  return new Promise(resolve => {
+    const key = String(id);
+    const done = () => {
+      clearTimeout(timer);
+      events.off(key, done);
+      resolve();
+    };
+    const timer = setTimeout(done, timeoutMs);
+    events.once(key, done);
+  });
+};
+
+// Keep this process's leases fresh while its jobs wait or run
+const renewLeases = async () => {
+  if (held.size === 0) return;
+  await PlantDiagnosis.updateMany(
+    { _id: { $in: [...held] }, status: 'processing', claimedBy: OWNER },
+    { $set: { claimedAt: new Date() } }
+  );
+};
+
+// Claim and queue 'processing' jobs whose lease has expired, oldest first,
+// while there is room in the queue. Each claim is a single atomic update,
+// so two processes never pick up the same job. Jobs created before leases
+// existed count as expired once they are LEASE_MS old.
+export const recoverExpiredDiagnoses = async () => {
+  let recovered = 0;
+  while (queue.length < MAX_QUEUE) {
+    const cutoff = new Date(Date.now() - LEASE_MS);
+    const job = await PlantDiagnosis.findOneAndUpdate(
+      {
+        status: 'processing',
+        $or: [
+          { claimedAt: { $lt: cutoff } },
+          { claimedAt: { $exists: false }, createdAt: { $lt: cutoff } }
+        ]
+      },
+      { $set: { claimedBy: OWNER, claimedAt: new Date() } },
+      { sort: { createdAt: 1 }, new: true }
+    )
+      .select('image imageHash')
+      .lean();
+    if (!job) break;
+
+    enqueueDiagnosis({ id: job._id, image: job.image, imageHash: job.imageHash });
+    metrics.recovered++;
+    recovered++;
+  }
+  return recovered;
+};
+
+// Every process renews its own leases and sweeps for expired ones, so jobs
+// stranded by any crashed worker are resumed within about LEASE_MS
+export const startDiagnosisLeases = () => {
+  const renewTimer = setInterval(() => {
+    renewLeases().catch(error => console.error('❌ Renewing diagnosis leases failed:', error.message));
+  }, LEASE_MS / 3);
+  renewTimer.unref();
+
+  const recover = () => {
+    recoverExpiredDiagnoses()
+      .then(count => count && console.log(`🔬 Resumed ${count} stranded diagnoses`))
+      .catch(error => console.error('❌ Resuming diagnoses failed:', error.message));
+  };
+  recover();
+  const recoverTimer = setInterval(recover, LEASE_MS / 2);
+  recoverTimer.unref();
+};
+
+export const getDiagnosisQueueStats = () => {
+  const { waitMs, processMs, ...counters } = metrics;
+  return {
+    ...counters,
+    queueDepth: queue.length,
+    active,
+    leasesHeld: held.size,
+    concurrency: CONCURRENCY,
+    maxQueue: MAX_QUEUE,
+    waitMs: { p50: percentile(waitMs, 50), p95: percentile(waitMs, 95) },
+    processMs: { p50: percentile(processMs, 50), p95: percentile(processMs, 95) }
+  };
+};
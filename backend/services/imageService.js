@@ -0,0 +1,113 @@
+import sharp from 'sharp';
+import ImageAsset from '../models/ImageAsset.js';
+import LRUCache from '../utils/lruCache.js';
+import { writeBlob, blobPath, deleteBlob, isBlobId } from './blobStore.js';
+import { differenceHash } from '../utils/imageHash.js';
+
+export const MAX_IMAGE_BYTES = parseInt(process.env.IMAGE_MAX_BYTES, 10) || 5 * 1024 * 1024;
+export const IMAGE_CONTENT_TYPES = ['image/jpeg', 'image/png', 'image/webp'];
+
+// Longest edge in pixels for each generated variant
+export const IMAGE_VARIANTS = {
+  thumb: 320,
+  medium: 1024
+};
+
+export class ImageError extends Error {
+  constructor(message, statusCode = 400) {
+    super(message);
+    this.statusCode = statusCode;
+  }
+}
+
+// Assets never change once written, so lookups for serving can be cached freely
+const assetCache = new LRUCache({
+  max: parseInt(process.env.IMAGE_CACHE_MAX, 10) || 5000,
+  ttl: 60 * 60 * 1000
+});
+
+const FORMAT_TYPES = { jpeg: 'image/jpeg', png: 'image/png', webp: 'image/webp' };
+
+const renderVariant = async (sourcePath, edge) => {
+  // sharp reads from the file and hands back only the (small) resized output
+  const resized = await sharp(sourcePath)
+    .rotate()
+    .resize(edge, edge, { fit: 'inside', withoutEnlargement: true })
+    .webp({ quality: 80 })
+    .toBuffer();
+  const { id } = await writeBlob(resized);
+  return id;
+};
+
+// Store an uploaded image (Buffer or stream) and generate its variants once.
+// Re-uploading the same bytes returns the existing asset.
+export const storeImage = async (source, { uploadedBy, maxBytes = MAX_IMAGE_BYTES } = {}) => {
+  const { id, size } = await writeBlob(source, { maxBytes });
+
+  const existing = await ImageAsset.findById(id).lean();
+  if (existing) return existing;
+
+  const sourcePath = blobPath(id);
+  let metadata;
+  try {
+    metadata = await sharp(sourcePath).metadata();
+  } catch (error) {
+    metadata = null;
+  }
+
+  const contentType = metadata && FORMAT_TYPES[metadata.format];
+  if (!contentType) {
+    await deleteBlob(id);
+    throw new ImageError('Unsupported or corrupt image, use JPEG, PNG or WebP');
+  }
+
+  const variants = {};
+  for (const [name, edge] of Object.entries(IMAGE_VARIANTS)) {
+    variants[name] = await renderVariant(sourcePath, edge);
+  }
+
+  // Concurrent uploads of the same image race here; the first insert wins
+  await ImageAsset.updateOne(
+    { _id: id },
+    {
+      $setOnInsert: {
+        contentType,
+        size,
+        width: metadata.width,
+        height: metadata.height,
+        variants,
+        perceptualHash: await differenceHash(sourcePath),
+        uploadedBy
+      }
+    },
+    { upsert: true }
+  );
+
+  return ImageAsset.findById(id).lean();
+};
+
+export const getImageAsset = async (id) => {
+  if (!isBlobId(id)) return null;
+
+  const cached = assetCache.get(id);
+  if (cached) return cached;
+
+  const asset = await ImageAsset.findById(id).lean();
+  if (asset) assetCache.set(id, asset);
+  return asset;
+};
+
+// Public URLs for an image id, as returned to clients
+export const imageUrls = (id) => ({
+  url: `/api/images/${id}`,
+  thumbnailUrl: `/api/images/${id}?size=thumb`
+});
+
+export const toImageResponse = (asset) => ({
+  id: asset._id,
+  contentType: asset.contentType,
+  size: asset.size,
+  width: asset.width,
+  height: asset.height,
+  ...imageUrls(asset._id)
+});
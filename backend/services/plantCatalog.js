@@ -0,0 +1,95 @@
+import { readFile } from 'fs/promises';
+import PlantCatalog from '../models/PlantCatalog.js';
+import { decodeCursor, keysetFilter, buildPage } from '../utils/helpers.js';
+import { parseSeason } from '../utils/growingSeason.js';
+import {
+  CATALOG_FIELDS,
+  isCatalogLoaded,
+  listMirroredPlants,
+  getMirroredPlant
+} from './catalogMirror.js';
+
+export { CATALOG_FIELDS };
+
+const SEED_FILE = new URL('../data/plantCatalog.json', import.meta.url);
+
+export class CatalogError extends Error {
+  constructor(message, statusCode = 400) {
+    super(message);
+    this.statusCode = statusCode;
+  }
+}
+
+// Insert bundled entries that are not in the collection yet. Existing entries
+// are left alone, so edits made in the database survive a restart; only
+// growing seasons are filled in where an entry has none.
+export const seedPlantCatalog = async () => {
+  const entries = JSON.parse(await readFile(SEED_FILE, 'utf8'));
+  const result = await PlantCatalog.bulkWrite(
+    entries.flatMap(({ seasons, ...entry }) => [
+      {
+        updateOne: {
+          filter: { name: entry.name },
+          update: { $setOnInsert: { ...entry, seasons } },
+          upsert: true
+        }
+      },
+      {
+        updateOne: {
+          filter: { name: entry.name, 'seasons.0': { $exists: false } },
+          update: { $set: { seasons } }
+        }
+      }
+    ]),
+    { ordered: true }
+  );
+  return result.upsertedCount + result.modifiedCount;
+};
+
+// Query builder, also explained by the query plan audit (utils/queryPlanAudit.js).
+// `season` is a parsed growing season and `position` a decoded cursor.
+export const catalogPageQuery = ({ type, difficulty, season, position, limit }) => {
+  const query = {};
+  if (type) query.type = type;
+  if (difficulty) query.difficulty = difficulty;
+  if (season) query.seasons = season;
+  if (position) Object.assign(query, keysetFilter(position, 'name', 1));
+
+  return PlantCatalog.find(query)
+    .sort({ name: 1, _id: 1 })
+    .limit(limit + 1);
+};
+
+// Browse by name, optionally filtered by type, difficulty and growing season
+// ('rabi', 'kharif1', 'kharif2' or 'current'). Served from the in-memory
+// mirror once its snapshot is loaded, from Mongo until then.
+export const listCatalogPlants = async ({ type, difficulty, season, cursor, limit }) => {
+  const growingSeason = season ? parseSeason(season) : null;
+  if (season && !growingSeason) {
+    throw new CatalogError('Invalid season (use rabi, kharif1, kharif2 or current)');
+  }
+
+  if (isCatalogLoaded()) {
+    const page = listMirroredPlants({ type, difficulty, season: growingSeason, cursor, limit });
+    if (!page) {
+      throw new CatalogError('Invalid cursor');
+    }
+    return page;
+  }
+
+  const position = cursor ? decodeCursor(cursor, 'string') : null;
+  if (cursor && !position) {
+    throw new CatalogError('Invalid cursor');
+  }
+
+  const docs = await catalogPageQuery({ type, difficulty, season: growingSeason, position, limit })
+    .select(CATALOG_FIELDS)
+    .lean();
+
+  return buildPage(docs, limit, 'name');
+};
+
+export const getCatalogPlant = async (id) => {
+  if (isCatalogLoaded()) return getMirroredPlant(id);
+  return PlantCatalog.findById(id).select(CATALOG_FIELDS).lean();
+};
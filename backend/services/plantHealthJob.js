@@ -0,0 +1,85 @@
+import Plant from '../models/Plant.js';
+import { computePlantHealth } from '../utils/plantHealth.js';
+
+// Recompute daysGrowing, wateringOverdueDays and health for every active
+// plant. Plants are streamed through a cursor and written back in chunked,
+// unordered bulkWrites, so memory stays flat however many plants there are.
+// Only plants whose values changed are written.
+const INPUT_FIELDS = 'plantedDate status careSchedule.watering.nextWatering daysGrowing wateringOverdueDays health';
+const DERIVED_FIELDS = ['daysGrowing', 'wateringOverdueDays', 'health'];
+
+export const HEALTH_BATCH_SIZE = parseInt(process.env.PLANT_HEALTH_BATCH_SIZE, 10) || 1000;
+
+let running = null;
+
+export const recomputePlantHealth = ({
+  userId = null,
+  batchSize = HEALTH_BATCH_SIZE,
+  now = new Date(),
+  onProgress = null
+} = {}) => {
+  // One pass at a time per process; callers overlapping a run share it
+  if (running) return running;
+
+  running = runRecompute({ userId, batchSize, now, onProgress }).finally(() => {
+    running = null;
+  });
+  return running;
+};
+
+const runRecompute = async ({ userId, batchSize, now, onProgress }) => {
+  const started = Date.now();
+  const query = { isActive: true };
+  if (userId) query.user = userId;
+
+  const stats = { plantsScanned: 0, plantsUpdated: 0, batches: 0, durationMs: 0 };
+  let operations = [];
+
+  const flush = async () => {
+    if (operations.length === 0) return;
+    const result = await Plant.bulkWrite(operations, { ordered: false });
+    stats.plantsUpdated += result.modifiedCount;
+    stats.batches++;
+    operations = [];
+  };
+
+  const report = () => {
+    if (onProgress) onProgress({ ...stats, durationMs: Date.now() - started });
+  };
+
+  const cursor = Plant.find(query)
+    .select(INPUT_FIELDS)
+    .lean()
+    .cursor({ batchSize });
+
+  for await (const plant of cursor) {
+    stats.plantsScanned++;
+
+    const derived = computePlantHealth(plant, now);
+    const changed = DERIVED_FIELDS.some(field => plant[field] !== derived[field]);
+    if (changed) {
+      // Derived values are not edits: leave updatedAt alone, or the task
+      // scheduler would treat every plant as changed
+      operations.push({
+        updateOne: {
+          filter: { _id: plant._id },
+          update: { $set: derived },
+          timestamps: false
+        }
+      });
+    }
+
+    if (operations.length >= batchSize) {
+      await flush();
+    }
+    if (stats.plantsScanned % batchSize === 0) {
+      report();
+    }
+  }
+
+  await flush();
+  report();
+
+  stats.durationMs = Date.now() - started;
+  return stats;
+};
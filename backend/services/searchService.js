@@ -0,0 +1,276 @@
+import Post from '../models/Post.js';
+import Plant from '../models/Plant.js';
+import PlantCatalog from '../models/PlantCatalog.js';
+import LRUCache from '../utils/lruCache.js';
+import SearchIndex from '../utils/searchIndex.js';
+import { FEED_FIELDS, AUTHOR_FIELDS } from './communityFeed.js';
+import { CATALOG_FIELDS, isCatalogLoaded, getMirroredPlants } from './catalogMirror.js';
+
+// Search runs against in-process inverted indexes (utils/searchIndex.js):
+// - posts and the plant catalogue are indexed in full at startup and kept
+//   current by the write paths calling indexPost()/indexPlant() etc. The
+//   catalogue index is rebuilt whenever its snapshot is reloaded.
+// - each user's own plants get a small index, built on first search and
+//   updated on write while it is cached.
+// Writes made by other processes are picked up by a periodic refresh of
+// posts changed since the last one, and by the per-user index TTL.
+const REFRESH_INTERVAL_MS = parseInt(process.env.SEARCH_REFRESH_INTERVAL_MS, 10) || 60 * 1000;
+
+export const MAX_SEARCH_LIMIT = 50;
+export const SEARCH_SCOPES = ['posts', 'plants', 'catalog'];
+
+const POST_INDEX_FIELDS = 'title content tags category isActive createdAt updatedAt';
+const PLANT_INDEX_FIELDS = 'name variety type status createdAt';
+
+const postIndex = new SearchIndex({
+  fields: { title: 3, tags: 2, category: 1, content: 1 },
+  facets: ['category']
+});
+
+const catalogIndex = new SearchIndex({
+  fields: { name: 3, scientificName: 2, type: 1, description: 1 },
+  facets: ['type', 'difficulty']
+});
+
+const plantIndexes = new LRUCache({
+  max: parseInt(process.env.SEARCH_PLANT_INDEX_MAX, 10) || 1000,
+  ttl: parseInt(process.env.SEARCH_PLANT_INDEX_TTL_MS, 10) || 5 * 60 * 1000
+});
+const plantIndexLoads = new Map();
+
+let building = null;
+let postsSyncedAt = null;
+
+const stats = {
+  queries: 0,
+  totalMs: 0,
+  maxMs: 0,
+  builds: 0,
+  lastBuildMs: 0,
+  refreshes: 0
+};
+
+const rankOf = (doc) => (doc.createdAt ? new Date(doc.createdAt).getTime() : 0);
+
+// Write paths pass Mongoose documents, loaders pass lean objects
+const plain = (doc) => (typeof doc.toObject === 'function' ? doc.toObject() : doc);
+
+export const indexPost = (doc) => {
+  const post = plain(doc);
+  if (post.isActive === false) {
+    postIndex.remove(post._id);
+    return;
+  }
+  postIndex.add(post._id, { ...post, rank: rankOf(post) });
+};
+
+export const removePost = (id) => {
+  postIndex.remove(id);
+};
+
+export const indexCatalogPlant = (entry) => {
+  catalogIndex.add(entry._id, { ...entry, rank: 0 });
+};
+
+// Replace the catalogue index with `entries` (the in-memory catalogue)
+export const rebuildCatalogIndex = (entries) => {
+  catalogIndex.clear();
+  entries.forEach(indexCatalogPlant);
+  return catalogIndex.size;
+};
+
+// Only updates the user's index if it is loaded; otherwise the next search
+// builds it fresh from Mongo anyway
+export const indexPlant = (doc) => {
+  const plant = plain(doc);
+  const index = plantIndexes.get(String(plant.user));
+  if (!index) return;
+
+  if (plant.isActive === false) {
+    index.remove(plant._id);
+  } else {
+    index.add(plant._id, { ...plant, rank: rankOf(plant) });
+  }
+};
+
+export const removePlant = (userId, plantId) => {
+  plantIndexes.get(String(userId))?.remove(plantId);
+};
+
+// Stream a collection into an index without holding the result set in memory
+const loadIndex = async (index, cursor, add) => {
+  for await (const doc of cursor) {
+    add(doc);
+  }
+  return index.size;
+};
+
+// Full build of the post and catalogue indexes, once per process. Searches
+// issued meanwhile wait for it.
+export const buildSearchIndexes = () => {
+  if (building) return building;
+
+  const startedAt = Date.now();
+  const syncedAt = new Date();
+  // The catalogue comes from the snapshot when one is loaded (the reload
+  // listener already indexed it)
+  const catalogLoaded = isCatalogLoaded();
+  postIndex.clear();
+  if (!catalogLoaded) catalogIndex.clear();
+
+  building = Promise.all([
+    loadIndex(postIndex, Post.find({ isActive: true }).select(POST_INDEX_FIELDS).lean().cursor(), indexPost),
+    catalogLoaded
+      ? Promise.resolve(catalogIndex.size)
+      : loadIndex(catalogIndex, PlantCatalog.find().select(CATALOG_FIELDS).lean().cursor(), indexCatalogPlant)
+  ])
+    .then(([posts, catalog]) => {
+      postsSyncedAt = syncedAt;
+      stats.builds++;
+      stats.lastBuildMs = Date.now() - startedAt;
+      return { posts, catalog, durationMs: stats.lastBuildMs };
+    })
+    .catch(error => {
+      building = null;
+      throw error;
+    });
+
+  return building;
+};
+
+// Posts edited since `since`; also explained by the query plan audit
+export const changedPostsQuery = (since) => Post.find({ updatedAt: { $gt: since } });
+
+// Apply post edits made since the last sync (including by other processes)
+export const refreshPostIndex = async () => {
+  if (!postsSyncedAt) return 0;
+
+  const since = postsSyncedAt;
+  postsSyncedAt = new Date();
+
+  let changed = 0;
+  const cursor = changedPostsQuery(since).select(POST_INDEX_FIELDS).lean().cursor();
+  for await (const post of cursor) {
+    indexPost(post);
+    changed++;
+  }
+
+  stats.refreshes++;
+  return changed;
+};
+
+export const startSearchRefresher = () => {
+  const timer = setInterval(() => {
+    refreshPostIndex().catch(error => console.error('❌ Search refresh failed:', error.message));
+  }, REFRESH_INTERVAL_MS);
+  timer.unref();
+  return timer;
+};
+
+const getPlantIndex = async (userId) => {
+  const key = String(userId);
+  const cached = plantIndexes.get(key);
+  if (cached) return cached;
+
+  if (!plantIndexLoads.has(key)) {
+    const index = new SearchIndex({
+      fields: { name: 3, variety: 2, type: 1 },
+      facets: ['type', 'status']
+    });
+    const load = loadIndex(index, Plant.find({ user: userId, isActive: true }).select(PLANT_INDEX_FIELDS).lean().cursor(), plant => {
+      index.add(plant._id, { ...plant, rank: rankOf(plant) });
+    })
+      .then(() => {
+        plantIndexes.set(key, index);
+        return index;
+      })
+      .finally(() => plantIndexLoads.delete(key));
+    plantIndexLoads.set(key, load);
+  }
+
+  return plantIndexLoads.get(key);
+};
+
+// Run a query against an index and time it
+const runQuery = (index, q, options) => {
+  const startedAt = process.hrtime.bigint();
+  const result = index.search(q, options);
+  const tookMs = Number(process.hrtime.bigint() - startedAt) / 1e6;
+
+  stats.queries++;
+  stats.totalMs += tookMs;
+  stats.maxMs = Math.max(stats.maxMs, tookMs);
+  return { ...result, tookMs };
+};
+
+// Load the matched documents in one $in query, keeping relevance order.
+// Hits whose document has since disappeared are dropped. `relevance` is the
+// index score (posts already have a `score` field for ranking).
+const hydrate = async (query, hits) => {
+  const docs = await query;
+  const byId = new Map(docs.map(doc => [String(doc._id), doc]));
+  return hits
+    .filter(hit => byId.has(hit.id))
+    .map(hit => ({ ...byId.get(hit.id), relevance: hit.score }));
+};
+
+export const searchPosts = async (q, { category, limit, offset }) => {
+  if (building) await building;
+
+  const { total, results, facets, tookMs } = runQuery(postIndex, q, { filters: { category }, limit, offset });
+  const items = await hydrate(
+    Post.find({ _id: { $in: results.map(hit => hit.id) }, isActive: true })
+      .select(FEED_FIELDS)
+      .populate('author', AUTHOR_FIELDS)
+      .lean(),
+    results
+  );
+
+  return { total, items, facets, tookMs };
+};
+
+export const searchPlants = async (userId, q, { type, status, limit, offset }) => {
+  const index = await getPlantIndex(userId);
+
+  const { total, results, facets, tookMs } = runQuery(index, q, { filters: { type, status }, limit, offset });
+  const items = await hydrate(
+    Plant.find({ _id: { $in: results.map(hit => hit.id) }, user: userId, isActive: true })
+      .select(`${PLANT_INDEX_FIELDS} image health daysGrowing location`)
+      .lean(),
+    results
+  );
+
+  return { total, items, facets, tookMs };
+};
+
+export const searchCatalog = async (q, { type, difficulty, limit, offset }) => {
+  if (building) await building;
+
+  const { total, results, facets, tookMs } = runQuery(catalogIndex, q, { filters: { type, difficulty }, limit, offset });
+  const ids = results.map(hit => hit.id);
+  const items = await hydrate(
+    isCatalogLoaded()
+      ? getMirroredPlants(ids)
+      : PlantCatalog.find({ _id: { $in: ids } }).select(CATALOG_FIELDS).lean(),
+    results
+  );
+
+  return { total, items, facets, tookMs };
+};
+
+export const getSearchStats = () => {
+  return {
+    posts: postIndex.size,
+    catalog: catalogIndex.size,
+    plantIndexes: plantIndexes.size,
+    plantIndexCache: plantIndexes.stats(),
+    postTerms: postIndex.postings.size,
+    queries: stats.queries,
+    avgMs: stats.queries > 0 ? stats.totalMs / stats.queries : 0,
+    maxMs: stats.maxMs,
+    builds: stats.builds,
+    lastBuildMs: stats.lastBuildMs,
+    refreshes: stats.refreshes,
+    postsSyncedAt: postsSyncedAt?.toISOString() || null
+  };
+};
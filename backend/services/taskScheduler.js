@@ -0,0 +1,246 @@
+import mongoose from 'mongoose';
+import Plant from '../models/Plant.js';
+import Task from '../models/Task.js';
+import { invalidateDashboard } from '../utils/dashboardCache.js';
+
+// Days ahead for which tasks are materialized
+export const SCHEDULE_WINDOW_DAYS = parseInt(process.env.TASK_SCHEDULE_WINDOW_DAYS, 10) || 14;
+
+// Plants in these states no longer get care tasks
+export const FINISHED_STATUSES = ['harvested', 'dead'];
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const UNIT_DAYS = { day: 1, week: 7, month: 30 };
+const COUNT_WORDS = { once: 1, twice: 2, thrice: 3 };
+
+// Care schedule sections that produce tasks
+const SCHEDULE_SECTIONS = [
+  { section: 'watering', taskType: 'watering', verb: 'Water', next: 'nextWatering', last: 'lastWatered' },
+  { section: 'fertilizing', taskType: 'fertilizing', verb: 'Fertilize', next: 'nextFertilizing', last: 'lastFertilized' },
+  { section: 'pruning', taskType: 'pruning', verb: 'Prune', last: 'lastPruned' }
+];
+
+// Turn a free-form frequency ("Every 2 days", "Weekly", "twice a week") into
+// an interval in whole days, or null if it can't be understood.
+export const parseFrequency = (frequency) => {
+  if (!frequency) return null;
+  const text = String(frequency).toLowerCase().trim();
+
+  if (/\b(daily|every ?day)\b/.test(text)) return 1;
+  if (/\b(every other day|alternate days?)\b/.test(text)) return 2;
+  if (/\b(bi-?weekly|fortnightly)\b/.test(text)) return 14;
+  if (/\bweekly\b/.test(text)) return 7;
+  if (/\bmonthly\b/.test(text)) return 30;
+
+  // "twice a week", "3 times per week", "2x/week"
+  let match = text.match(/\b(\d+|once|twice|thrice)\s*(?:x|times?)?\s*(?:a|an|per|\/)\s*(day|week|month)\b/);
+  if (match) {
+    const count = COUNT_WORDS[match[1]] || parseInt(match[1], 10);
+    return count > 0 ? Math.max(1, Math.round(UNIT_DAYS[match[2]] / count)) : null;
+  }
+
+  // "every 3 days", "every week", "4 days"
+  match = text.match(/^(?:every\s+)?(\d+)?\s*(day|week|month)s?\b/) || text.match(/\bevery\s+(\d+)?\s*(day|week|month)s?\b/);
+  if (match) {
+    const count = match[1] ? parseInt(match[1], 10) : 1;
+    return count > 0 ? count * UNIT_DAYS[match[2]] : null;
+  }
+
+  return null;
+};
+
+const startOfUTCDay = (date) => {
+  const day = new Date(date);
+  return Date.UTC(day.getUTCFullYear(), day.getUTCMonth(), day.getUTCDate());
+};
+
+// Due dates on the anchor's grid that fall inside [from, until]
+const occurrences = (anchor, intervalDays, from, until) => {
+  const step = intervalDays * DAY_MS;
+  let time = startOfUTCDay(anchor);
+
+  if (time < from) {
+    time += Math.ceil((from - time) / step) * step;
+  }
+
+  const dates = [];
+  for (; time <= until; time += step) {
+    dates.push(new Date(time));
+  }
+  return dates;
+};
+
+// Stable id for a generated task, so re-running the generator is a no-op
+const scheduleKey = (plantId, taskType, dueDate) => {
+  return `${plantId}:${taskType}:${dueDate.toISOString().slice(0, 10)}`;
+};
+
+const scheduleKeyDate = (key) => key.slice(key.lastIndexOf(':') + 1);
+
+// Bulk operations that bring one plant's generated tasks in line with its schedule
+const plantOperations = (plant, from, until) => {
+  const operations = [];
+  const keys = [];
+  const dismissed = new Set(plant.taskGeneration?.dismissedKeys);
+
+  SCHEDULE_SECTIONS.forEach(({ section, taskType, verb, next, last }) => {
+    const schedule = plant.careSchedule?.[section];
+    const interval = parseFrequency(schedule?.frequency);
+    if (!interval) return;
+
+    let anchor = next && schedule[next];
+    if (!anchor && schedule[last]) {
+      anchor = new Date(new Date(schedule[last]).getTime() + interval * DAY_MS);
+    }
+    anchor = anchor || plant.plantedDate || plant.createdAt || new Date(from);
+
+    occurrences(anchor, interval, from, until).forEach(dueDate => {
+      const key = scheduleKey(plant._id, taskType, dueDate);
+      keys.push(key);
+      if (dismissed.has(key)) return;
+
+      operations.push({
+        updateOne: {
+          filter: { user: plant.user, scheduleKey: key },
+          update: {
+            $setOnInsert: {
+              user: plant.user,
+              plant: plant._id,
+              plantName: plant.name,
+              task: `${verb} ${plant.name}`,
+              taskType,
+              dueDate,
+              time: 'Morning',
+              source: 'schedule',
+              scheduleKey: key
+            }
+          },
+          upsert: true
+        }
+      });
+    });
+  });
+
+  // Drop pending generated tasks the current schedule no longer produces
+  operations.push({
+    deleteMany: {
+      filter: {
+        plant: plant._id,
+        source: 'schedule',
+        status: 'pending',
+        dueDate: { $gte: new Date(from) },
+        scheduleKey: { $nin: keys }
+      }
+    }
+  });
+
+  return operations;
+};
+
+// Materialize upcoming tasks from plant care schedules.
+//
+// Plants are streamed with a cursor and written in chunked bulkWrites, so a
+// full pass over every garden never holds more than one batch in memory.
+// Without `plantIds` only plants that need it are visited: never generated,
+// edited since the last run, or whose generated window is running out.
+export const generateScheduledTasks = async ({
+  plantIds = null,
+  userId = null,
+  windowDays = SCHEDULE_WINDOW_DAYS,
+  batchSize = 500,
+  now = new Date()
+} = {}) => {
+  const started = Date.now();
+  const from = startOfUTCDay(now);
+  const until = from + windowDays * DAY_MS;
+  const refreshBefore = new Date(from + Math.ceil(windowDays / 2) * DAY_MS);
+  const today = new Date(from).toISOString().slice(0, 10);
+
+  const query = { isActive: true, status: { $nin: FINISHED_STATUSES } };
+  if (userId) query.user = userId;
+  if (plantIds) {
+    query._id = { $in: plantIds };
+  } else {
+    query.$or = [
+      { 'taskGeneration.generatedAt': { $exists: false } },
+      { $expr: { $gt: ['$updatedAt', '$taskGeneration.generatedAt'] } },
+      { 'taskGeneration.generatedUntil': { $lt: refreshBefore } }
+    ];
+  }
+
+  const stats = { plantsScanned: 0, tasksUpserted: 0, tasksRemoved: 0, durationMs: 0 };
+  let taskOperations = [];
+  let plantMarks = [];
+  const batchUsers = new Set();
+
+  const flush = async () => {
+    if (taskOperations.length > 0) {
+      const result = await Task.bulkWrite(taskOperations, { ordered: false });
+      stats.tasksUpserted += result.upsertedCount;
+      stats.tasksRemoved += result.deletedCount;
+      batchUsers.forEach(invalidateDashboard);
+    }
+    if (plantMarks.length > 0) {
+      await Plant.bulkWrite(plantMarks, { ordered: false });
+    }
+    taskOperations = [];
+    plantMarks = [];
+    batchUsers.clear();
+  };
+
+  const cursor = Plant.find(query)
+    .select('user name plantedDate createdAt careSchedule taskGeneration.dismissedKeys')
+    .lean()
+    .cursor({ batchSize });
+
+  for await (const plant of cursor) {
+    stats.plantsScanned++;
+    batchUsers.add(String(plant.user));
+    taskOperations.push(...plantOperations(plant, from, until));
+
+    // Marking a plant must not bump updatedAt, or it would look edited again.
+    // generatedAt is the pass start, so edits made mid-pass are picked up next run.
+    // Dismissals for days that have passed are dropped.
+    const expired = (plant.taskGeneration?.dismissedKeys || []).filter(key => scheduleKeyDate(key) < today);
+    const update = {
+      $set: { 'taskGeneration.generatedAt': new Date(started), 'taskGeneration.generatedUntil': new Date(until) }
+    };
+    if (expired.length > 0) update.$pull = { 'taskGeneration.dismissedKeys': { $in: expired } };
+    plantMarks.push({
+      updateOne: { filter: { _id: plant._id }, update, timestamps: false }
+    });
+
+    if (plantMarks.length >= batchSize) {
+      await flush();
+    }
+  }
+  await flush();
+
+  stats.durationMs = Date.now() - started;
+  return stats;
+};
+
+// Drop the pending generated tasks of a plant that was deleted or finished.
+// The generator only visits active plants, so it would never remove them.
+export const removeScheduledTasks = (plant) => {
+  return Task.deleteMany({ user: plant.user, plant: plant._id, source: 'schedule', status: 'pending' });
+};
+
+// Remember a deleted generated task so later runs don't recreate it
+export const dismissScheduledTask = (task) => {
+  if (task.source !== 'schedule' || !task.plant || !task.scheduleKey) return Promise.resolve();
+
+  return Plant.updateOne(
+    { _id: task.plant, user: task.user },
+    { $addToSet: { 'taskGeneration.dismissedKeys': task.scheduleKey } },
+    { timestamps: false }
+  );
+};
+
+// Regenerate one plant's tasks in the background after its schedule changes
+export const scheduleTaskGeneration = (plantId) => {
+  if (!mongoose.isValidObjectId(plantId)) return;
+
+  generateScheduledTasks({ plantIds: [plantId] })
+    .catch(error => console.error('Task generation error:', error.message));
+};
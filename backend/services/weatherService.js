@@ -0,0 +1,293 @@
+import LRUCache from '../utils/lruCache.js';
+import { callProvider, isConfigured } from './apiGateway.js';
+import { DHAKA_OFFSET_MS } from '../utils/growingSeason.js';
+
+// OpenWeatherMap allows ~1,000 calls/day for the whole user base, so every
+// lookup goes through a shared cache keyed on a coarse location bucket.
+// Upstream calls go through services/apiGateway.js, which also enforces
+// the daily quota across workers; point OPENWEATHER_BASE_URL at a local
+// fake server for tests/benchmarks.
+
+// Fresh for 30 minutes; stale entries are still served for up to 6 hours
+// when the upstream is slow or failing
+const FRESH_MS = parseInt(process.env.WEATHER_CACHE_TTL_MS, 10) || 30 * 60 * 1000;
+const STALE_MS = parseInt(process.env.WEATHER_STALE_TTL_MS, 10) || 6 * 60 * 60 * 1000;
+
+// With a stale entry in hand, wait this long for a refresh before serving it
+const STALE_GRACE_MS = parseInt(process.env.WEATHER_STALE_GRACE_MS, 10) || 800;
+
+// Unknown cities and upstream failures are remembered for a minute, so a
+// bad or hostile query cannot spend the daily quota one request at a time
+const ERROR_TTL_MS = parseInt(process.env.WEATHER_ERROR_TTL_MS, 10) || 60 * 1000;
+
+// 0.1° is roughly 11 km - one bucket covers a neighbourhood of Dhaka
+const GEO_PRECISION = 1;
+
+// Bangladesh bounding box; coordinates outside it are rejected before they
+// can open a new cache bucket
+const BOUNDS = { minLat: 20.5, maxLat: 26.7, minLon: 88.0, maxLon: 92.7 };
+
+// The 64 districts, plus the older spellings still common in profiles.
+// Any other ?city= is rejected rather than sent upstream.
+const DISTRICTS = new Set([
+  'bagerhat', 'bandarban', 'barguna', 'barishal', 'bhola', 'bogura', 'brahmanbaria',
+  'chandpur', 'chapai nawabganj', 'chattogram', 'chuadanga', "cox's bazar", 'cumilla',
+  'dhaka', 'dinajpur', 'faridpur', 'feni', 'gaibandha', 'gazipur', 'gopalganj',
+  'habiganj', 'jamalpur', 'jashore', 'jhalokati', 'jhenaidah', 'joypurhat',
+  'khagrachhari', 'khulna', 'kishoreganj', 'kurigram', 'kushtia', 'lakshmipur',
+  'lalmonirhat', 'madaripur', 'magura', 'manikganj', 'meherpur', 'moulvibazar',
+  'munshiganj', 'mymensingh', 'naogaon', 'narail', 'narayanganj', 'narsingdi', 'natore',
+  'netrokona', 'nilphamari', 'noakhali', 'pabna', 'panchagarh', 'patuakhali', 'pirojpur',
+  'rajbari', 'rajshahi', 'rangamati', 'rangpur', 'satkhira', 'shariatpur', 'sherpur',
+  'sirajganj', 'sunamganj', 'sylhet', 'tangail', 'thakurgaon',
+  'barisal', 'bogra', 'chittagong', 'comilla', 'jessore'
+]);
+
+const cache = new LRUCache({ max: 5000, ttl: STALE_MS });
+const failures = new LRUCache({ max: 5000, ttl: ERROR_TTL_MS });
+const inflight = new Map();
+
+const stats = {
+  requests: 0,
+  hits: 0,
+  staleServed: 0,
+  misses: 0,
+  coalesced: 0,
+  failuresServed: 0,
+  upstreamCalls: 0,
+  upstreamErrors: 0
+};
+
+const CONDITION_ICONS = {
+  Clear: '☀️',
+  Clouds: '☁️',
+  Rain: '🌧️',
+  Drizzle: '🌦️',
+  Thunderstorm: '⛈️',
+  Snow: '❄️',
+  Mist: '🌫️',
+  Haze: '🌫️',
+  Fog: '🌫️',
+  Smoke: '🌫️',
+  Dust: '🌫️'
+};
+
+export class WeatherError extends Error {
+  constructor(message, statusCode = 502) {
+    super(message);
+    this.statusCode = statusCode;
+  }
+}
+
+// Resolve request input to a cache bucket plus the upstream query for it.
+// Accepts { lat, lon } inside Bangladesh or { city } naming a district;
+// coordinates are rounded so nearby users share an entry. Returns null for
+// anything else.
+export const resolveLocation = ({ lat, lon, city } = {}) => {
+  const latitude = parseFloat(lat);
+  const longitude = parseFloat(lon);
+
+  if (Number.isFinite(latitude) && Number.isFinite(longitude)) {
+    if (latitude < BOUNDS.minLat || latitude > BOUNDS.maxLat ||
+        longitude < BOUNDS.minLon || longitude > BOUNDS.maxLon) return null;
+
+    const roundedLat = latitude.toFixed(GEO_PRECISION);
+    const roundedLon = longitude.toFixed(GEO_PRECISION);
+    return {
+      key: `geo:${roundedLat}:${roundedLon}`,
+      params: { lat: roundedLat, lon: roundedLon }
+    };
+  }
+
+  if (city && String(city).trim()) {
+    const name = String(city).trim().toLowerCase().replace(/\s+/g, ' ');
+    if (!DISTRICTS.has(name)) return null;
+    return {
+      key: `city:${name}`,
+      params: { q: `${name},BD` }
+    };
+  }
+
+  return null;
+};
+
+const fetchUpstream = async (endpoint, params) => {
+  if (!isConfigured('openweather')) {
+    throw new WeatherError('Weather service is not configured', 503);
+  }
+
+  stats.upstreamCalls++;
+  try {
+    const response = await callProvider('openweather', {
+      method: 'get',
+      url: `/${endpoint}`,
+      params: { ...params, units: 'metric' }
+    });
+    return response.data;
+  } catch (error) {
+    stats.upstreamErrors++;
+    if (error.status === 404) {
+      throw new WeatherError('Location not found', 404);
+    }
+    throw new WeatherError(`Weather provider error: ${error.message}`, error.statusCode === 503 ? 503 : 502);
+  }
+};
+
+// Single-flight: concurrent misses for the same key share one upstream call,
+// and a key that just failed fails again without one until ERROR_TTL_MS passes
+const refresh = (cacheKey, endpoint, params, transform) => {
+  if (inflight.has(cacheKey)) {
+    stats.coalesced++;
+    return inflight.get(cacheKey);
+  }
+
+  const failure = failures.get(cacheKey);
+  if (failure) {
+    stats.failuresServed++;
+    return Promise.reject(failure);
+  }
+
+  const request = fetchUpstream(endpoint, params)
+    .then(raw => {
+      const data = transform(raw);
+      cache.set(cacheKey, { data, fetchedAt: Date.now() });
+      return data;
+    }, error => {
+      failures.set(cacheKey, error);
+      throw error;
+    })
+    .finally(() => inflight.delete(cacheKey));
+
+  inflight.set(cacheKey, request);
+  return request;
+};
+
+const timeout = (ms) => new Promise(resolve => {
+  setTimeout(resolve, ms).unref();
+});
+
+const cachedFetch = async (kind, location, endpoint, transform) => {
+  stats.requests++;
+  const cacheKey = `${kind}:${location.key}`;
+  const entry = cache.get(cacheKey);
+
+  if (entry && Date.now() - entry.fetchedAt < FRESH_MS) {
+    stats.hits++;
+    return { data: entry.data, cached: true, stale: false, fetchedAt: entry.fetchedAt };
+  }
+
+  const pending = refresh(cacheKey, endpoint, location.params, transform);
+
+  if (!entry) {
+    stats.misses++;
+    const data = await pending;
+    return { data, cached: false, stale: false, fetchedAt: Date.now() };
+  }
+
+  // Stale entry: give the refresh a short grace period, then fall back to
+  // the stale copy. A failed refresh also falls back; the cache keeps the
+  // old value until a refresh succeeds.
+  const STALE = Symbol('stale');
+  const data = await Promise.race([
+    pending.catch(() => STALE),
+    timeout(STALE_GRACE_MS).then(() => STALE)
+  ]);
+
+  if (data === STALE) {
+    stats.staleServed++;
+    return { data: entry.data, cached: true, stale: true, fetchedAt: entry.fetchedAt };
+  }
+
+  return { data, cached: false, stale: false, fetchedAt: Date.now() };
+};
+
+const toCurrent = (raw) => {
+  const condition = raw.weather?.[0]?.main || 'Unknown';
+  return {
+    location: raw.name,
+    temp: Math.round(raw.main?.temp),
+    feelsLike: Math.round(raw.main?.feels_like),
+    condition,
+    description: raw.weather?.[0]?.description,
+    icon: CONDITION_ICONS[condition] || '🌤️',
+    humidity: raw.main?.humidity,
+    // m/s -> km/h
+    wind: Math.round((raw.wind?.speed || 0) * 3.6),
+    rain: raw.rain?.['1h'] || 0,
+    observedAt: raw.dt ? new Date(raw.dt * 1000).toISOString() : null
+  };
+};
+
+// Collapse the 3-hourly forecast into one entry per Dhaka calendar day
+const toForecast = (raw) => {
+  const days = new Map();
+
+  (raw.list || []).forEach(slot => {
+    const date = new Date(slot.dt * 1000 + DHAKA_OFFSET_MS).toISOString().slice(0, 10);
+    const day = days.get(date) || { date, temps: [], rain: 0, maxPop: 0, conditions: {} };
+    const condition = slot.weather?.[0]?.main || 'Unknown';
+
+    day.temps.push(slot.main?.temp);
+    day.rain += slot.rain?.['3h'] || 0;
+    day.maxPop = Math.max(day.maxPop, slot.pop || 0);
+    day.conditions[condition] = (day.conditions[condition] || 0) + 1;
+    days.set(date, day);
+  });
+
+  return {
+    location: raw.city?.name,
+    days: [...days.values()].map(day => {
+      const condition = Object.entries(day.conditions).sort((a, b) => b[1] - a[1])[0][0];
+      return {
+        date: day.date,
+        day: new Date(`${day.date}T00:00:00Z`).toLocaleDateString('en-US', { weekday: 'short', timeZone: 'UTC' }),
+        temp: Math.round(Math.max(...day.temps)),
+        tempMin: Math.round(Math.min(...day.temps)),
+        condition,
+        icon: CONDITION_ICONS[condition] || '🌤️',
+        rain: Math.round(day.rain * 10) / 10,
+        rainChance: Math.round(day.maxPop * 100)
+      };
+    })
+  };
+};
+
+export const getCurrentWeather = (location) => {
+  return cachedFetch('current', location, 'weather', toCurrent);
+};
+
+export const getForecast = (location) => {
+  return cachedFetch('forecast', location, 'forecast', toForecast);
+};
+
+// Gardening alerts derived from the (cached) forecast - no extra upstream call
+export const getWeatherAlerts = async (location) => {
+  const forecast = await getForecast(location);
+  const alerts = [];
+
+  forecast.data.days.forEach(day => {
+    if (day.temp >= 35) {
+      alerts.push({ date: day.date, type: 'heat', message: `Heat of ${day.temp}°C expected - water early morning and shade seedlings` });
+    }
+    if (day.rain >= 20 || day.rainChance >= 80) {
+      alerts.push({ date: day.date, type: 'heavy-rain', message: 'Heavy rain likely - check drainage and skip watering' });
+    }
+    if (day.condition === 'Thunderstorm') {
+      alerts.push({ date: day.date, type: 'storm', message: 'Thunderstorms forecast - secure pots and trellises' });
+    }
+  });
+
+  return { ...forecast, data: { location: forecast.data.location, alerts } };
+};
+
+export const getWeatherStats = () => {
+  return {
+    ...stats,
+    hitRate: stats.requests > 0 ? (stats.hits + stats.staleServed) / stats.requests : 0,
+    // Share of requests that did not cost an upstream call (cache + coalescing)
+    upstreamSavings: stats.requests > 0 ? 1 - stats.upstreamCalls / stats.requests : 0,
+    inflight: inflight.size,
+    entries: cache.size,
+    failures: failures.size
+  };
+};
@@ -0,0 +1,129 @@
+// Compact binary encoding of the plant catalogue, written to disk so each
+// worker can load the whole catalogue at startup without a database query.
+//
+// Layout (little-endian):
+//   header   MAGIC (8 bytes) | count u32 | string table bytes u32 | builtAt f64
+//   records  count x RECORD_SIZE bytes, in (name, _id) order
+//            _id (12 bytes) | externalId u32 (0 = none) | type u8 |
+//            difficulty u8 | season bitmask u8 | unused u8 |
+//            per string field: offset u32, length u32 (in UTF-16 code
+//            units) into the decoded string table
+//   strings  UTF-8, each distinct value stored once
+//
+// Records are fixed-size and the string table is decoded with a single
+// toString(), after which every field is a slice of it. Loading is one pass
+// of typed reads with no parsing. Repeated values ('Full Sun', 'Moderate')
+// are stored once.
+import { SEASONS } from './growingSeason.js';
+
+const MAGIC = Buffer.from('UECATv01');
+const HEADER_SIZE = MAGIC.length + 4 + 4 + 8;
+
+const TYPES = ['Herb', 'Vegetable', 'Fruit', 'Flower', 'Other'];
+const DIFFICULTIES = ['Easy', 'Moderate', 'Hard'];
+const STRING_FIELDS = ['name', 'scientificName', 'sunNeeds', 'water', 'growthTime', 'image', 'description', 'cycle', 'source', 'otherNames'];
+// otherNames is an array, stored joined on a separator no name contains
+const LIST_SEPARATOR = '\u001f';
+
+const FIXED_SIZE = 12 + 4 + 4;
+const RECORD_SIZE = FIXED_SIZE + STRING_FIELDS.length * 8;
+
+// An index that does not fit in a u8 reads back as undefined
+const indexOf = (list, value) => {
+  const index = list.indexOf(value);
+  return index >= 0 ? index : 255;
+};
+
+export const encodeCatalog = (entries, builtAt = Date.now()) => {
+  const interned = new Map();
+  const table = [];
+  let tableLength = 0;
+
+  const intern = (value) => {
+    if (value === undefined || value === null || value === '') return [0, 0];
+    const text = String(value);
+    if (!interned.has(text)) {
+      interned.set(text, [tableLength, text.length]);
+      table.push(text);
+      tableLength += text.length;
+    }
+    return interned.get(text);
+  };
+
+  const records = Buffer.alloc(entries.length * RECORD_SIZE);
+  entries.forEach((entry, i) => {
+    let at = i * RECORD_SIZE;
+    Buffer.from(String(entry._id), 'hex').copy(records, at);
+    records.writeUInt32LE(entry.externalId || 0, at + 12);
+    records.writeUInt8(indexOf(TYPES, entry.type), at + 16);
+    records.writeUInt8(indexOf(DIFFICULTIES, entry.difficulty), at + 17);
+    records.writeUInt8((entry.seasons || []).reduce((mask, season) => mask | (1 << SEASONS.indexOf(season)), 0), at + 18);
+
+    at += FIXED_SIZE;
+    STRING_FIELDS.forEach(field => {
+      const value = field === 'otherNames' ? (entry.otherNames || []).join(LIST_SEPARATOR) : entry[field];
+      const [offset, length] = intern(value);
+      records.writeUInt32LE(offset, at);
+      records.writeUInt32LE(length, at + 4);
+      at += 8;
+    });
+  });
+
+  const strings = Buffer.from(table.join(''), 'utf8');
+  const header = Buffer.alloc(HEADER_SIZE);
+  MAGIC.copy(header, 0);
+  header.writeUInt32LE(entries.length, MAGIC.length);
+  header.writeUInt32LE(strings.length, MAGIC.length + 4);
+  header.writeDoubleLE(builtAt, MAGIC.length + 8);
+
+  return Buffer.concat([header, records, strings]);
+};
+
+// Returns { builtAt, entries } with entries shaped like lean catalogue
+// documents (_id as a hex string). Throws on a truncated or foreign file.
+export const decodeCatalog = (buffer) => {
+  if (buffer.length < HEADER_SIZE || !buffer.subarray(0, MAGIC.length).equals(MAGIC)) {
+    throw new Error('Not a catalogue snapshot (or an older format)');
+  }
+
+  const count = buffer.readUInt32LE(MAGIC.length);
+  const stringBytes = buffer.readUInt32LE(MAGIC.length + 4);
+  const builtAt = buffer.readDoubleLE(MAGIC.length + 8);
+  const stringsStart = HEADER_SIZE + count * RECORD_SIZE;
+  if (buffer.length !== stringsStart + stringBytes) {
+    throw new Error('Catalogue snapshot is truncated');
+  }
+
+  const table = buffer.toString('utf8', stringsStart);
+  const seasonSets = Array.from({ length: 1 << SEASONS.length }, (unused, mask) => {
+    return SEASONS.filter((season, bit) => mask & (1 << bit));
+  });
+
+  const entries = new Array(count);
+  for (let i = 0; i < count; i++) {
+    let at = HEADER_SIZE + i * RECORD_SIZE;
+    const entry = {
+      _id: buffer.toString('hex', at, at + 12),
+      type: TYPES[buffer[at + 16]],
+      difficulty: DIFFICULTIES[buffer[at + 17]],
+      // Copied so callers can't change the shared arrays
+      seasons: seasonSets[buffer[at + 18]].slice()
+    };
+    const externalId = buffer.readUInt32LE(at + 12);
+    if (externalId) entry.externalId = externalId;
+
+    at += FIXED_SIZE;
+    for (const field of STRING_FIELDS) {
+      const offset = buffer.readUInt32LE(at);
+      const length = buffer.readUInt32LE(at + 4);
+      at += 8;
+      if (length === 0) continue;
+      const value = table.slice(offset, offset + length);
+      entry[field] = field === 'otherNames' ? value.split(LIST_SEPARATOR) : value;
+    }
+
+    entries[i] = entry;
+  }
+
+  return { builtAt, entries };
+};
@@ -0,0 +1,58 @@
+// Per-process circuit breaker for an external provider.
+//
+// closed    - calls go through; `failureThreshold` failures in a row open it
+// open      - calls are refused until `cooldownMs` has passed
+// half-open - one trial call is let through; success closes the circuit,
+//             failure opens it for another cooldown
+export class CircuitBreaker {
+  constructor({ failureThreshold = 5, cooldownMs = 30000 } = {}) {
+    this.failureThreshold = failureThreshold;
+    this.cooldownMs = cooldownMs;
+    this.state = 'closed';
+    this.failures = 0;
+    this.openedAt = 0;
+    this.trialInFlight = false;
+    this.opens = 0;
+  }
+
+  // True if a call may go ahead now
+  allow() {
+    if (this.state === 'closed') return true;
+
+    if (this.state === 'open') {
+      if (Date.now() - this.openedAt < this.cooldownMs) return false;
+      this.state = 'half-open';
+    }
+
+    if (this.trialInFlight) return false;
+    this.trialInFlight = true;
+    return true;
+  }
+
+  success() {
+    this.state = 'closed';
+    this.failures = 0;
+    this.trialInFlight = false;
+  }
+
+  failure() {
+    this.failures++;
+    this.trialInFlight = false;
+    if (this.state === 'half-open' || this.failures >= this.failureThreshold) {
+      this.state = 'open';
+      this.openedAt = Date.now();
+      this.opens++;
+    }
+  }
+
+  // A call that was allowed but never completed (cancelled); frees the trial slot
+  release() {
+    this.trialInFlight = false;
+  }
+
+  stats() {
+    return { state: this.state, consecutiveFailures: this.failures, opens: this.opens };
+  }
+}
+
+export default CircuitBreaker;
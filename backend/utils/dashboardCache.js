@@ -0,0 +1,51 @@
+import LRUCache from './lruCache.js';
+
+// Dashboard summaries keyed by user id. Plant and task writes drop the
+// owner's entry (see hooks in models/Plant.js and models/Task.js); the short
+// TTL bounds staleness for writes made by other processes and for tasks
+// sliding from "today" to "overdue".
+export const dashboardCache = new LRUCache({
+  max: parseInt(process.env.DASHBOARD_CACHE_MAX, 10) || 10000,
+  ttl: parseInt(process.env.DASHBOARD_CACHE_TTL_MS, 10) || 30 * 1000
+});
+
+export const invalidateDashboard = (userId) => {
+  if (userId === undefined || userId === null) return;
+
+  // Query filters may carry operators ({ $in: [...] }); drop everything then
+  if (typeof userId === 'object' && !userId._bsontype) {
+    dashboardCache.clear();
+    return;
+  }
+
+  dashboardCache.delete(String(userId));
+};
+
+// Mongoose hooks that keep the cache in step with writes to a model whose
+// documents carry a `user` field
+export const invalidateDashboardOnWrite = (schema) => {
+  schema.post('save', function(doc) {
+    invalidateDashboard(doc.user);
+  });
+
+  schema.post('deleteOne', { document: true, query: false }, function() {
+    invalidateDashboard(this.user);
+  });
+
+  // Not called when an unordered insertMany partly fails; the bulk endpoints
+  // invalidate explicitly
+  schema.post('insertMany', function(docs) {
+    new Set(docs.map(doc => String(doc.user))).forEach(invalidateDashboard);
+  });
+
+  schema.post(['updateOne', 'updateMany', 'findOneAndUpdate', 'deleteOne', 'deleteMany', 'findOneAndDelete'], function() {
+    const { user } = this.getFilter();
+    if (user) {
+      invalidateDashboard(user);
+    } else {
+      dashboardCache.clear();
+    }
+  });
+};
+
+export const getDashboardCacheStats = () => dashboardCache.stats();
@@ -0,0 +1,32 @@
+// Bangladesh cropping seasons, as used by the catalogue's `seasons` field.
+//
+// rabi    - dry winter season,  16 Oct - 15 Mar (tomato, spinach, radish)
+// kharif1 - pre-monsoon,        16 Mar - 15 Jul (cucumber, gourds, okra)
+// kharif2 - monsoon,            16 Jul - 15 Oct (basil, bitter gourd)
+export const SEASONS = ['rabi', 'kharif1', 'kharif2'];
+
+// Bangladesh has no DST, so local time is always UTC+6
+export const DHAKA_OFFSET_MS = 6 * 60 * 60 * 1000;
+
+// Season start as (month, day), 1-based month
+const STARTS = [
+  { season: 'rabi', month: 10, day: 16 },
+  { season: 'kharif2', month: 7, day: 16 },
+  { season: 'kharif1', month: 3, day: 16 }
+];
+
+export const seasonFor = (date = new Date()) => {
+  const local = new Date(new Date(date).getTime() + DHAKA_OFFSET_MS);
+  const month = local.getUTCMonth() + 1;
+  const day = local.getUTCDate();
+
+  // Latest start on or before the date; before 16 Mar it is still rabi
+  const current = STARTS.find(start => month > start.month || (month === start.month && day >= start.day));
+  return current ? current.season : 'rabi';
+};
+
+// Accepts a season name or 'current'; returns null for anything else
+export const parseSeason = (value) => {
+  if (value === 'current') return seasonFor();
+  return SEASONS.includes(value) ? value : null;
+};
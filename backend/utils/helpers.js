@@ -1,3 +1,6 @@
+import mongoose from 'mongoose';
+import { computePlantHealth } from './plantHealth.js';
+
 // Format error messages
 export const formatErrorMessage = (error) => {
   if (error.name === 'ValidationError') {
@@ -19,6 +22,131 @@ export const paginate = (query, page = 1, limit = 10) => {
   return query.skip(skip).limit(limit);
 };
 
+// Keyset (cursor) pagination
+// Pages are fetched with a range filter on (sortField, _id) instead of skip,
+// so the cost of a page does not grow with how deep the client has scrolled.
+export const DEFAULT_PAGE_LIMIT = 50;
+export const MAX_PAGE_LIMIT = 100;
+
+export const parsePageLimit = (limit) => {
+  const parsed = parseInt(limit, 10);
+  if (Number.isNaN(parsed) || parsed < 1) return DEFAULT_PAGE_LIMIT;
+  return Math.min(parsed, MAX_PAGE_LIMIT);
+};
+
+// Opaque cursor: base64url of [sortValue, _id] of the last item on a page
+export const encodeCursor = (doc, sortField) => {
+  return Buffer.from(JSON.stringify([doc[sortField], String(doc._id)])).toString('base64url');
+};
+
+// Cursor sort-value types: how to rebuild the value and check it survived
+const CURSOR_TYPES = {
+  date: { parse: raw => new Date(raw), valid: value => !Number.isNaN(value.getTime()) },
+  number: { parse: raw => raw, valid: value => Number.isFinite(value) },
+  string: { parse: raw => raw, valid: value => typeof value === 'string' }
+};
+
+// Returns { value, id } or null if the cursor is malformed. `type` is the
+// type of the sort field: 'date' (default), 'number' or 'string'.
+export const decodeCursor = (cursor, type = 'date') => {
+  try {
+    const [raw, id] = JSON.parse(Buffer.from(String(cursor), 'base64url').toString('utf8'));
+    const { parse, valid } = CURSOR_TYPES[type];
+    const value = parse(raw);
+    if (!valid(value) || !mongoose.Types.ObjectId.isValid(id)) {
+      return null;
+    }
+    return { value, id: new mongoose.Types.ObjectId(id) };
+  } catch (error) {
+    return null;
+  }
+};
+
+// Filter matching documents strictly after the cursor in (sortField, _id) order
+export const keysetFilter = (cursor, sortField, direction = 1) => {
+  const op = direction === -1 ? '$lt' : '$gt';
+  return {
+    $or: [
+      { [sortField]: { [op]: cursor.value } },
+      { [sortField]: cursor.value, _id: { [op]: cursor.id } }
+    ]
+  };
+};
+
+// Trim a limit+1 result set to one page and work out the next cursor
+export const buildPage = (docs, limit, sortField) => {
+  const hasMore = docs.length > limit;
+  const items = hasMore ? docs.slice(0, limit) : docs;
+  const nextCursor = hasMore ? encodeCursor(items[items.length - 1], sortField) : null;
+  return { items, nextCursor };
+};
+
+// Build a Mongoose projection from a comma-separated `fields=` query param.
+// Only names in `allowed` are honoured; if none are requested the `defaults`
+// are used. `required` fields (e.g. the pagination sort key) are always kept.
+export const parseFields = (fields, allowed, defaults, required = []) => {
+  const requested = typeof fields === 'string'
+    ? fields.split(',').map(field => field.trim()).filter(field => allowed.includes(field))
+    : [];
+
+  const selected = requested.length > 0 ? requested : defaults;
+  return [...new Set([...selected, ...required])].join(' ');
+};
+
+// Largest batch accepted by the bulk endpoints
+export const MAX_BULK_ITEMS = 100;
+
+// Insert prepared documents in one insertMany round-trip and report per item.
+// `entries` holds, for each input item, either an unsaved model instance or
+// { error } if it already failed a check. Results keep the input order.
+export const insertManyWithResults = async (Model, entries) => {
+  const results = new Array(entries.length);
+  const pending = [];
+
+  entries.forEach((entry, index) => {
+    if (entry.error) {
+      results[index] = { index, success: false, error: entry.error };
+      return;
+    }
+
+    const validationError = entry.validateSync();
+    if (validationError) {
+      results[index] = { index, success: false, error: formatErrorMessage(validationError) };
+      return;
+    }
+
+    pending.push({ index, doc: entry });
+  });
+
+  const writeErrors = new Map();
+  if (pending.length > 0) {
+    try {
+      await Model.insertMany(pending.map(item => item.doc), { ordered: false });
+    } catch (error) {
+      if (!error.writeErrors) throw error;
+      error.writeErrors.forEach(writeError => {
+        writeErrors.set(writeError.index, writeError.errmsg || 'Write failed');
+      });
+    }
+  }
+
+  pending.forEach(({ index, doc }, position) => {
+    results[index] = writeErrors.has(position)
+      ? { index, success: false, error: writeErrors.get(position) }
+      : { index, success: true, doc };
+  });
+
+  return results;
+};
+
+// Nearest-rank percentile of an array of numbers
+export const percentile = (values, pct) => {
+  if (!values.length) return 0;
+  const sorted = [...values].sort((a, b) => a - b);
+  const rank = Math.max(1, Math.ceil((pct / 100) * sorted.length));
+  return sorted[rank - 1];
+};
+
 // Calculate days until date
 export const daysUntil = (date) => {
   const now = new Date();
@@ -50,21 +178,7 @@ export const formatBangladeshPhone = (phone) => {
 
 // Calculate plant health score based on various factors
 export const calculatePlantHealth = (plant) => {
-  let health = 100;
-  
-  // Reduce health if overdue for watering
-  if (plant.careSchedule?.watering?.nextWatering) {
-    const daysOverdue = daysUntil(plant.careSchedule.watering.nextWatering);
-    if (daysOverdue < 0) {
-      health -= Math.abs(daysOverdue) * 5;
-    }
-  }
-  
-  // Factor in plant status
-  if (plant.status === 'attention') health -= 10;
-  if (plant.status === 'sick') health -= 30;
-  
-  return Math.max(0, Math.min(100, health));
+  return computePlantHealth(plant).health;
 };
 
 // Success response helper
@@ -0,0 +1,47 @@
+import sharp from 'sharp';
+
+// Images within this Hamming distance of each other count as near-duplicates.
+// With four 16-bit bands, any pair within 3 bits must share a whole band, so
+// a band lookup finds every candidate.
+export const NEAR_DUPLICATE_DISTANCE = 3;
+const BAND_COUNT = 4;
+
+// 64-bit difference hash: shrink to 9x8 greyscale and compare each pixel with
+// its right-hand neighbour. Robust to re-encoding, resizing and small edits.
+// Accepts anything sharp does: a Buffer or a file path.
+export const differenceHash = async (input) => {
+  const pixels = await sharp(input)
+    .greyscale()
+    .resize(9, 8, { fit: 'fill' })
+    .raw()
+    .toBuffer();
+
+  let hash = 0n;
+  for (let row = 0; row < 8; row++) {
+    for (let col = 0; col < 8; col++) {
+      const left = pixels[row * 9 + col];
+      const right = pixels[row * 9 + col + 1];
+      hash = (hash << 1n) | (left > right ? 1n : 0n);
+    }
+  }
+
+  return hash.toString(16).padStart(16, '0');
+};
+
+// "0:ab12", "1:cd34", ... - indexed so near-duplicate candidates are one query
+export const hashBands = (hexHash) => {
+  const width = hexHash.length / BAND_COUNT;
+  return Array.from({ length: BAND_COUNT }, (_, band) => {
+    return `${band}:${hexHash.slice(band * width, (band + 1) * width)}`;
+  });
+};
+
+export const hammingDistance = (a, b) => {
+  let diff = BigInt(`0x${a}`) ^ BigInt(`0x${b}`);
+  let count = 0;
+  while (diff) {
+    count += Number(diff & 1n);
+    diff >>= 1n;
+  }
+  return count;
+};
@@ -0,0 +1,81 @@
+// Structured JSON logger for production. One line per event, buffered and
+// written in batches so logging never costs a synchronous write on the
+// request path. If the output stream stops draining, lines are dropped (and
+// counted) instead of buffering without bound.
+const LEVELS = { debug: 10, info: 20, warn: 30, error: 40 };
+
+const FLUSH_INTERVAL_MS = 1000;
+const MAX_BUFFER_BYTES = 64 * 1024;
+
+export class Logger {
+  constructor({ level = 'info', stream = process.stdout, base = {} } = {}) {
+    this.level = LEVELS[level] ?? LEVELS.info;
+    this.stream = stream;
+    this.base = base;
+    this.buffer = [];
+    this.bufferBytes = 0;
+    this.timer = null;
+    this.blocked = false;
+    this.written = 0;
+    this.dropped = 0;
+
+    this.stream.on?.('drain', () => {
+      this.blocked = false;
+    });
+  }
+
+  log(level, msg, fields = {}) {
+    if (LEVELS[level] < this.level) return;
+
+    if (this.blocked) {
+      this.dropped++;
+      return;
+    }
+
+    const line = JSON.stringify({ time: new Date().toISOString(), level, msg, ...this.base, ...fields });
+    this.buffer.push(line);
+    this.bufferBytes += line.length + 1;
+
+    if (this.bufferBytes >= MAX_BUFFER_BYTES) {
+      this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => this.flush(), FLUSH_INTERVAL_MS);
+      this.timer.unref();
+    }
+  }
+
+  debug(msg, fields) { this.log('debug', msg, fields); }
+  info(msg, fields) { this.log('info', msg, fields); }
+  warn(msg, fields) { this.log('warn', msg, fields); }
+  error(msg, fields) { this.log('error', msg, fields); }
+
+  flush() {
+    clearTimeout(this.timer);
+    this.timer = null;
+    if (this.buffer.length === 0) return;
+
+    const chunk = `${this.buffer.join('\n')}\n`;
+    this.written += this.buffer.length;
+    this.buffer = [];
+    this.bufferBytes = 0;
+
+    // false means the stream is buffering; stop accepting lines until drain
+    if (!this.stream.write(chunk)) {
+      this.blocked = true;
+    }
+  }
+
+  stats() {
+    return { written: this.written, dropped: this.dropped, buffered: this.buffer.length };
+  }
+}
+
+export const logger = new Logger({
+  level: process.env.LOG_LEVEL || 'info',
+  base: { pid: process.pid }
+});
+
+// Write out whatever is buffered when the process exits
+process.on('exit', () => logger.flush());
+
+export default logger;
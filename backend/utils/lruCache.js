@@ -0,0 +1,71 @@
+// Small in-process LRU cache with per-entry TTL.
+// A Map keeps insertion order, so its first key is always the least recently
+// used one; a hit moves the key to the end by re-inserting it.
+export class LRUCache {
+  constructor({ max = 1000, ttl = 60 * 1000 } = {}) {
+    this.max = max;
+    this.ttl = ttl;
+    this.entries = new Map();
+    this.hits = 0;
+    this.misses = 0;
+    this.evictions = 0;
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      this.misses++;
+      return undefined;
+    }
+
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  set(key, value, ttl = this.ttl) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttl });
+
+    while (this.entries.size > this.max) {
+      this.entries.delete(this.entries.keys().next().value);
+      this.evictions++;
+    }
+
+    return this;
+  }
+
+  delete(key) {
+    return this.entries.delete(key);
+  }
+
+  clear() {
+    this.entries.clear();
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      size: this.entries.size,
+      max: this.max,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      hitRate: lookups > 0 ? this.hits / lookups : 0
+    };
+  }
+}
+
+export default LRUCache;
@@ -0,0 +1,171 @@
+import { AsyncLocalStorage } from 'async_hooks';
+
+// Minimal in-process metrics registry rendered in the Prometheus text
+// exposition format. Counters and histograms are updated on the hot path, so
+// a series is one Map lookup on a joined label key plus a few array writes.
+// Gauges are set at scrape time from the stats the services already keep.
+
+// Seconds; wide enough for both fast Mongo queries and slow uploads
+export const DEFAULT_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+const escapeLabel = (value) => String(value).replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+
+const formatLabels = (names, values, extra = '') => {
+  const pairs = names.map((name, i) => `${name}="${escapeLabel(values[i])}"`);
+  if (extra) pairs.push(extra);
+  return pairs.length > 0 ? `{${pairs.join(',')}}` : '';
+};
+
+const formatValue = (value) => {
+  if (value === Infinity) return '+Inf';
+  if (value === -Infinity) return '-Inf';
+  return Number.isFinite(value) ? String(value) : 'NaN';
+};
+
+class Metric {
+  constructor(type, name, help, labelNames = []) {
+    this.type = type;
+    this.name = name;
+    this.help = help;
+    this.labelNames = labelNames;
+    this.series = new Map();
+  }
+
+  // Label values in labelNames order, and the key they are stored under
+  resolve(labels = {}) {
+    const values = this.labelNames.map(name => labels[name] ?? '');
+    return { values, key: values.join('\u0000') };
+  }
+
+  header() {
+    return [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+  }
+
+  reset() {
+    this.series.clear();
+  }
+}
+
+export class Counter extends Metric {
+  constructor(name, help, labelNames) {
+    super('counter', name, help, labelNames);
+  }
+
+  inc(labels, value = 1) {
+    const { values, key } = this.resolve(labels);
+    const entry = this.series.get(key);
+    if (entry) {
+      entry.value += value;
+    } else {
+      this.series.set(key, { values, value });
+    }
+  }
+
+  // For counters kept elsewhere (cache hits, ...), copied in at scrape time
+  set(labels, value) {
+    const { values, key } = this.resolve(labels);
+    this.series.set(key, { values, value });
+  }
+
+  render() {
+    const lines = this.header();
+    this.series.forEach(({ values, value }) => {
+      lines.push(`${this.name}${formatLabels(this.labelNames, values)} ${formatValue(value)}`);
+    });
+    return lines;
+  }
+}
+
+export class Gauge extends Counter {
+  constructor(name, help, labelNames) {
+    super(name, help, labelNames);
+    this.type = 'gauge';
+  }
+}
+
+export class Histogram extends Metric {
+  constructor(name, help, labelNames, buckets = DEFAULT_BUCKETS) {
+    super('histogram', name, help, labelNames);
+    this.buckets = [...buckets].sort((a, b) => a - b);
+  }
+
+  observe(labels, value) {
+    const { values, key } = this.resolve(labels);
+    let entry = this.series.get(key);
+    if (!entry) {
+      // counts[i] is the number of observations in bucket i alone; the
+      // cumulative counts Prometheus expects are summed when rendering
+      entry = { values, counts: new Array(this.buckets.length + 1).fill(0), sum: 0, count: 0 };
+      this.series.set(key, entry);
+    }
+
+    let i = 0;
+    while (i < this.buckets.length && value > this.buckets[i]) i++;
+    entry.counts[i]++;
+    entry.sum += value;
+    entry.count++;
+  }
+
+  render() {
+    const lines = this.header();
+    this.series.forEach(({ values, counts, sum, count }) => {
+      let cumulative = 0;
+      this.buckets.forEach((bound, i) => {
+        cumulative += counts[i];
+        lines.push(`${this.name}_bucket${formatLabels(this.labelNames, values, `le="${bound}"`)} ${cumulative}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels(this.labelNames, values, 'le="+Inf"')} ${count}`);
+      lines.push(`${this.name}_sum${formatLabels(this.labelNames, values)} ${formatValue(sum)}`);
+      lines.push(`${this.name}_count${formatLabels(this.labelNames, values)} ${count}`);
+    });
+    return lines;
+  }
+}
+
+export class Registry {
+  constructor() {
+    this.metrics = new Map();
+  }
+
+  register(metric) {
+    if (this.metrics.has(metric.name)) {
+      throw new Error(`Metric ${metric.name} is already registered`);
+    }
+    this.metrics.set(metric.name, metric);
+    return metric;
+  }
+
+  counter(name, help, labelNames) {
+    return this.register(new Counter(name, help, labelNames));
+  }
+
+  gauge(name, help, labelNames) {
+    return this.register(new Gauge(name, help, labelNames));
+  }
+
+  histogram(name, help, labelNames, buckets) {
+    return this.register(new Histogram(name, help, labelNames, buckets));
+  }
+
+  render() {
+    const lines = [];
+    this.metrics.forEach(metric => lines.push(...metric.render()));
+    return `${lines.join('\n')}\n`;
+  }
+}
+
+export const registry = new Registry();
+
+// Per-request state shared with code that runs on the request's behalf
+// (the Mongoose timing hooks): { req, dbMs, dbQueries }
+export const requestContext = new AsyncLocalStorage();
+
+// The route a request matched, as declared ('/api/plants/:id'), so metrics
+// are labelled per endpoint rather than per URL
+export const routeTemplate = (req) => {
+  if (!req.route) return 'unmatched';
+  const path = Array.isArray(req.route.path) ? req.route.path.join('|') : String(req.route.path);
+  return `${req.baseUrl}${path === '/' && req.baseUrl ? '' : path}`;
+};
+
+export default registry;
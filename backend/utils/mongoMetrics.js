@@ -0,0 +1,87 @@
+import mongoose from 'mongoose';
+import { registry, requestContext, routeTemplate } from './metrics.js';
+
+// Times every Mongoose query, aggregate and save through schema middleware.
+// Registered as a global plugin, so this module must be imported before any
+// model is compiled (first thing in server.js).
+//
+// Timings are labelled with the route of the request that issued them, so a
+// slow GET /api/tasks splits into Task.find (the query) and Plant.find (the
+// populate). Work with no request behind it (scheduler, batch jobs) is
+// labelled 'background'.
+const QUERY_OPS = [
+  'find', 'findOne', 'countDocuments', 'estimatedDocumentCount', 'distinct',
+  'updateOne', 'updateMany', 'replaceOne', 'deleteOne', 'deleteMany',
+  'findOneAndUpdate', 'findOneAndReplace', 'findOneAndDelete'
+];
+
+const STARTED = Symbol('metricsStarted');
+
+export const mongoQueryDuration = registry.histogram(
+  'mongo_query_duration_seconds',
+  'Mongoose operation time by route, model and operation',
+  ['route', 'model', 'op']
+);
+
+export const mongoQueryErrors = registry.counter(
+  'mongo_query_errors_total',
+  'Mongoose operations that failed, by model and operation',
+  ['model', 'op']
+);
+
+const record = (started, model, op, error) => {
+  if (started === undefined) return;
+  const ms = Number(process.hrtime.bigint() - started) / 1e6;
+
+  const context = requestContext.getStore();
+  if (context) {
+    // Summed, so concurrent queries can add up to more than the request took
+    context.dbMs += ms;
+    context.dbQueries++;
+  }
+
+  mongoQueryDuration.observe({ route: context ? routeTemplate(context.req) : 'background', model, op }, ms / 1000);
+  if (error) mongoQueryErrors.inc({ model, op });
+};
+
+const queryTiming = (schema) => {
+  const queryOnly = { query: true, document: false };
+
+  schema.pre(QUERY_OPS, queryOnly, function () {
+    this[STARTED] = process.hrtime.bigint();
+  });
+  schema.post(QUERY_OPS, queryOnly, function () {
+    record(this[STARTED], this.model.modelName, this.op);
+  });
+  schema.post(QUERY_OPS, queryOnly, function (error, res, next) {
+    record(this[STARTED], this.model.modelName, this.op, error);
+    next(error);
+  });
+
+  schema.pre('aggregate', function () {
+    this[STARTED] = process.hrtime.bigint();
+  });
+  schema.post('aggregate', function () {
+    record(this[STARTED], this.model().modelName, 'aggregate');
+  });
+  schema.post('aggregate', function (error, res, next) {
+    record(this[STARTED], this.model().modelName, 'aggregate', error);
+    next(error);
+  });
+
+  // Documents keep their own start time; save() calls can overlap.
+  // Global plugins also reach embedded schemas, whose saves are part of the
+  // parent's and are not timed separately.
+  schema.pre('save', function () {
+    if (!this.$isSubdocument) this.$locals[STARTED] = process.hrtime.bigint();
+  });
+  schema.post('save', function () {
+    record(this.$locals[STARTED], this.constructor.modelName, 'save');
+  });
+  schema.post('save', function (error, doc, next) {
+    record(this.$locals[STARTED], this.constructor.modelName, 'save', error);
+    next(error);
+  });
+};
+
+mongoose.plugin(queryTiming);
@@ -0,0 +1,116 @@
+import os from 'os';
+import { Worker } from 'worker_threads';
+import bcrypt from 'bcryptjs';
+
+// bcrypt cost factor for new hashes. Existing hashes with a different cost
+// are upgraded transparently on the next successful login.
+export const BCRYPT_ROUNDS = parseInt(process.env.BCRYPT_ROUNDS, 10) || 10;
+
+// Worker threads used for hashing; 0 runs bcryptjs' async API in-process
+const POOL_SIZE = process.env.BCRYPT_WORKERS !== undefined
+  ? parseInt(process.env.BCRYPT_WORKERS, 10) || 0
+  : Math.max(1, Math.min(4, os.cpus().length - 1));
+
+const WORKER_URL = new URL('./passwordWorker.js', import.meta.url);
+
+// Fixed-size pool of hashing workers. Each worker runs one job at a time;
+// extra jobs wait in a FIFO queue.
+class HashWorkerPool {
+  constructor(size) {
+    this.size = size;
+    this.workers = new Set();
+    this.idle = [];
+    this.queue = [];
+    this.completed = 0;
+  }
+
+  run(payload) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ payload, resolve, reject });
+      this.drain();
+    });
+  }
+
+  drain() {
+    while (this.queue.length > 0) {
+      const worker = this.idle.pop() || (this.workers.size < this.size ? this.spawn() : null);
+      if (!worker) return;
+
+      // Busy workers keep the process alive; idle ones must not hold up exit
+      worker.job = this.queue.shift();
+      worker.ref();
+      worker.postMessage(worker.job.payload);
+    }
+  }
+
+  spawn() {
+    const worker = new Worker(WORKER_URL);
+    worker.job = null;
+
+    worker.on('message', ({ result, error }) => {
+      const job = worker.job;
+      worker.job = null;
+      worker.unref();
+      this.completed++;
+      this.idle.push(worker);
+
+      if (error) job.reject(new Error(error));
+      else job.resolve(result);
+
+      this.drain();
+    });
+
+    worker.on('error', (error) => this.retire(worker, error));
+    worker.on('exit', (code) => this.retire(worker, new Error(`Password worker exited with code ${code}`)));
+
+    this.workers.add(worker);
+    return worker;
+  }
+
+  retire(worker, error) {
+    if (!this.workers.delete(worker)) return;
+
+    this.idle = this.idle.filter(idleWorker => idleWorker !== worker);
+    if (worker.job) {
+      worker.job.reject(error);
+      worker.job = null;
+    }
+
+    this.drain();
+  }
+
+  stats() {
+    return {
+      size: this.size,
+      workers: this.workers.size,
+      busy: this.workers.size - this.idle.length,
+      queued: this.queue.length,
+      completed: this.completed
+    };
+  }
+}
+
+const pool = POOL_SIZE > 0 ? new HashWorkerPool(POOL_SIZE) : null;
+
+export const hashPassword = async (password, rounds = BCRYPT_ROUNDS) => {
+  if (!pool) return bcrypt.hash(password, rounds);
+  return pool.run({ op: 'hash', password, rounds });
+};
+
+export const verifyPassword = async (password, hash) => {
+  if (!pool) return bcrypt.compare(password, hash);
+  return pool.run({ op: 'compare', password, hash });
+};
+
+// True if the hash was made with a different cost than BCRYPT_ROUNDS
+export const passwordNeedsRehash = (hash, rounds = BCRYPT_ROUNDS) => {
+  try {
+    return bcrypt.getRounds(hash) !== rounds;
+  } catch (error) {
+    return true;
+  }
+};
+
+export const getPasswordPoolStats = () => {
+  return pool ? pool.stats() : { size: 0, workers: 0, busy: 0, queued: 0, completed: 0 };
+};
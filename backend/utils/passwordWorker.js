@@ -0,0 +1,16 @@
+// Worker thread for password hashing. bcryptjs is pure JavaScript, so hashing
+// on the main thread would stall the event loop for every concurrent request.
+import { parentPort } from 'worker_threads';
+import bcrypt from 'bcryptjs';
+
+parentPort.on('message', ({ op, password, hash, rounds }) => {
+  try {
+    const result = op === 'hash'
+      ? bcrypt.hashSync(password, bcrypt.genSaltSync(rounds))
+      : bcrypt.compareSync(password, hash);
+
+    parentPort.postMessage({ result });
+  } catch (error) {
+    parentPort.postMessage({ error: error.message });
+  }
+});
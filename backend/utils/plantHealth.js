@@ -0,0 +1,72 @@
+// Derived plant fields: daysGrowing, wateringOverdueDays and health.
+//
+// The same rules exist twice - as plain JS for documents already in memory
+// and as aggregation expressions for reads that compute them in Mongo.
+// Change both together.
+//
+// health = 100 - 5 per day watering is overdue - 10 if 'attention'
+//          - 30 if 'sick', clamped to 0..100
+const DAY_MS = 24 * 60 * 60 * 1000;
+const OVERDUE_PENALTY_PER_DAY = 5;
+const STATUS_PENALTY = { attention: 10, sick: 30 };
+
+const clamp = (value) => Math.max(0, Math.min(100, value));
+
+export const computePlantHealth = (plant, now = new Date()) => {
+  const time = new Date(now).getTime();
+  const nextWatering = plant.careSchedule?.watering?.nextWatering;
+
+  const daysGrowing = plant.plantedDate
+    ? Math.floor((time - new Date(plant.plantedDate).getTime()) / DAY_MS)
+    : plant.daysGrowing || 0;
+  const wateringOverdueDays = nextWatering
+    ? Math.max(0, Math.floor((time - new Date(nextWatering).getTime()) / DAY_MS))
+    : 0;
+  const health = clamp(100 - wateringOverdueDays * OVERDUE_PENALTY_PER_DAY - (STATUS_PENALTY[plant.status] || 0));
+
+  return { daysGrowing, wateringOverdueDays, health };
+};
+
+// Aggregation stages that add the same fields, for pipelines over Plant
+export const plantHealthStages = (now = new Date()) => {
+  const at = new Date(now);
+  const daysSince = (field) => ({ $floor: { $divide: [{ $subtract: [at, field] }, DAY_MS] } });
+  const nextWatering = '$careSchedule.watering.nextWatering';
+
+  return [
+    {
+      $addFields: {
+        daysGrowing: {
+          $cond: [{ $ifNull: ['$plantedDate', false] }, daysSince('$plantedDate'), { $ifNull: ['$daysGrowing', 0] }]
+        },
+        wateringOverdueDays: {
+          $cond: [{ $ifNull: [nextWatering, false] }, { $max: [0, daysSince(nextWatering)] }, 0]
+        }
+      }
+    },
+    {
+      $addFields: {
+        health: {
+          $max: [0, {
+            $min: [100, {
+              $subtract: [100, {
+                $add: [
+                  { $multiply: [OVERDUE_PENALTY_PER_DAY, '$wateringOverdueDays'] },
+                  {
+                    $switch: {
+                      branches: Object.entries(STATUS_PENALTY).map(([status, penalty]) => ({
+                        case: { $eq: ['$status', status] },
+                        then: penalty
+                      })),
+                      default: 0
+                    }
+                  }
+                ]
+              }]
+            }]
+          }]
+        }
+      }
+    }
+  ];
+};
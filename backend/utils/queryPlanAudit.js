@@ -0,0 +1,154 @@
+import mongoose from 'mongoose';
+import Plant from '../models/Plant.js';
+import Task from '../models/Task.js';
+import Post from '../models/Post.js';
+import PostLike from '../models/PostLike.js';
+import Reply from '../models/Reply.js';
+import PlantCatalog from '../models/PlantCatalog.js';
+import { ownPlantFilter, plantPageQuery } from '../controllers/plantController.js';
+import { ownTaskFilter, taskListFilter, taskPageQuery, tasksDueBetweenQuery } from '../controllers/taskController.js';
+import { feedQuery, likedPostsQuery, repliesQuery } from '../services/communityFeed.js';
+import { catalogPageQuery } from '../services/plantCatalog.js';
+import { changedPostsQuery } from '../services/searchService.js';
+import { openTasksFilter } from '../services/dashboardService.js';
+
+// The controllers' and services' own query builders, so the audit checks the
+// queries they really send. The values are placeholders - the planner only
+// cares about the shape of the filter/sort.
+const queryShapes = () => {
+  const user = new mongoose.Types.ObjectId();
+  const id = new mongoose.Types.ObjectId();
+  const cursor = { value: new Date(), id: new mongoose.Types.ObjectId() };
+  const scoreCursor = { value: 10, id: new mongoose.Types.ObjectId() };
+  const nameCursor = { value: 'Basil', id: new mongoose.Types.ObjectId() };
+  const now = new Date();
+  const limit = 50;
+
+  return [
+    {
+      name: 'getAllPlants',
+      query: () => plantPageQuery(user, null, limit)
+    },
+    {
+      name: 'getAllPlants (cursor)',
+      query: () => plantPageQuery(user, cursor, limit)
+    },
+    {
+      name: 'getPlantById / updatePlant / deletePlant / notes / care / harvest / createTask',
+      query: () => Plant.findOne(ownPlantFilter(id, user))
+    },
+    {
+      name: 'getAllTasks',
+      query: () => taskPageQuery(taskListFilter(user), limit)
+    },
+    {
+      name: 'getAllTasks (cursor)',
+      query: () => taskPageQuery(taskListFilter(user, { cursor }), limit)
+    },
+    {
+      name: 'getAllTasks (status)',
+      query: () => taskPageQuery(taskListFilter(user, { status: 'pending' }), limit)
+    },
+    {
+      name: 'getTaskById / updateTask / deleteTask',
+      query: () => Task.findOne(ownTaskFilter(id, user))
+    },
+    {
+      name: 'getTasksByDateRange',
+      query: () => tasksDueBetweenQuery(user, now, now)
+    },
+    {
+      name: 'dashboard summary ($match of the task $facet)',
+      query: () => Task.find(openTasksFilter(user))
+    },
+    {
+      name: 'getPosts (recent, category, cursor)',
+      query: () => feedQuery({ sort: 'recent', category: 'Plant Care', position: cursor, limit })
+    },
+    {
+      name: 'getPosts (hot, cursor) / getPopularPosts',
+      query: () => feedQuery({ sort: 'hot', position: scoreCursor, limit })
+    },
+    {
+      name: 'getPosts (top, category)',
+      query: () => feedQuery({ sort: 'top', category: 'Plant Care', limit })
+    },
+    {
+      name: 'getMyPosts',
+      query: () => feedQuery({ sort: 'recent', author: user, limit })
+    },
+    {
+      name: 'likedByMe',
+      query: () => likedPostsQuery(user, [id])
+    },
+    {
+      name: 'getReplies (cursor)',
+      query: () => repliesQuery(id, cursor, limit)
+    },
+    {
+      name: 'refreshPostIndex',
+      query: () => changedPostsQuery(now)
+    },
+    {
+      name: 'getCatalogPlants (type, cursor)',
+      query: () => catalogPageQuery({ type: 'Herb', position: nameCursor, limit })
+    }
+  ];
+};
+
+// Flatten a winning plan into its list of stage names
+const collectStages = (plan, stages = []) => {
+  if (!plan || typeof plan !== 'object') return stages;
+
+  if (plan.stage) stages.push(plan.stage);
+  ['queryPlan', 'inputStage', 'outerStage', 'innerStage'].forEach(key => {
+    collectStages(plan[key], stages);
+  });
+  (plan.inputStages || []).forEach(stage => collectStages(stage, stages));
+
+  return stages;
+};
+
+// Run explain() on every controller query shape and classify the plan
+export const auditQueryPlans = async () => {
+  // Make sure declared indexes exist before asking the planner
+  await Promise.all([Plant.init(), Task.init(), Post.init(), PostLike.init(), Reply.init(), PlantCatalog.init()]);
+
+  const results = [];
+  for (const shape of queryShapes()) {
+    const query = shape.query();
+    const explain = await query.explain('queryPlanner');
+    const plan = Array.isArray(explain) ? explain[0] : explain;
+    const stages = collectStages(plan.queryPlanner.winningPlan);
+
+    results.push({
+      name: shape.name,
+      collection: query.model.collection.collectionName,
+      stages,
+      collscan: stages.includes('COLLSCAN'),
+      inMemorySort: stages.includes('SORT')
+    });
+  }
+
+  return results;
+};
+
+// Print the audit and return false if any query shape needs a collection scan
+export const reportQueryPlans = (results) => {
+  console.log('\n🔎 Query plan audit');
+
+  results.forEach(result => {
+    const icon = result.collscan ? '❌' : result.inMemorySort ? '⚠️' : '✅';
+    console.log(`${icon} ${result.collection}: ${result.name}`);
+    console.log(`   ${result.stages.join(' <- ')}`);
+  });
+
+  const collscans = results.filter(result => result.collscan);
+  if (collscans.length > 0) {
+    console.log(`\n❌ ${collscans.length} query shape(s) fall back to COLLSCAN\n`);
+    return false;
+  }
+
+  console.log('\n✅ All query shapes are index-backed\n');
+  return true;
+};
@@ -0,0 +1,52 @@
+// Feed ranking for community posts.
+//
+// score    = likes + 2 * replies                      ("top")
+// hotScore = log10(max(score, 1)) + age / HOT_DECAY    ("hot")
+//
+// The time term only depends on createdAt, so a post's hotScore never has to
+// be recomputed as time passes - newer posts simply start higher. Each 10x in
+// engagement is worth HOT_DECAY_SECONDS (12.5 hours) of recency.
+export const HOT_EPOCH_SECONDS = Date.UTC(2024, 0, 1) / 1000;
+export const HOT_DECAY_SECONDS = 45000;
+export const REPLY_WEIGHT = 2;
+
+export const engagementScore = (likeCount = 0, replyCount = 0) => {
+  return likeCount + REPLY_WEIGHT * replyCount;
+};
+
+export const hotScore = (score, createdAt) => {
+  const seconds = new Date(createdAt).getTime() / 1000 - HOT_EPOCH_SECONDS;
+  return Math.log10(Math.max(score, 1)) + seconds / HOT_DECAY_SECONDS;
+};
+
+// Update pipeline that applies counter deltas and re-derives score/hotScore in
+// the same atomic write, so rankings stay current without a batch job
+export const engagementPipeline = ({ likes = 0, replies = 0 } = {}, extra = {}) => [
+  {
+    $set: {
+      likeCount: { $max: [0, { $add: [{ $ifNull: ['$likeCount', 0] }, likes] }] },
+      replyCount: { $max: [0, { $add: [{ $ifNull: ['$replyCount', 0] }, replies] }] },
+      ...extra
+    }
+  },
+  {
+    $set: {
+      score: { $add: ['$likeCount', { $multiply: [REPLY_WEIGHT, '$replyCount'] }] }
+    }
+  },
+  {
+    $set: {
+      hotScore: {
+        $add: [
+          { $log10: { $max: ['$score', 1] } },
+          {
+            $divide: [
+              { $subtract: [{ $divide: [{ $toLong: '$createdAt' }, 1000] }, HOT_EPOCH_SECONDS] },
+              HOT_DECAY_SECONDS
+            ]
+          }
+        ]
+      }
+    }
+  }
+];
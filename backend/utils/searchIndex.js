@@ -0,0 +1,402 @@
+// In-process inverted index with prefix and single-typo matching.
+//
+// Documents are tokenized into weighted terms (a title word counts more than
+// a body word). Queries are AND-ed per token: each query token may match a
+// term exactly, as a prefix ("tom" -> "tomato") or within one edit
+// ("tomatoe" -> "tomato"). Typo candidates come from a deletion index
+// (SymSpell): every term is also filed under each string obtained by deleting
+// one of its characters, so candidates are found with a few map lookups
+// instead of a scan of the vocabulary.
+//
+// Everything is plain Maps and Sets, so add/remove are cheap and the index can
+// be updated on every write instead of being rebuilt.
+
+const STOPWORDS = new Set([
+  'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'i', 'in',
+  'is', 'it', 'my', 'of', 'on', 'or', 'the', 'to', 'what', 'with'
+]);
+
+// Shorter terms are too noisy to expand
+const MIN_PREFIX_LENGTH = 2;
+const MIN_FUZZY_LENGTH = 4;
+
+// Cap on vocabulary terms a single prefix may expand to
+const MAX_PREFIX_EXPANSIONS = 64;
+
+// Extra query words are ignored
+const MAX_QUERY_TOKENS = 10;
+
+const EXACT_MATCH = 1;
+const PREFIX_MATCH = 0.7;
+const FUZZY_MATCH = 0.5;
+
+export const tokenize = (text) => {
+  if (text === undefined || text === null) return [];
+  return String(text)
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .split(/[^\p{L}\p{N}]+/u)
+    .filter(token => token && !STOPWORDS.has(token));
+};
+
+// Optimal string alignment distance, giving up once it exceeds `max`
+export const editDistance = (a, b, max = 1) => {
+  if (Math.abs(a.length - b.length) > max) return max + 1;
+
+  let previous2 = null;
+  let previous = Array.from({ length: b.length + 1 }, (_, index) => index);
+
+  for (let i = 1; i <= a.length; i++) {
+    const current = [i];
+    let rowMin = i;
+
+    for (let j = 1; j <= b.length; j++) {
+      const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+      let value = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost);
+      if (previous2 && i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+        value = Math.min(value, previous2[j - 2] + 1);
+      }
+      current.push(value);
+      rowMin = Math.min(rowMin, value);
+    }
+
+    if (rowMin > max) return max + 1;
+    previous2 = previous;
+    previous = current;
+  }
+
+  return previous[b.length];
+};
+
+const deletions = (term) => {
+  const variants = new Set();
+  for (let i = 0; i < term.length; i++) {
+    variants.add(term.slice(0, i) + term.slice(i + 1));
+  }
+  return variants;
+};
+
+const addToSetMap = (map, key, value) => {
+  let set = map.get(key);
+  if (!set) {
+    set = new Set();
+    map.set(key, set);
+  }
+  set.add(value);
+};
+
+const removeFromSetMap = (map, key, value) => {
+  const set = map.get(key);
+  if (!set) return;
+  set.delete(value);
+  if (set.size === 0) map.delete(key);
+};
+
+const byScore = (a, b) => b.score - a.score || b.rank - a.rank;
+
+// Keeps the best `k` items offered so far, in order. Results pages are small,
+// so a sorted array beats sorting every match.
+class TopK {
+  constructor(k, compare) {
+    this.k = k;
+    this.compare = compare;
+    this.items = [];
+  }
+
+  offer(item) {
+    const { items, k, compare } = this;
+    if (k <= 0) return;
+    if (items.length === k && compare(item, items[k - 1]) >= 0) return;
+
+    let low = 0;
+    let high = items.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (compare(item, items[mid]) < 0) high = mid;
+      else low = mid + 1;
+    }
+    items.splice(low, 0, item);
+    if (items.length > k) items.pop();
+  }
+
+  sorted() {
+    return this.items;
+  }
+}
+
+export class SearchIndex {
+  // fields: { name: weight } of text fields to index
+  // facets: names of keyword fields to filter and count on
+  constructor({ fields, facets = [] }) {
+    this.fields = fields;
+    this.facets = facets;
+    // Documents get dense numbers so query scratch space can be typed arrays
+    this.ids = new Map();
+    this.entries = [];
+    this.freeNumbers = [];
+    this.postings = new Map();
+    this.prefixes = new Map();
+    this.deletes = new Map();
+    this.scratch = null;
+  }
+
+  get size() {
+    return this.ids.size;
+  }
+
+  // Add or replace a document. `doc` holds the text and facet fields plus
+  // an optional numeric `rank` used to break score ties (e.g. createdAt).
+  add(id, doc) {
+    const key = String(id);
+    if (this.ids.has(key)) this.remove(key);
+
+    const terms = new Map();
+    Object.entries(this.fields).forEach(([field, weight]) => {
+      const value = Array.isArray(doc[field]) ? doc[field].join(' ') : doc[field];
+      tokenize(value).forEach(term => {
+        terms.set(term, Math.max(terms.get(term) || 0, weight));
+      });
+    });
+
+    const facets = {};
+    this.facets.forEach(facet => {
+      if (doc[facet] !== undefined && doc[facet] !== null) facets[facet] = String(doc[facet]);
+    });
+
+    const number = this.freeNumbers.length > 0 ? this.freeNumbers.pop() : this.entries.length;
+    terms.forEach((weight, term) => {
+      let posting = this.postings.get(term);
+      if (!posting) {
+        posting = new Map();
+        this.postings.set(term, posting);
+        this.indexTerm(term);
+      }
+      posting.set(number, weight);
+    });
+
+    this.ids.set(key, number);
+    this.entries[number] = { key, terms: [...terms.keys()], facets, rank: Number(doc.rank) || 0 };
+  }
+
+  remove(id) {
+    const key = String(id);
+    const number = this.ids.get(key);
+    if (number === undefined) return false;
+
+    this.entries[number].terms.forEach(term => {
+      const posting = this.postings.get(term);
+      if (!posting) return;
+      posting.delete(number);
+      if (posting.size === 0) {
+        this.postings.delete(term);
+        this.unindexTerm(term);
+      }
+    });
+
+    this.ids.delete(key);
+    this.entries[number] = undefined;
+    this.freeNumbers.push(number);
+    return true;
+  }
+
+  clear() {
+    this.ids.clear();
+    this.entries = [];
+    this.freeNumbers = [];
+    this.postings.clear();
+    this.prefixes.clear();
+    this.deletes.clear();
+    this.scratch = null;
+  }
+
+  indexTerm(term) {
+    if (term.length >= MIN_PREFIX_LENGTH) {
+      addToSetMap(this.prefixes, term.slice(0, MIN_PREFIX_LENGTH), term);
+    }
+    if (term.length >= MIN_FUZZY_LENGTH - 1) {
+      deletions(term).forEach(variant => addToSetMap(this.deletes, variant, term));
+    }
+  }
+
+  unindexTerm(term) {
+    if (term.length >= MIN_PREFIX_LENGTH) {
+      removeFromSetMap(this.prefixes, term.slice(0, MIN_PREFIX_LENGTH), term);
+    }
+    if (term.length >= MIN_FUZZY_LENGTH - 1) {
+      deletions(term).forEach(variant => removeFromSetMap(this.deletes, variant, term));
+    }
+  }
+
+  // Vocabulary terms a query token matches, with the match factor for each
+  expand(token, { prefix = true, fuzzy = true } = {}) {
+    const matches = new Map();
+    if (this.postings.has(token)) matches.set(token, EXACT_MATCH);
+
+    if (prefix && token.length >= MIN_PREFIX_LENGTH) {
+      let expansions = 0;
+      for (const term of this.prefixes.get(token.slice(0, MIN_PREFIX_LENGTH)) || []) {
+        if (expansions >= MAX_PREFIX_EXPANSIONS) break;
+        if (term !== token && term.startsWith(token)) {
+          matches.set(term, PREFIX_MATCH);
+          expansions++;
+        }
+      }
+    }
+
+    if (fuzzy && token.length >= MIN_FUZZY_LENGTH) {
+      const candidates = new Set(this.deletes.get(token) || []);
+      deletions(token).forEach(variant => {
+        if (this.postings.has(variant)) candidates.add(variant);
+        (this.deletes.get(variant) || []).forEach(term => candidates.add(term));
+      });
+
+      candidates.forEach(term => {
+        if (!matches.has(term) && editDistance(token, term, 1) <= 1) {
+          matches.set(term, FUZZY_MATCH);
+        }
+      });
+    }
+
+    return matches;
+  }
+
+  // Per-document scratch arrays, reused across queries. Search is
+  // synchronous, so one set per index is enough.
+  getScratch() {
+    const capacity = this.entries.length;
+    if (!this.scratch || this.scratch.total.length < capacity) {
+      const size = Math.max(1024, capacity * 2);
+      this.scratch = {
+        total: new Float64Array(size),
+        best: new Float64Array(size),
+        stage: new Uint8Array(size)
+      };
+    }
+    return this.scratch;
+  }
+
+  // Score documents for `query`. Every query token must match; a document's
+  // score sums, per token, its best weight * match factor * idf.
+  // filters: { facet: value } restrict results; facet counts are computed
+  // before each facet's own filter so a UI can show the alternatives.
+  search(query, { filters = {}, limit = 20, offset = 0, prefix = true, fuzzy = true } = {}) {
+    const tokens = [...new Set(tokenize(query))].slice(0, MAX_QUERY_TOKENS);
+    const activeFilters = Object.entries(filters)
+      .filter(([facet, value]) => this.facets.includes(facet) && value !== undefined && value !== null && value !== '')
+      .map(([facet, value]) => [facet, String(value)]);
+
+    const facetCounts = Object.fromEntries(this.facets.map(facet => [facet, {}]));
+    const empty = { total: 0, results: [], facets: facetCounts };
+    if (tokens.length === 0) return empty;
+
+    // Each token becomes a list of (posting, factor * idf); rarest first so
+    // the candidate set shrinks as early as possible
+    const totalDocs = Math.max(this.size, 1);
+    const steps = tokens.map(token => {
+      const terms = [];
+      let size = 0;
+      this.expand(token, { prefix, fuzzy }).forEach((factor, term) => {
+        const posting = this.postings.get(term);
+        terms.push({ posting, factor: factor * Math.log(1 + totalDocs / posting.size) });
+        size += posting.size;
+      });
+      return { terms, size };
+    });
+    if (steps.some(step => step.size === 0)) return empty;
+    steps.sort((a, b) => a.size - b.size);
+
+    // stage[doc] === n means the doc matched the first n tokens
+    const { total: scores, best, stage } = this.getScratch();
+    let survivors = [];
+
+    steps.forEach(({ terms, size }, step) => {
+      const next = [];
+
+      if (step > 0 && survivors.length * terms.length < size) {
+        // Few candidates left: probe the postings for each of them
+        survivors.forEach(doc => {
+          let value = 0;
+          terms.forEach(({ posting, factor }) => {
+            const weight = posting.get(doc);
+            if (weight !== undefined && weight * factor > value) value = weight * factor;
+          });
+
+          if (value > 0) {
+            scores[doc] += value;
+            stage[doc] = step + 1;
+            next.push(doc);
+          } else {
+            scores[doc] = 0;
+            stage[doc] = 0;
+          }
+        });
+      } else {
+        // Walk the postings, keeping docs that matched every earlier token
+        terms.forEach(({ posting, factor }) => {
+          for (const [doc, weight] of posting) {
+            if (stage[doc] !== step) continue;
+            if (best[doc] === 0) next.push(doc);
+            if (weight * factor > best[doc]) best[doc] = weight * factor;
+          }
+        });
+
+        next.forEach(doc => {
+          scores[doc] += best[doc];
+          best[doc] = 0;
+          stage[doc] = step + 1;
+        });
+        survivors.forEach(doc => {
+          if (stage[doc] === step) {
+            scores[doc] = 0;
+            stage[doc] = 0;
+          }
+        });
+      }
+
+      survivors = next;
+    });
+
+    const top = new TopK(offset + limit, byScore);
+    let total = 0;
+
+    survivors.forEach(doc => {
+      const score = scores[doc];
+      scores[doc] = 0;
+      stage[doc] = 0;
+
+      const { key, facets, rank } = this.entries[doc];
+      let failures = 0;
+      let failedFacet = null;
+      for (const [facet, value] of activeFilters) {
+        if (facets[facet] !== value) {
+          failures++;
+          failedFacet = facet;
+          if (failures > 1) break;
+        }
+      }
+
+      // A doc failing exactly one filter still counts toward that facet
+      if (failures <= 1) {
+        this.facets.forEach(facet => {
+          const value = facets[facet];
+          if (value === undefined || (failures === 1 && facet !== failedFacet)) return;
+          facetCounts[facet][value] = (facetCounts[facet][value] || 0) + 1;
+        });
+      }
+
+      if (failures === 0) {
+        total++;
+        top.offer({ id: key, score, rank });
+      }
+    });
+
+    return {
+      total,
+      results: top.sorted().slice(offset).map(({ id, score }) => ({ id, score })),
+      facets: facetCounts
+    };
+  }
+}
+
+export default SearchIndex;
@@ -0,0 +1,24 @@
+import LRUCache from './lruCache.js';
+
+// Authenticated users keyed by id, so `protect` costs a Map lookup instead of
+// a Mongo round-trip. Entries are dropped whenever the user document is
+// written (see hooks in models/User.js); the TTL bounds staleness for writes
+// made by other processes.
+export const userCache = new LRUCache({
+  max: parseInt(process.env.USER_CACHE_MAX, 10) || 10000,
+  ttl: parseInt(process.env.USER_CACHE_TTL_MS, 10) || 60 * 1000
+});
+
+export const invalidateCachedUser = (id) => {
+  if (id === undefined || id === null) return;
+
+  // Query filters may carry operators ({ $in: [...] }); drop everything then
+  if (typeof id === 'object' && !id._bsontype) {
+    userCache.clear();
+    return;
+  }
+
+  userCache.delete(String(id));
+};
+
+export const getUserCacheStats = () => userCache.stats();
@@ -4,16 +4,235 @@ UrbanEos AI Backend CRUD Testing Suite
 Tests all Plant and Task CRUD operations with JWT authentication
 """
 
-import requests
+import argparse
+import csv
 import json
+import math
+import os
+import random
+import re
+import sys
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+import requests
+
+DEFAULT_BASE_URL = "http://localhost:5000/api"
+
+# Mongo ObjectIds in a path segment, collapsed so latencies group by route
+OBJECT_ID_PATTERN = re.compile(r"/[0-9a-fA-F]{24}(?=/|$)")
+
+
+def endpoint_template(method: str, endpoint: str) -> str:
+    """Route template for an endpoint, e.g. 'GET /plants/:id'"""
+    path = endpoint.split("?", 1)[0]
+    return f"{method.upper()} {OBJECT_ID_PATTERN.sub('/:id', path)}"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list of samples"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def linear_fit(xs: List[float], ys: List[float]) -> tuple:
+    """Least-squares slope, intercept and R² of ys over xs"""
+    n = len(xs)
+    if n < 2:
+        return 0.0, ys[0] if ys else 0.0, 0.0
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return 0.0, mean_y, 0.0
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    slope = sxy / sxx
+    r2 = sxy * sxy / (sxx * syy) if syy > 0 else 0.0
+    return slope, mean_y - slope * mean_x, r2
+
+
+def parse_prometheus(text: str) -> Dict[str, float]:
+    """Samples from a Prometheus text exposition, keyed by 'name{labels}'"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        key, _, value = line.rpartition(" ")
+        try:
+            samples[key] = float(value)
+        except ValueError:
+            continue
+    return samples
+
+
+def read_proc_rss(pid: int) -> Optional[int]:
+    """Resident set size in bytes of a local process, from /proc"""
+    try:
+        with open(f"/proc/{pid}/status") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+RESULT_FIELDS = ["timestamp", "method", "endpoint", "route", "status",
+                 "latency_ms", "request_bytes", "response_bytes"]
+
+
+class LoadStats:
+    """Thread-safe log of every request made through make_request, summarized
+    as latency percentiles per route template"""
 
-class UrbanEosBackendTester:
     def __init__(self):
+        self._lock = threading.Lock()
+        self.records: List[Dict[str, Any]] = []
+        self.started = time.time()
+
+    def record(self, method: str, endpoint: str, status: int, latency_ms: float,
+               request_bytes: int, response_bytes: int):
+        entry = {
+            "timestamp": round(time.time(), 3),
+            "method": method.upper(),
+            "endpoint": endpoint,
+            "route": endpoint_template(method, endpoint),
+            "status": status,
+            "latency_ms": round(latency_ms, 3),
+            "request_bytes": request_bytes,
+            "response_bytes": response_bytes,
+        }
+        with self._lock:
+            self.records.append(entry)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.records)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Return and forget the records so far, so long runs don't grow without bound"""
+        with self._lock:
+            records, self.records = self.records, []
+            return records
+
+    def summary(self, elapsed: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Throughput and p50/p95/p99 latency (ms) per route"""
+        if elapsed is None:
+            elapsed = time.time() - self.started
+        return summarize_records(self.snapshot(), elapsed)
+
+    def write(self, path: str, meta: Optional[Dict[str, Any]] = None):
+        """Write raw records to a .csv file, or records plus summary to JSON"""
+        records = self.snapshot()
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="") as handle:
+                writer = csv.DictWriter(handle, fieldnames=RESULT_FIELDS)
+                writer.writeheader()
+                writer.writerows(records)
+            return
+
+        elapsed = time.time() - self.started
+        with open(path, "w") as handle:
+            json.dump({
+                "meta": {
+                    "started": datetime.fromtimestamp(self.started).isoformat(),
+                    "elapsed": round(elapsed, 3),
+                    **(meta or {})
+                },
+                "summary": summarize_records(records, elapsed),
+                "requests": records
+            }, handle, indent=2)
+
+
+def summarize_records(records: List[Dict[str, Any]], elapsed: float) -> Dict[str, Dict[str, float]]:
+    """Group request records by route and compute count, errors, rps and percentiles"""
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for entry in records:
+        route = entry["route"]
+        latencies.setdefault(route, []).append(float(entry["latency_ms"]))
+        status = int(entry["status"])
+        errors[route] = errors.get(route, 0) + (0 if 0 < status < 400 else 1)
+
+    summary = {}
+    for route, samples in sorted(latencies.items()):
+        summary[route] = {
+            "count": len(samples),
+            "errors": errors[route],
+            "rps": len(samples) / elapsed if elapsed > 0 else 0.0,
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+        }
+    return summary
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Read request records back from a results file written by LoadStats"""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as handle:
+            return list(csv.DictReader(handle))
+    with open(path) as handle:
+        return json.load(handle)["requests"]
+
+
+def compare_results(baseline_path: str, current_path: str, threshold: float = 20.0,
+                    min_delta_ms: float = 5.0) -> bool:
+    """Diff per-route p95 latency against a baseline; False if any route regressed.
+
+    A route regresses when its p95 grows by more than `threshold` percent and
+    by more than `min_delta_ms`, so sub-millisecond jitter on fast routes is ignored.
+    """
+    baseline = summarize_records(load_records(baseline_path), 1.0)
+    current = summarize_records(load_records(current_path), 1.0)
+
+    print("📊 Comparing p95 latency")
+    print(f"   Baseline: {baseline_path}")
+    print(f"   Current:  {current_path}")
+    print(f"   Threshold: +{threshold:.0f}% and +{min_delta_ms:.0f}ms")
+    print("=" * 60)
+    print(f"{'Route':<26}{'Base p95':>11}{'Curr p95':>11}{'Change':>9}")
+
+    regressions = []
+    for route in sorted(set(baseline) | set(current)):
+        if route not in current:
+            print(f"{route:<26}{baseline[route]['p95']:>9.1f}ms{'-':>11}{'missing':>9}")
+            continue
+        if route not in baseline:
+            print(f"{route:<26}{'-':>11}{current[route]['p95']:>9.1f}ms{'new':>9}")
+            continue
+
+        base_p95 = baseline[route]["p95"]
+        curr_p95 = current[route]["p95"]
+        change = (curr_p95 - base_p95) / base_p95 * 100 if base_p95 > 0 else 0.0
+        regressed = change > threshold and curr_p95 - base_p95 > min_delta_ms
+        marker = " ❌" if regressed else ""
+        print(f"{route:<26}{base_p95:>9.1f}ms{curr_p95:>9.1f}ms{change:>+8.1f}%{marker}")
+        if regressed:
+            regressions.append(route)
+
+    if regressions:
+        print(f"\n❌ p95 regression on {len(regressions)} route(s): {', '.join(regressions)}")
+        return False
+
+    print("\n✅ No p95 regressions past threshold")
+    return True
+
+
+class UrbanEosBackendTester:
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, email: Optional[str] = None,
+                 verbose: bool = True, stats: Optional[LoadStats] = None):
         # Use the local backend URL since external URL returns 502
-        self.base_url = "http://localhost:5000/api"
+        self.base_url = base_url
+        self.verbose = verbose
+        self.stats = stats or LoadStats()
         self.token = None
         self.user_id = None
         self.test_plants = []
@@ -23,7 +242,7 @@ class UrbanEosBackendTester:
         # Test data
         self.test_user = {
             "fullName": "Garden Tester",
-            "email": f"tester_{int(time.time())}@urbaneos.com",
+            "email": email or f"tester_{int(time.time())}@urbaneos.com",
             "password": "testpass123",
             "location": {
                 "city": "Dhaka",
@@ -37,10 +256,83 @@ class UrbanEosBackendTester:
             "plants": ["Tomato", "Mint"]
         }
         
-        print(f"🧪 UrbanEos Backend Tester Initialized")
-        print(f"🌐 Backend URL: {self.base_url}")
-        print(f"👤 Test User: {self.test_user['email']}")
-        print("=" * 60)
+        if verbose:
+            print(f"🧪 UrbanEos Backend Tester Initialized")
+            print(f"🌐 Backend URL: {self.base_url}")
+            print(f"👤 Test User: {self.test_user['email']}")
+            print("=" * 60)
+
+    def build_plant_payloads(self) -> List[Dict[str, Any]]:
+        """Plant payloads shared by the CRUD tests and the load generator"""
+        return [
+            {
+                "name": "Cherry Tomato",
+                "type": "Vegetable",
+                "variety": "Cherry",
+                "status": "healthy",
+                "location": "Rooftop Garden",
+                "expectedHarvestDate": (datetime.now() + timedelta(days=60)).isoformat()
+            },
+            {
+                "name": "Basil Plant",
+                "type": "Herb",
+                "variety": "Sweet Basil",
+                "status": "healthy",
+                "location": "Kitchen Window"
+            },
+            {
+                "name": "Rose Bush",
+                "type": "Flower",
+                "variety": "Red Rose",
+                "status": "attention",
+                "location": "Front Garden"
+            }
+        ]
+
+    def build_task_payloads(self, plant_ids: List[str]) -> List[Dict[str, Any]]:
+        """Task payloads for the given plants, shared by the CRUD tests and the load generator"""
+        return [
+            {
+                "plant": plant_ids[0] if plant_ids else None,
+                "plantName": "Cherry Tomato",
+                "task": "Water the tomato plant",
+                "taskType": "watering",
+                "priority": "high",
+                "status": "pending",
+                "dueDate": datetime.now().isoformat(),
+                "time": "Morning",
+                "notes": "Check soil moisture first"
+            },
+            {
+                "plant": plant_ids[1] if len(plant_ids) > 1 else None,
+                "plantName": "Basil Plant",
+                "task": "Fertilize basil with organic fertilizer",
+                "taskType": "fertilizing",
+                "priority": "medium",
+                "status": "pending",
+                "dueDate": (datetime.now() + timedelta(days=1)).isoformat(),
+                "time": "Afternoon"
+            },
+            {
+                "plantName": "Rose Bush",
+                "task": "Prune dead flowers",
+                "taskType": "pruning",
+                "priority": "low",
+                "status": "pending",
+                "dueDate": (datetime.now() + timedelta(days=2)).isoformat(),
+                "time": "Evening"
+            },
+            {
+                "plantName": "General Garden",
+                "task": "Check for pests",
+                "taskType": "pest-control",
+                "priority": "high",
+                "status": "completed",
+                "dueDate": (datetime.now() - timedelta(days=1)).isoformat(),
+                "time": "Anytime",
+                "completedAt": datetime.now().isoformat()
+            }
+        ]
 
     def make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, 
                     headers: Optional[Dict] = None) -> requests.Response:
@@ -61,6 +353,8 @@ class UrbanEosBackendTester:
         if headers:
             default_headers.update(headers)
             
+        request_bytes = len(json.dumps(data).encode()) if data is not None else 0
+        started = time.perf_counter()
         try:
             if method.upper() == "GET":
                 response = self.session.get(url, headers=default_headers, timeout=30)
@@ -73,9 +367,15 @@ class UrbanEosBackendTester:
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
                 
+            self.stats.record(method, endpoint, response.status_code,
+                             (time.perf_counter() - started) * 1000,
+                             request_bytes, len(response.content))
             return response
         except requests.exceptions.RequestException as e:
-            print(f"❌ Request failed: {e}")
+            self.stats.record(method, endpoint, 0, (time.perf_counter() - started) * 1000,
+                             request_bytes, 0)
+            if self.verbose:
+                print(f"❌ Request failed: {e}")
             raise
 
     def test_health_check(self) -> bool:
@@ -200,33 +500,7 @@ class UrbanEosBackendTester:
         
         # Test 1: Create plants
         print("\n  📝 Creating test plants...")
-        plant_data_list = [
-            {
-                "name": "Cherry Tomato",
-                "type": "Vegetable",
-                "variety": "Cherry",
-                "health": 95,
-                "status": "healthy",
-                "location": "Rooftop Garden",
-                "expectedHarvestDate": (datetime.now() + timedelta(days=60)).isoformat()
-            },
-            {
-                "name": "Basil Plant",
-                "type": "Herb",
-                "variety": "Sweet Basil",
-                "health": 88,
-                "status": "healthy",
-                "location": "Kitchen Window"
-            },
-            {
-                "name": "Rose Bush",
-                "type": "Flower",
-                "variety": "Red Rose",
-                "health": 92,
-                "status": "attention",
-                "location": "Front Garden"
-            }
-        ]
+        plant_data_list = self.build_plant_payloads()
         
         for i, plant_data in enumerate(plant_data_list):
             try:
@@ -299,7 +573,6 @@ class UrbanEosBackendTester:
             try:
                 plant_id = self.test_plants[0]
                 update_data = {
-                    "health": 85,
                     "status": "attention",
                     "location": "Updated Location"
                 }
@@ -308,7 +581,8 @@ class UrbanEosBackendTester:
                     data = response.json()
                     if data.get('success') and data.get('plant'):
                         updated_plant = data['plant']
-                        if (updated_plant['health'] == 85 and 
+                        # health is derived by the server, never taken from the request
+                        if (0 <= updated_plant['health'] <= 100 and
                             updated_plant['status'] == 'attention' and
                             updated_plant['location'] == 'Updated Location'):
                             print(f"    ✅ Plant updated successfully")
@@ -334,13 +608,12 @@ class UrbanEosBackendTester:
                 response = self.make_request("POST", f"/plants/{plant_id}/notes", note_data)
                 if response.status_code == 200:
                     data = response.json()
-                    if data.get('success') and data.get('plant'):
-                        notes = data['plant'].get('notes', [])
-                        if notes and len(notes) > 0:
-                            print(f"    ✅ Note added successfully ({len(notes)} total notes)")
+                    if data.get('success') and data.get('note'):
+                        if data['note'].get('content') == note_data['content']:
+                            print(f"    ✅ Note added successfully (ID: {data['note']['_id']})")
                             success_count += 1
                         else:
-                            print(f"    ❌ Note not found in plant data")
+                            print(f"    ❌ Note content not reflected correctly")
                     else:
                         print(f"    ❌ Invalid add note response: {data}")
                 else:
@@ -368,8 +641,8 @@ class UrbanEosBackendTester:
                 response = self.make_request("PUT", f"/plants/{plant_id}/care", care_data)
                 if response.status_code == 200:
                     data = response.json()
-                    if data.get('success') and data.get('plant'):
-                        care_schedule = data['plant'].get('careSchedule', {})
+                    if data.get('success') and data.get('careSchedule'):
+                        care_schedule = data['careSchedule']
                         if (care_schedule.get('watering', {}).get('frequency') == "Every 2 days" and
                             care_schedule.get('fertilizing', {}).get('frequency') == "Weekly"):
                             print(f"    ✅ Care schedule updated successfully")
@@ -398,13 +671,12 @@ class UrbanEosBackendTester:
                 response = self.make_request("POST", f"/plants/{plant_id}/harvest", harvest_data)
                 if response.status_code == 200:
                     data = response.json()
-                    if data.get('success') and data.get('plant'):
-                        harvest_log = data['plant'].get('harvestLog', [])
-                        if harvest_log and len(harvest_log) > 0:
-                            print(f"    ✅ Harvest log added successfully ({len(harvest_log)} entries)")
+                    if data.get('success') and data.get('harvest'):
+                        if data['harvest'].get('quantity') == harvest_data['quantity']:
+                            print(f"    ✅ Harvest log added successfully (ID: {data['harvest']['_id']})")
                             success_count += 1
                         else:
-                            print(f"    ❌ Harvest log not found in plant data")
+                            print(f"    ❌ Harvest quantity not reflected correctly")
                     else:
                         print(f"    ❌ Invalid harvest log response: {data}")
                 else:
@@ -456,48 +728,7 @@ class UrbanEosBackendTester:
         
         # Test 1: Create tasks
         print("\n  📝 Creating test tasks...")
-        task_data_list = [
-            {
-                "plant": self.test_plants[0] if self.test_plants else None,
-                "plantName": "Cherry Tomato",
-                "task": "Water the tomato plant",
-                "taskType": "watering",
-                "priority": "high",
-                "status": "pending",
-                "dueDate": datetime.now().isoformat(),
-                "time": "Morning",
-                "notes": "Check soil moisture first"
-            },
-            {
-                "plant": self.test_plants[1] if len(self.test_plants) > 1 else None,
-                "plantName": "Basil Plant",
-                "task": "Fertilize basil with organic fertilizer",
-                "taskType": "fertilizing",
-                "priority": "medium",
-                "status": "pending",
-                "dueDate": (datetime.now() + timedelta(days=1)).isoformat(),
-                "time": "Afternoon"
-            },
-            {
-                "plantName": "Rose Bush",
-                "task": "Prune dead flowers",
-                "taskType": "pruning",
-                "priority": "low",
-                "status": "pending",
-                "dueDate": (datetime.now() + timedelta(days=2)).isoformat(),
-                "time": "Evening"
-            },
-            {
-                "plantName": "General Garden",
-                "task": "Check for pests",
-                "taskType": "pest-control",
-                "priority": "high",
-                "status": "completed",
-                "dueDate": (datetime.now() - timedelta(days=1)).isoformat(),
-                "time": "Anytime",
-                "completedAt": datetime.now().isoformat()
-            }
-        ]
+        task_data_list = self.build_task_payloads(self.test_plants)
         
         for i, task_data in enumerate(task_data_list):
             try:
@@ -777,6 +1008,597 @@ class UrbanEosBackendTester:
         
         return results
 
+class LoadGenerator:
+    """Drives N simulated gardeners concurrently against the plant and task API"""
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, gardeners: int = 20,
+                 iterations: int = 10, duration: Optional[float] = None,
+                 ramp_up: float = 0.0):
+        self.base_url = base_url
+        self.gardeners = gardeners
+        self.iterations = iterations
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.run_id = uuid.uuid4().hex[:8]
+        self.stats = LoadStats()
+        self.deadline = None
+
+    def _timed(self, tester: UrbanEosBackendTester, method: str, endpoint: str,
+               data: Optional[Dict] = None) -> Optional[requests.Response]:
+        """Issue one request through the gardener's session; failures are already recorded"""
+        try:
+            return tester.make_request(method, endpoint, data)
+        except requests.exceptions.RequestException:
+            return None
+
+    def _keep_going(self, iteration: int) -> bool:
+        if self.deadline is not None:
+            return time.monotonic() < self.deadline
+        return iteration < self.iterations
+
+    def _gardener(self, index: int) -> int:
+        """One simulated gardener: register, then loop through a typical session"""
+        if self.ramp_up and self.gardeners > 1:
+            time.sleep(self.ramp_up * index / self.gardeners)
+
+        tester = UrbanEosBackendTester(
+            self.base_url,
+            email=f"load_{self.run_id}_{index}@urbaneos.com",
+            verbose=False,
+            stats=self.stats
+        )
+        response = self._timed(tester, "POST", "/auth/register", tester.test_user)
+        if response is None or response.status_code != 201:
+            return 0
+        tester.token = response.json()['data']['token']
+
+        plant_payloads = tester.build_plant_payloads()
+        iteration = 0
+        while self._keep_going(iteration):
+            self._timed(tester, "GET", "/plants")
+
+            plant_data = plant_payloads[iteration % len(plant_payloads)]
+            response = self._timed(tester, "POST", "/plants", plant_data)
+            plant_id = None
+            if response is not None and response.status_code == 201:
+                plant_id = response.json()['plant']['_id']
+                self._timed(tester, "GET", f"/plants/{plant_id}")
+
+            task_payloads = tester.build_task_payloads([plant_id] if plant_id else [])
+            task_data = task_payloads[iteration % len(task_payloads)]
+            response = self._timed(tester, "POST", "/tasks", task_data)
+
+            self._timed(tester, "GET", "/tasks")
+            self._timed(tester, "GET", "/tasks?status=pending")
+
+            if response is not None and response.status_code == 201:
+                task_id = response.json()['task']['_id']
+                self._timed(tester, "PUT", f"/tasks/{task_id}", {"status": "completed"})
+                self._timed(tester, "GET", f"/tasks/{task_id}")
+
+            iteration += 1
+
+        return iteration
+
+    def run(self) -> Dict[str, Dict[str, float]]:
+        """Run all gardeners to completion and print the latency report"""
+        print("🚜 Starting UrbanEos Load Test")
+        print(f"🌐 Backend URL: {self.base_url}")
+        if self.duration:
+            print(f"👥 {self.gardeners} gardeners for {self.duration:.0f}s")
+        else:
+            print(f"👥 {self.gardeners} gardeners x {self.iterations} iterations")
+        print("=" * 60)
+
+        started = time.perf_counter()
+        self.stats.started = time.time()
+        if self.duration:
+            self.deadline = time.monotonic() + self.ramp_up + self.duration
+
+        with ThreadPoolExecutor(max_workers=self.gardeners) as pool:
+            sessions = sum(pool.map(self._gardener, range(self.gardeners)))
+
+        elapsed = time.perf_counter() - started
+        summary = self.stats.summary(elapsed)
+        self.print_report(summary, elapsed, sessions)
+        return summary
+
+    def print_report(self, summary: Dict[str, Dict[str, float]], elapsed: float,
+                     sessions: int):
+        total = sum(route["count"] for route in summary.values())
+        errors = sum(route["errors"] for route in summary.values())
+
+        print("\n" + "=" * 60)
+        print("🏁 LOAD TEST SUMMARY")
+        print("=" * 60)
+        print(f"{'Route':<26}{'Count':>7}{'Err':>6}{'RPS':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for route, row in summary.items():
+            print(f"{route:<26}{row['count']:>7}{row['errors']:>6}{row['rps']:>8.1f}"
+                  f"{row['p50']:>7.1f}ms{row['p95']:>7.1f}ms{row['p99']:>7.1f}ms")
+
+        print(f"\nCompleted {sessions} gardener sessions in {elapsed:.1f}s")
+        print(f"Throughput: {total / elapsed if elapsed > 0 else 0:.1f} req/s "
+              f"({total} requests, {errors} errors)")
+
+
+class LoginFloodBenchmark:
+    """Floods /auth/login while probing unrelated routes to expose event-loop stalls"""
+
+    PROBE_ROUTES = ["GET /health", "GET /plants"]
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, flooders: int = 20,
+                 probes: int = 4, duration: float = 30.0):
+        self.base_url = base_url
+        self.flooders = flooders
+        self.probes = probes
+        self.duration = duration
+        self.run_id = uuid.uuid4().hex[:8]
+
+    def _until(self, deadline: float, tester: UrbanEosBackendTester, calls: List[tuple]):
+        """Repeat the given (method, endpoint, data) calls until the deadline"""
+        while time.monotonic() < deadline:
+            for method, endpoint, data in calls:
+                try:
+                    tester.make_request(method, endpoint, data)
+                except requests.exceptions.RequestException:
+                    pass
+
+    def _phase(self, account: UrbanEosBackendTester, flooders: int) -> LoadStats:
+        """Run probes (and optionally flooders) for one measurement window"""
+        stats = LoadStats()
+        credentials = {"email": account.test_user["email"], "password": account.test_user["password"]}
+        deadline = time.monotonic() + self.duration
+
+        def client() -> UrbanEosBackendTester:
+            tester = UrbanEosBackendTester(self.base_url, email=credentials["email"],
+                                           verbose=False, stats=stats)
+            tester.token = account.token
+            return tester
+
+        probe_calls = [("GET", "/health", None), ("GET", "/plants", None)]
+        login_calls = [("POST", "/auth/login", credentials)]
+
+        with ThreadPoolExecutor(max_workers=self.probes + flooders) as pool:
+            jobs = [pool.submit(self._until, deadline, client(), probe_calls)
+                    for _ in range(self.probes)]
+            jobs += [pool.submit(self._until, deadline, client(), login_calls)
+                     for _ in range(flooders)]
+            for job in jobs:
+                job.result()
+
+        return stats
+
+    def run(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        print("🔐 Starting UrbanEos Login Flood Benchmark")
+        print(f"🌐 Backend URL: {self.base_url}")
+        print(f"👥 {self.flooders} login flooders, {self.probes} probes, {self.duration:.0f}s per phase")
+        print("=" * 60)
+
+        account = UrbanEosBackendTester(self.base_url, email=f"flood_{self.run_id}@urbaneos.com",
+                                        verbose=False)
+        if not account.test_user_registration():
+            print("❌ Could not register the benchmark account")
+            return {}
+
+        print("\n  📏 Phase 1: probes only (baseline)...")
+        quiet = self._phase(account, 0).summary(self.duration)
+        print("  🌊 Phase 2: probes during login flood...")
+        flood = self._phase(account, self.flooders).summary(self.duration)
+
+        print("\n" + "=" * 60)
+        print("🏁 LOGIN FLOOD SUMMARY")
+        print("=" * 60)
+        login = flood.get("POST /auth/login")
+        if login:
+            print(f"Login throughput: {login['rps']:.1f}/s "
+                  f"(p50 {login['p50']:.1f}ms, p99 {login['p99']:.1f}ms, {login['errors']} errors)")
+
+        print(f"\n{'Probe route':<20}{'Quiet p50':>11}{'Quiet p99':>11}{'Flood p50':>11}{'Flood p99':>11}")
+        for route in self.PROBE_ROUTES:
+            before, during = quiet.get(route), flood.get(route)
+            if not before or not during:
+                continue
+            print(f"{route:<20}{before['p50']:>9.1f}ms{before['p99']:>9.1f}ms"
+                  f"{during['p50']:>9.1f}ms{during['p99']:>9.1f}ms")
+
+        return {"quiet": quiet, "flood": flood}
+
+
+# Scenario weights for --soak; override with --mix browse=50,login=10
+SOAK_MIX = {"browse": 40, "tasks": 20, "plant": 15, "task": 20, "login": 5}
+
+TIMESERIES_FIELDS = ["elapsed_s", "timestamp", "requests", "errors", "rps", "p50", "p95", "p99",
+                     "rss_mb", "heap_used_mb", "heap_total_mb", "external_mb", "eventloop_p99_ms",
+                     "behind"]
+
+MB = 1024 * 1024
+
+
+class SoakTest:
+    """Runs a weighted mix of plant/task/auth scenarios at a steady rate for a
+    long time, sampling server memory and rolling latency to catch leaks and
+    slow degradation"""
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, clients: int = 8, rate: float = 5.0,
+                 duration: float = 3600.0, sample_interval: float = 30.0,
+                 mix: Optional[Dict[str, float]] = None, pid: Optional[int] = None,
+                 metrics_url: Optional[str] = None, metrics_token: Optional[str] = None,
+                 timeseries_path: Optional[str] = None, warmup: Optional[float] = None,
+                 leak_threshold: float = 10.0, drift_threshold: float = 10.0):
+        self.base_url = base_url
+        self.clients = clients
+        self.rate = rate
+        self.duration = duration
+        self.sample_interval = sample_interval
+        self.mix = mix or SOAK_MIX
+        self.pid = pid
+        self.metrics_url = metrics_url if metrics_url is not None else f"{base_url}/metrics"
+        self.metrics_token = metrics_token
+        self.run_id = uuid.uuid4().hex[:8]
+        self.timeseries_path = timeseries_path or f"soak_{self.run_id}.csv"
+        # Memory and latency settle after startup (JIT, caches, pools)
+        self.warmup = warmup if warmup is not None else min(600.0, duration * 0.1)
+        self.leak_threshold = leak_threshold
+        self.drift_threshold = drift_threshold
+        self.stats = LoadStats()
+        self.samples: List[Dict[str, Any]] = []
+        self.stop = threading.Event()
+        self._behind = 0
+        self._behind_lock = threading.Lock()
+        self._metrics_warned = False
+
+    def _timed(self, tester: UrbanEosBackendTester, method: str, endpoint: str,
+               data: Optional[Dict] = None) -> Optional[requests.Response]:
+        try:
+            return tester.make_request(method, endpoint, data)
+        except requests.exceptions.RequestException:
+            return None
+
+    # Scenarios. Anything created is deleted again so the data set stays the
+    # same size and only the server's own state can grow.
+    def _browse(self, tester: UrbanEosBackendTester, plant_id: str):
+        self._timed(tester, "GET", "/plants")
+        self._timed(tester, "GET", f"/plants/{plant_id}")
+
+    def _tasks(self, tester: UrbanEosBackendTester, plant_id: str):
+        self._timed(tester, "GET", "/tasks")
+        self._timed(tester, "GET", "/tasks?status=pending")
+
+    def _plant(self, tester: UrbanEosBackendTester, plant_id: str):
+        payloads = tester.build_plant_payloads()
+        response = self._timed(tester, "POST", "/plants", random.choice(payloads))
+        if response is not None and response.status_code == 201:
+            new_id = response.json()['plant']['_id']
+            self._timed(tester, "GET", f"/plants/{new_id}")
+            self._timed(tester, "DELETE", f"/plants/{new_id}")
+
+    def _task(self, tester: UrbanEosBackendTester, plant_id: str):
+        payload = tester.build_task_payloads([plant_id])[0]
+        response = self._timed(tester, "POST", "/tasks", payload)
+        if response is not None and response.status_code == 201:
+            task_id = response.json()['task']['_id']
+            self._timed(tester, "PUT", f"/tasks/{task_id}", {"status": "completed"})
+            self._timed(tester, "GET", f"/tasks/{task_id}")
+            self._timed(tester, "DELETE", f"/tasks/{task_id}")
+
+    def _login(self, tester: UrbanEosBackendTester, plant_id: str):
+        credentials = {"email": tester.test_user["email"], "password": tester.test_user["password"]}
+        response = self._timed(tester, "POST", "/auth/login", credentials)
+        if response is not None and response.status_code == 200:
+            tester.token = response.json()['data']['token']
+
+    def _client(self, index: int):
+        """One account issuing scenarios on a fixed schedule until stopped"""
+        tester = UrbanEosBackendTester(self.base_url, email=f"soak_{self.run_id}_{index}@urbaneos.com",
+                                       verbose=False, stats=self.stats)
+        response = self._timed(tester, "POST", "/auth/register", tester.test_user)
+        if response is None or response.status_code != 201:
+            return
+        tester.token = response.json()['data']['token']
+        response = self._timed(tester, "POST", "/plants", tester.build_plant_payloads()[0])
+        if response is None or response.status_code != 201:
+            return
+        plant_id = response.json()['plant']['_id']
+
+        scenarios = {"browse": self._browse, "tasks": self._tasks, "plant": self._plant,
+                     "task": self._task, "login": self._login}
+        names = [name for name in self.mix if name in scenarios]
+        weights = [self.mix[name] for name in names]
+        rng = random.Random(index)
+        interval = self.clients / self.rate
+        # Spread clients over the first interval instead of firing together
+        next_at = time.monotonic() + interval * index / self.clients
+
+        while not self.stop.is_set():
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                if self.stop.wait(delay):
+                    break
+            elif delay < -interval:
+                # Can't keep up; count it and skip ahead rather than burst
+                with self._behind_lock:
+                    self._behind += 1
+                next_at = time.monotonic()
+            scenarios[rng.choices(names, weights)[0]](tester, plant_id)
+            next_at += interval
+
+        self._timed(tester, "DELETE", f"/plants/{plant_id}")
+
+    def _memory(self) -> Dict[str, Optional[float]]:
+        """Server memory in MB from /proc (--pid) and/or the metrics endpoint"""
+        sample = {"rss_mb": None, "heap_used_mb": None, "heap_total_mb": None,
+                  "external_mb": None, "eventloop_p99_ms": None}
+        if self.metrics_url:
+            headers = {"Authorization": f"Bearer {self.metrics_token}"} if self.metrics_token else {}
+            try:
+                response = requests.get(self.metrics_url, headers=headers, timeout=10)
+                response.raise_for_status()
+                metrics = parse_prometheus(response.text)
+                for field, kind in [("rss_mb", "rss"), ("heap_used_mb", "heapUsed"),
+                                    ("heap_total_mb", "heapTotal"), ("external_mb", "external")]:
+                    value = metrics.get(f'nodejs_memory_bytes{{type="{kind}"}}')
+                    sample[field] = round(value / MB, 2) if value is not None else None
+                lag = metrics.get('nodejs_eventloop_lag_seconds{quantile="0.99"}')
+                sample["eventloop_p99_ms"] = round(lag * 1000, 2) if lag is not None else None
+            except (requests.exceptions.RequestException, ValueError) as e:
+                if not self._metrics_warned:
+                    print(f"  ⚠️  Metrics unavailable ({e}); memory comes from --pid only")
+                    self._metrics_warned = True
+        if self.pid:
+            rss = read_proc_rss(self.pid)
+            if rss is not None:
+                sample["rss_mb"] = round(rss / MB, 2)
+        return sample
+
+    def _sample(self, started: float, writer: csv.DictWriter, handle):
+        records = self.stats.drain()
+        window = max(time.time() - (self.samples[-1]["timestamp"] if self.samples else started), 1e-9)
+        latencies = [float(entry["latency_ms"]) for entry in records]
+        errors = sum(1 for entry in records if not 0 < int(entry["status"]) < 400)
+        with self._behind_lock:
+            behind, self._behind = self._behind, 0
+
+        row = {
+            "elapsed_s": round(time.time() - started, 1),
+            "timestamp": round(time.time(), 3),
+            "requests": len(records),
+            "errors": errors,
+            "rps": round(len(records) / window, 2),
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            **self._memory(),
+            "behind": behind
+        }
+        self.samples.append(row)
+        writer.writerow(row)
+        handle.flush()
+
+        memory = f"rss {row['rss_mb']}MB heap {row['heap_used_mb']}MB" if row["rss_mb"] is not None else "memory n/a"
+        print(f"  ⏱️  {row['elapsed_s'] / 60:>6.1f}m  {row['rps']:>6.1f} req/s  "
+              f"p50 {row['p50']:.1f}ms p95 {row['p95']:.1f}ms  {errors} errors  {memory}")
+
+    def _trend(self, field: str) -> Optional[Dict[str, float]]:
+        """Per-hour slope of one series over the samples after warm-up"""
+        points = [(row["elapsed_s"] / 3600, float(row[field])) for row in self.samples
+                  if row["elapsed_s"] >= self.warmup and row[field] is not None and row["requests"]]
+        if len(points) < 3:
+            return None
+        xs, ys = [x for x, _ in points], [y for _, y in points]
+        slope, intercept, r2 = linear_fit(xs, ys)
+        start = intercept + slope * xs[0]
+        return {
+            "slope_per_hour": slope,
+            "r2": r2,
+            "start": start,
+            "end": intercept + slope * xs[-1],
+            "percent_per_hour": slope / start * 100 if start > 0 else 0.0
+        }
+
+    def analyze(self) -> Dict[str, Any]:
+        """Leak and drift verdicts from the trend of each series.
+
+        Memory leaks when it grows by more than leak_threshold MB per hour
+        and the growth is steady (R² >= 0.5) rather than GC sawtooth.
+        Latency drifts when p95 grows by more than drift_threshold percent
+        per hour, again with R² >= 0.5.
+        """
+        findings = {}
+        for field in ["rss_mb", "heap_used_mb", "external_mb"]:
+            trend = self._trend(field)
+            if trend:
+                trend["flagged"] = trend["slope_per_hour"] > self.leak_threshold and trend["r2"] >= 0.5
+                findings[field] = trend
+        for field in ["p50", "p95", "p99", "eventloop_p99_ms"]:
+            trend = self._trend(field)
+            if trend:
+                trend["flagged"] = (field == "p95" and trend["percent_per_hour"] > self.drift_threshold
+                                    and trend["r2"] >= 0.5)
+                findings[field] = trend
+        return findings
+
+    def run(self) -> bool:
+        """Run the soak, print the verdict, and return False on a leak or drift"""
+        print("🧽 Starting UrbanEos Soak Test")
+        print(f"🌐 Backend URL: {self.base_url}")
+        print(f"👥 {self.clients} clients, {self.rate:.1f} scenarios/s for {self.duration / 60:.0f}m, "
+              f"sampling every {self.sample_interval:.0f}s (warm-up {self.warmup:.0f}s)")
+        print(f"🎲 Mix: {', '.join(f'{name}={weight:g}' for name, weight in self.mix.items())}")
+        print(f"📈 Time series: {os.path.abspath(self.timeseries_path)}")
+        print("=" * 60)
+
+        started = time.time()
+        self.stats.started = started
+        deadline = time.monotonic() + self.duration
+        with open(self.timeseries_path, "w", newline="") as handle, \
+                ThreadPoolExecutor(max_workers=self.clients) as pool:
+            writer = csv.DictWriter(handle, fieldnames=TIMESERIES_FIELDS)
+            writer.writeheader()
+            jobs = [pool.submit(self._client, index) for index in range(self.clients)]
+            try:
+                while time.monotonic() < deadline:
+                    time.sleep(min(self.sample_interval, max(0.0, deadline - time.monotonic())))
+                    self._sample(started, writer, handle)
+            except KeyboardInterrupt:
+                print("\n  ⏹️  Interrupted, analysing what was collected")
+            finally:
+                self.stop.set()
+                for job in jobs:
+                    job.result()
+
+        findings = self.analyze()
+        self.print_report(findings)
+        return not any(trend["flagged"] for trend in findings.values())
+
+    def print_report(self, findings: Dict[str, Dict[str, float]]):
+        units = {"rss_mb": "MB", "heap_used_mb": "MB", "external_mb": "MB",
+                 "p50": "ms", "p95": "ms", "p99": "ms", "eventloop_p99_ms": "ms"}
+        print("\n" + "=" * 60)
+        print("🏁 SOAK TEST SUMMARY")
+        print("=" * 60)
+        if not findings:
+            print("Not enough samples after warm-up to fit a trend")
+            return
+
+        print(f"{'Series':<18}{'Start':>10}{'End':>10}{'Per hour':>12}{'R²':>7}")
+        for field, trend in findings.items():
+            unit = units[field]
+            marker = " ❌" if trend["flagged"] else ""
+            print(f"{field:<18}{trend['start']:>8.1f}{unit}{trend['end']:>8.1f}{unit}"
+                  f"{trend['slope_per_hour']:>+10.2f}{unit}{trend['r2']:>7.2f}{marker}")
+
+        behind = sum(row["behind"] for row in self.samples)
+        if behind:
+            print(f"\n⚠️  Clients fell behind schedule {behind} times; add --gardeners or lower --rate")
+
+        leaks = [field for field in ("rss_mb", "heap_used_mb", "external_mb")
+                 if findings.get(field, {}).get("flagged")]
+        if leaks:
+            print(f"\n❌ Memory keeps growing: {', '.join(leaks)} (> {self.leak_threshold:g}MB/h)")
+        if findings.get("p95", {}).get("flagged"):
+            print(f"❌ p95 latency drifts {findings['p95']['percent_per_hour']:+.1f}%/h "
+                  f"(> {self.drift_threshold:g}%/h)")
+        if not leaks and not findings.get("p95", {}).get("flagged"):
+            print("\n✅ No memory growth or latency drift past threshold")
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse 'browse=40,login=5' into scenario weights"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SOAK_MIX:
+            raise argparse.ArgumentTypeError(f"unknown scenario '{name}' (use {', '.join(SOAK_MIX)})")
+        try:
+            mix[name.strip()] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad weight in '{part}'")
+    return mix
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="UrbanEos backend test and benchmark suite")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL,
+                        help="API base URL (default: %(default)s)")
+    parser.add_argument("--load", action="store_true",
+                        help="run the concurrent load test instead of the CRUD suite")
+    parser.add_argument("--gardeners", type=int, default=20,
+                        help="concurrent simulated gardeners in load mode")
+    parser.add_argument("--iterations", type=int, default=10,
+                        help="sessions per gardener in load mode")
+    parser.add_argument("--duration", type=float,
+                        help="run load mode for this many seconds instead of --iterations")
+    parser.add_argument("--ramp-up", type=float, default=0.0,
+                        help="seconds over which gardeners are started")
+    parser.add_argument("--login-flood", action="store_true",
+                        help="benchmark login throughput and unrelated-route latency under a login flood")
+    parser.add_argument("--flooders", type=int, default=20,
+                        help="concurrent login clients in --login-flood mode")
+    parser.add_argument("--probes", type=int, default=4,
+                        help="concurrent probe clients in --login-flood mode")
+    parser.add_argument("--soak", action="store_true",
+                        help="run a long steady-rate soak test and report memory growth and latency drift")
+    parser.add_argument("--rate", type=float, default=5.0,
+                        help="scenarios per second across all clients in --soak mode")
+    parser.add_argument("--mix", type=parse_mix,
+                        help="scenario weights for --soak, e.g. browse=40,tasks=20,plant=15,task=20,login=5")
+    parser.add_argument("--sample-interval", type=float, default=30.0,
+                        help="seconds between memory/latency samples in --soak mode")
+    parser.add_argument("--warmup", type=float,
+                        help="seconds of samples ignored by trend detection (default: 10%% of duration, max 600)")
+    parser.add_argument("--pid", type=int,
+                        help="local server PID whose RSS is read from /proc in --soak mode")
+    parser.add_argument("--metrics-url",
+                        help="metrics endpoint for heap samples (default: <base-url>/metrics; '' disables)")
+    parser.add_argument("--metrics-token", default=os.environ.get("METRICS_TOKEN"),
+                        help="bearer token for the metrics endpoint (default: $METRICS_TOKEN)")
+    parser.add_argument("--timeseries", metavar="PATH",
+                        help="CSV file for soak samples (default: soak_<run id>.csv)")
+    parser.add_argument("--leak-threshold", type=float, default=10.0,
+                        help="memory growth in MB/hour flagged as a leak (default: %(default)s)")
+    parser.add_argument("--drift-threshold", type=float, default=10.0,
+                        help="p95 growth in %%/hour flagged as drift (default: %(default)s)")
+    parser.add_argument("--results", metavar="PATH",
+                        help="write every timed request to a .json or .csv results file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two results files and exit non-zero on p95 regression")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="allowed p95 increase per route in percent (default: %(default)s)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0,
+                        help="ignore p95 increases smaller than this (default: %(default)s)")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    tester = UrbanEosBackendTester()
-    results = tester.run_all_tests()
\ No newline at end of file
+    args = parse_args()
+    if args.compare:
+        ok = compare_results(args.compare[0], args.compare[1], args.threshold, args.min_delta_ms)
+        sys.exit(0 if ok else 1)
+
+    if args.login_flood:
+        LoginFloodBenchmark(
+            base_url=args.base_url,
+            flooders=args.flooders,
+            probes=args.probes,
+            duration=args.duration or 30.0
+        ).run()
+        sys.exit(0)
+
+    if args.soak:
+        ok = SoakTest(
+            base_url=args.base_url,
+            clients=args.gardeners,
+            rate=args.rate,
+            duration=args.duration or 3600.0,
+            sample_interval=args.sample_interval,
+            mix=args.mix,
+            pid=args.pid,
+            metrics_url=args.metrics_url,
+            metrics_token=args.metrics_token,
+            timeseries_path=args.timeseries,
+            warmup=args.warmup,
+            leak_threshold=args.leak_threshold,
+            drift_threshold=args.drift_threshold
+        ).run()
+        sys.exit(0 if ok else 1)
+
+    if args.load:
+        generator = LoadGenerator(
+            base_url=args.base_url,
+            gardeners=args.gardeners,
+            iterations=args.iterations,
+            duration=args.duration,
+            ramp_up=args.ramp_up
+        )
+        generator.run()
+        stats = generator.stats
+        meta = {"mode": "load", "gardeners": args.gardeners, "base_url": args.base_url}
+    else:
+        tester = UrbanEosBackendTester(args.base_url)
+        results = tester.run_all_tests()
+        stats = tester.stats
+        meta = {"mode": "crud", "base_url": args.base_url, "results": results}
+
+    if args.results:
+        stats.write(args.results, meta)
+        print(f"\n💾 Results written to {os.path.abspath(args.results)}")
@@ -13,12 +13,11 @@ import {
   AlertTriangle,
   Loader2
 } from 'lucide-react';
-import { plantAPI, taskAPI } from '../../services/api';
+import { taskAPI, dashboardAPI } from '../../services/api';
 
 const Dashboard = () => {
   const navigate = useNavigate();
   const [tasks, setTasks] = useState([]);
-  const [plants, setPlants] = useState([]);
   const [loading, setLoading] = useState(true);
   const [stats, setStats] = useState({
     totalPlants: 0,
@@ -34,37 +33,19 @@ const Dashboard = () => {
     const fetchDashboardData = async () => {
       try {
         setLoading(true);
-        const [plantsRes, tasksRes] = await Promise.all([
-          plantAPI.getAll(),
-          taskAPI.getAll({ status: 'pending' })
-        ]);
+        const { data } = await dashboardAPI.getSummary();
+        const { plants, tasks, harvests } = data.summary;
 
-        const plantsData = plantsRes.data.plants || [];
-        const tasksData = tasksRes.data.tasks || [];
-
-        setPlants(plantsData);
-        setTasks(tasksData.slice(0, 5)); // Show only first 5 tasks
-
-        // Calculate statistics
-        const healthyPlants = plantsData.filter(p => p.status === 'healthy').length;
-        const avgHealth = plantsData.length > 0
-          ? Math.round(plantsData.reduce((sum, p) => sum + (p.health || 100), 0) / plantsData.length)
-          : 0;
-
-        // Get today's date in YYYY-MM-DD format
-        const today = new Date().toISOString().split('T')[0];
-        const todaysTasks = tasksData.filter(task => {
-          const taskDate = new Date(task.dueDate).toISOString().split('T')[0];
-          return taskDate === today;
-        });
+        // Overdue tasks first, then today's - show only the first 5
+        setTasks([...tasks.overdueList, ...tasks.todayList].slice(0, 5));
 
         setStats({
-          totalPlants: plantsData.length,
-          healthyPlants,
-          pendingTasks: tasksData.length,
-          todaysTasks: todaysTasks.length,
-          avgHealth,
-          nextHarvest: 0 // Can be calculated based on plant harvest dates if needed
+          totalPlants: plants.total,
+          healthyPlants: plants.byStatus.healthy || 0,
+          pendingTasks: tasks.pending,
+          todaysTasks: tasks.today,
+          avgHealth: plants.avgHealth,
+          nextHarvest: harvests.daysUntilNext ?? 0
         });
       } catch (error) {
         console.error('Failed to load dashboard data:', error);
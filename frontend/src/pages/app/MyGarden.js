@@ -15,8 +15,7 @@ const MyGarden = () => {
     const fetchPlants = async () => {
       try {
         setLoading(true);
-        const response = await plantAPI.getAll();
-        setPlants(response.data.plants || []);
+        setPlants(await plantAPI.listAll());
         setError(null);
       } catch (error) {
         console.error('Failed to load plants:', error);
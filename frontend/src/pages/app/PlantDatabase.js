@@ -127,7 +127,6 @@ const PlantDatabase = () => {
       id: Date.now(),
       name: selectedPlant.name,
       type: selectedPlant.type,
-      health: Math.floor(Math.random() * 20) + 80,
       status: 'healthy',
       image: selectedPlant.image || '🌱',
       daysGrowing: Math.floor(Math.random() * 30) + 1,
@@ -221,7 +220,6 @@ const PlantDatabase = () => {
         id: Date.now(),
         name: selectedPlant.name,
         type: selectedPlant.type,
-        health: Math.floor(Math.random() * 20) + 80,
         status: 'healthy',
         image: selectedPlant.image || '🌱',
         daysGrowing: 1,
@@ -22,12 +22,12 @@ const TaskManager = () => {
     const fetchData = async () => {
       try {
         setLoading(true);
-        const [tasksRes, plantsRes] = await Promise.all([
-          taskAPI.getAll(),
-          plantAPI.getAll()
+        const [allTasks, allPlants] = await Promise.all([
+          taskAPI.listAll(),
+          plantAPI.listAll()
         ]);
-        setTasks(tasksRes.data.tasks || []);
-        setPlants(plantsRes.data.plants || []);
+        setTasks(allTasks);
+        setPlants(allPlants);
       } catch (error) {
         console.error('Failed to load data:', error);
       } finally {
@@ -37,9 +37,23 @@ export const authAPI = {
   updateProfile: (data) => api.put('/auth/profile', data)
 };
 
+// List endpoints return one page at a time ({ <key>, nextCursor });
+// follow the cursors and return every item
+const fetchAllPages = async (path, key, params = {}) => {
+  const items = [];
+  let cursor;
+  do {
+    const response = await api.get(path, { params: { ...params, limit: 100, cursor } });
+    items.push(...(response.data[key] || []));
+    cursor = response.data.nextCursor;
+  } while (cursor);
+  return items;
+};
+
 // Plant API
 export const plantAPI = {
-  getAll: () => api.get('/plants'),
+  getAll: (params) => api.get('/plants', { params }),
+  listAll: (params) => fetchAllPages('/plants', 'plants', params),
   getById: (id) => api.get(`/plants/${id}`),
   create: (data) => api.post('/plants', data),
   update: (id, data) => api.put(`/plants/${id}`, data),
@@ -52,6 +66,7 @@ export const plantAPI = {
 // Task API
 export const taskAPI = {
   getAll: (params) => api.get('/tasks', { params }),
+  listAll: (params) => fetchAllPages('/tasks', 'tasks', params),
   getById: (id) => api.get(`/tasks/${id}`),
   create: (data) => api.post('/tasks', data),
   update: (id, data) => api.put(`/tasks/${id}`, data),
@@ -59,4 +74,9 @@ export const taskAPI = {
   getByDateRange: (startDate, endDate) => api.get('/tasks/range', { params: { startDate, endDate } })
 };
 
+// Dashboard API
+export const dashboardAPI = {
+  getSummary: () => api.get('/dashboard/summary')
+};
+
 export default api;
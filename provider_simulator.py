@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+"""
+UrbanEos External Provider Simulator
+Stands in for Plant.id, Hugging Face inference, OpenWeatherMap and Perenual
+so caching, queuing and failover can be tested and benchmarked offline.
+
+Each provider is served under its own path prefix with the request and
+response shapes the backend uses. Point the backend at it with:
+
+    PLANT_ID_BASE_URL=http://localhost:8090/plantid/v2
+    HUGGING_FACE_BASE_URL=http://localhost:8090/huggingface/models
+    OPENWEATHER_BASE_URL=http://localhost:8090/openweather/data/2.5
+    PERENUAL_BASE_URL=http://localhost:8090/perenual/api
+
+Per provider you can set a latency distribution, error and 429 rates, a
+request quota per window, slow (trickled) response bodies and requests
+that hang. Settings can be changed while running through /__sim/config.
+Built on asyncio with keep-alive connections and no dependencies, so a
+single process serves thousands of requests per second. --processes runs
+more (Linux, SO_REUSEPORT).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+DEFAULT_PORT = 8090
+
+PROVIDERS = ["plantid", "huggingface", "openweather", "perenual"]
+
+# Path prefix -> provider; the rest of the path is the provider's own route
+PREFIXES = {
+    "/plantid/v2": "plantid",
+    "/huggingface/models": "huggingface",
+    "/openweather/data/2.5": "openweather",
+    "/perenual/api": "perenual",
+}
+
+DEFAULT_SETTINGS = {
+    "latency": "lognormal:80:0.4",  # ms; see parse_latency
+    "error_rate": 0.0,              # share answered with a 5xx
+    "rate_limit_rate": 0.0,         # share answered with a 429 regardless of quota
+    "quota": 0,                     # requests per quota_window, 0 = unlimited
+    "quota_window": 86400.0,        # seconds
+    "slow_body_rate": 0.0,          # share whose body is trickled out
+    "slow_body_ms": 2000.0,         # time taken to send a slow body
+    "hang_rate": 0.0,               # share that never answers
+    "hang_ms": 60000.0,             # how long a hanging request holds the connection
+}
+
+# Closer to what each API really does
+PROVIDER_DEFAULTS = {
+    "plantid": {"latency": "lognormal:1800:0.35"},
+    "huggingface": {"latency": "lognormal:700:0.5"},
+    "openweather": {"latency": "lognormal:120:0.4"},
+    "perenual": {"latency": "lognormal:350:0.4"},
+}
+
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+           411: "Length Required", 429: "Too Many Requests", 500: "Internal Server Error",
+           502: "Bad Gateway", 503: "Service Unavailable"}
+
+CITIES = [
+    ("Dhaka", 23.8103, 90.4125, 1185241), ("Chattogram", 22.3569, 91.7832, 1205733),
+    ("Sylhet", 24.8949, 91.8687, 1185099), ("Rajshahi", 24.3745, 88.6042, 1185128),
+    ("Khulna", 22.8456, 89.5403, 1336135), ("Barishal", 22.7010, 90.3535, 1336137),
+    ("Rangpur", 25.7439, 89.2752, 1185188), ("Mymensingh", 24.7471, 90.4203, 1337997),
+]
+CONDITIONS = [("Clear", "clear sky", "01d", 800), ("Clouds", "scattered clouds", "03d", 802),
+              ("Rain", "light rain", "10d", 500), ("Rain", "moderate rain", "10d", 501),
+              ("Thunderstorm", "thunderstorm", "11d", 211), ("Haze", "haze", "50d", 721)]
+
+DISEASES = [
+    ("Early blight", ["Remove infected lower leaves"], ["Copper fungicide every 7-10 days"],
+     ["Water at the base", "Rotate crops"]),
+    ("Late blight", ["Destroy infected plants"], ["Mancozeb spray"], ["Avoid overhead watering"]),
+    ("Powdery mildew", ["Spray diluted milk (1:9)"], ["Sulphur fungicide"], ["Improve air circulation"]),
+    ("Leaf spot", ["Prune affected leaves"], ["Chlorothalonil spray"], ["Keep foliage dry"]),
+    ("Aphid infestation", ["Neem oil spray", "Release ladybirds"], ["Imidacloprid"], ["Check leaf undersides weekly"]),
+    ("Nutrient deficiency", ["Add compost"], ["Balanced NPK fertilizer"], ["Test soil yearly"]),
+]
+PLANT_VILLAGE_LABELS = ["Tomato___Late_blight", "Tomato___Early_blight", "Tomato___healthy",
+                        "Pepper,_bell___Bacterial_spot", "Potato___Late_blight", "Squash___Powdery_mildew",
+                        "Tomato___Leaf_Mold", "Pepper,_bell___healthy"]
+
+SPECIES_WORDS = ["Golden", "Red", "Dwarf", "Giant", "Sweet", "Wild", "Bengal", "Silver", "Creeping", "Spotted"]
+SPECIES_NOUNS = ["Basil", "Fern", "Lily", "Gourd", "Chili", "Mint", "Jasmine", "Hibiscus", "Palm", "Bean",
+                 "Spinach", "Marigold", "Orchid", "Aloe", "Eggplant"]
+CYCLES = ["Perennial", "Annual", "Biennial", "Herbaceous Perennial"]
+WATERING = ["Frequent", "Average", "Minimum"]
+SUNLIGHT = [["full sun"], ["part shade"], ["full sun", "part shade"], ["full shade"]]
+PERENUAL_PAGE_SIZE = 30
+
+
+def parse_latency(spec: str):
+    """Latency sampler from a spec, in ms:
+    fixed:50, uniform:20:200, normal:100:30, lognormal:<median>:<sigma>, exp:<mean>
+    """
+    kind, *values = spec.split(":")
+    try:
+        numbers = [float(value) for value in values]
+        if kind == "fixed":
+            return lambda rng: numbers[0]
+        if kind == "uniform":
+            return lambda rng: rng.uniform(numbers[0], numbers[1])
+        if kind == "normal":
+            return lambda rng: max(0.0, rng.gauss(numbers[0], numbers[1]))
+        if kind == "lognormal":
+            return lambda rng: rng.lognormvariate(math.log(numbers[0]), numbers[1])
+        if kind == "exp":
+            return lambda rng: rng.expovariate(1 / numbers[0])
+    except (IndexError, ValueError):
+        pass
+    raise ValueError(f"bad latency spec '{spec}'")
+
+
+def coerce(key: str, value: Any) -> Any:
+    """Type a setting value given as a string (CLI) or JSON"""
+    if key not in DEFAULT_SETTINGS:
+        raise ValueError(f"unknown setting '{key}' (use {', '.join(DEFAULT_SETTINGS)})")
+    if key == "latency":
+        parse_latency(str(value))
+        return str(value)
+    if key == "quota":
+        return int(value)
+    return float(value)
+
+
+class ProviderState:
+    """Settings, quota window and counters of one simulated provider"""
+
+    def __init__(self, name: str, settings: Dict[str, Any]):
+        self.name = name
+        self.settings = {}
+        self.sample_latency = None
+        self.update(settings)
+        self.reset()
+
+    def update(self, changes: Dict[str, Any]):
+        for key, value in changes.items():
+            self.settings[key] = coerce(key, value)
+        self.sample_latency = parse_latency(self.settings["latency"])
+
+    def reset(self):
+        self.window_started = time.monotonic()
+        self.window_used = 0
+        self.counts = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0,
+                       "quota_exhausted": 0, "slow_bodies": 0, "hung": 0}
+
+    def take_quota(self) -> bool:
+        """Count one request against the quota; False once it is used up"""
+        quota = self.settings["quota"]
+        if not quota:
+            return True
+        now = time.monotonic()
+        if now - self.window_started >= self.settings["quota_window"]:
+            self.window_started = now
+            self.window_used = 0
+        if self.window_used >= quota:
+            return False
+        self.window_used += 1
+        return True
+
+    def quota_reset_in(self) -> int:
+        return max(1, int(self.settings["quota_window"] - (time.monotonic() - self.window_started)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counts, "quota_used": self.window_used, "settings": self.settings}
+
+
+class Simulator:
+    """Routes requests to provider handlers and applies the fault settings"""
+
+    def __init__(self, settings: Dict[str, Dict[str, Any]], seed: Optional[int] = None,
+                 species: int = 10000, require_keys: bool = False):
+        self.providers = {name: ProviderState(name, settings[name]) for name in PROVIDERS}
+        self.rng = random.Random(seed)
+        self.species = species
+        self.require_keys = require_keys
+        self.started = time.time()
+
+    # ---- Provider responses -------------------------------------------------
+
+    def plantid(self, method: str, path: str, query: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        if method != "POST" or path != "/health_assessment":
+            return 404, {"error": "Not found"}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "Invalid JSON"}
+        if not payload.get("images"):
+            return 400, {"error": "No images provided"}
+
+        rng = self.rng
+        healthy = rng.random() < 0.35
+        diseases = []
+        for name, biological, chemical, prevention in rng.sample(DISEASES, rng.randint(1, 4)):
+            diseases.append({
+                "name": name,
+                "probability": round(rng.uniform(0.05, 0.95), 3),
+                "disease_details": {
+                    "local_name": name,
+                    "description": f"{name} is common in humid conditions.",
+                    "treatment": {"biological": biological, "chemical": chemical, "prevention": prevention}
+                }
+            })
+        now = time.time()
+        return 200, {
+            "id": rng.randint(10 ** 7, 10 ** 8),
+            "custom_id": None,
+            "meta_data": {"date": time.strftime("%Y-%m-%d"), "datetime": time.strftime("%Y-%m-%d")},
+            "uploaded_datetime": now,
+            "finished_datetime": now + 1.5,
+            "images": [{"file_name": "image.jpg", "url": "https://plant.id/media/images/image.jpg"}],
+            "health_assessment": {
+                "is_healthy": healthy,
+                "is_healthy_probability": round(rng.uniform(0.6, 0.99) if healthy else rng.uniform(0.01, 0.4), 3),
+                "diseases": [] if healthy else diseases
+            },
+            "status": "COMPLETED"
+        }
+
+    def huggingface(self, method: str, path: str, query: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        if method != "POST" or len(path) <= 1:
+            return 404, {"error": "Model not found"}
+        if not body:
+            return 400, {"error": "No image provided"}
+        scores = [self.rng.random() ** 3 for _ in PLANT_VILLAGE_LABELS]
+        total = sum(scores)
+        predictions = [{"label": label, "score": round(score / total, 4)}
+                       for label, score in zip(PLANT_VILLAGE_LABELS, scores)]
+        return 200, sorted(predictions, key=lambda prediction: -prediction["score"])[:5]
+
+    def _city(self, query: Dict[str, str]) -> Optional[tuple]:
+        if "q" in query:
+            name = query["q"].split(",")[0].strip().lower()
+            return next((city for city in CITIES if city[0].lower() == name), None)
+        try:
+            lat, lon = float(query["lat"]), float(query["lon"])
+        except (KeyError, ValueError):
+            return None
+        return min(CITIES, key=lambda city: (city[1] - lat) ** 2 + (city[2] - lon) ** 2)
+
+    def _weather_slot(self, rng: random.Random, dt: int) -> Dict[str, Any]:
+        main, description, icon, code = rng.choice(CONDITIONS)
+        temp = round(rng.uniform(22, 36), 2)
+        slot = {
+            "dt": dt,
+            "main": {"temp": temp, "feels_like": round(temp + rng.uniform(0, 4), 2),
+                     "temp_min": temp - 1, "temp_max": temp + 1, "pressure": 1006,
+                     "humidity": rng.randint(55, 95)},
+            "weather": [{"id": code, "main": main, "description": description, "icon": icon}],
+            "clouds": {"all": rng.randint(0, 100)},
+            "wind": {"speed": round(rng.uniform(0.5, 8), 2), "deg": rng.randint(0, 359)},
+            "visibility": 10000,
+        }
+        if main in ("Rain", "Thunderstorm"):
+            slot["rain"] = {"1h": round(rng.uniform(0.2, 12), 2)}
+        return slot
+
+    def openweather(self, method: str, path: str, query: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        if method != "GET" or path not in ("/weather", "/forecast"):
+            return 404, {"cod": "404", "message": "Internal error"}
+        city = self._city(query)
+        if not city:
+            return 404, {"cod": "404", "message": "city not found"}
+        name, lat, lon, city_id = city
+        now = int(time.time())
+
+        if path == "/weather":
+            return 200, {
+                **self._weather_slot(self.rng, now),
+                "coord": {"lon": lon, "lat": lat},
+                "base": "stations",
+                "sys": {"country": "BD", "sunrise": now - 20000, "sunset": now + 20000},
+                "timezone": 21600,
+                "id": city_id,
+                "name": name,
+                "cod": 200
+            }
+
+        start = now - now % 10800 + 10800
+        slots = []
+        for i in range(40):
+            slot = self._weather_slot(self.rng, start + i * 10800)
+            if "rain" in slot:
+                slot["rain"] = {"3h": slot["rain"]["1h"] * 2}
+            slot["pop"] = round(self.rng.random(), 2)
+            slot["dt_txt"] = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(slot["dt"]))
+            slots.append(slot)
+        return 200, {
+            "cod": "200", "message": 0, "cnt": len(slots), "list": slots,
+            "city": {"id": city_id, "name": name, "coord": {"lat": lat, "lon": lon},
+                     "country": "BD", "timezone": 21600}
+        }
+
+    def perenual(self, method: str, path: str, query: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        if method != "GET" or path != "/species-list":
+            return 404, {"message": "Not Found"}
+        try:
+            page = max(1, int(query.get("page", 1)))
+        except ValueError:
+            page = 1
+        last_page = max(1, math.ceil(self.species / PERENUAL_PAGE_SIZE))
+        first = (page - 1) * PERENUAL_PAGE_SIZE + 1
+        ids = range(first, min(first + PERENUAL_PAGE_SIZE, self.species + 1))
+
+        data = []
+        for species_id in ids:
+            # Same species for the same id on every run
+            rng = random.Random(species_id)
+            common = f"{rng.choice(SPECIES_WORDS)} {rng.choice(SPECIES_NOUNS)} {species_id}"
+            data.append({
+                "id": species_id,
+                "common_name": common,
+                "scientific_name": [f"{rng.choice(SPECIES_NOUNS)}us {rng.choice(SPECIES_WORDS).lower()}is"],
+                "other_name": [f"{rng.choice(SPECIES_WORDS)} {rng.choice(SPECIES_NOUNS)}"] if rng.random() < 0.5 else [],
+                "cycle": rng.choice(CYCLES),
+                "watering": rng.choice(WATERING),
+                "sunlight": rng.choice(SUNLIGHT),
+                "default_image": {
+                    "license": 45,
+                    "thumbnail": f"https://perenual.com/storage/species_image/{species_id}/thumbnail.jpg"
+                } if rng.random() < 0.8 else None
+            })
+        return 200, {
+            "data": data, "to": first + len(data) - 1 if data else None, "per_page": PERENUAL_PAGE_SIZE,
+            "current_page": page, "from": first if data else None, "last_page": last_page,
+            "total": self.species
+        }
+
+    # ---- Faults ---------------------------------------------------------------
+
+    def _missing_key(self, provider: str, headers: Dict[str, str], query: Dict[str, str]) -> bool:
+        if provider == "plantid":
+            return not headers.get("api-key")
+        if provider == "huggingface":
+            return not headers.get("authorization", "").startswith("Bearer ")
+        if provider == "openweather":
+            return not query.get("appid")
+        return not query.get("key")
+
+    def _unauthorized(self, provider: str) -> Tuple[int, Any]:
+        if provider == "openweather":
+            return 401, {"cod": 401, "message": "Invalid API key. Please see https://openweathermap.org/faq#error401 for more info."}
+        return 401, {"error": "Invalid API key", "message": "Invalid API key"}
+
+    def _rate_limited(self, provider: str, exhausted: bool) -> Tuple[int, Any]:
+        if provider == "openweather":
+            return 429, {"cod": 429, "message": "Your account is temporary blocked due to exceeding of requests limitation of your subscription type."}
+        if provider == "plantid":
+            return 429, {"error": "Not enough credits" if exhausted else "Too many requests"}
+        if provider == "perenual":
+            return 429, {"X-RateLimit-Exceeded": "Surpassed API Rate Limit"}
+        return 429, {"error": "Rate limit reached. You reached free usage limit (reset hourly)."}
+
+    def _server_error(self, provider: str) -> Tuple[int, Any]:
+        if provider == "huggingface":
+            return 503, {"error": "Model is currently loading", "estimated_time": round(self.rng.uniform(10, 40), 1)}
+        if provider == "openweather":
+            return 500, {"cod": 500, "message": "Internal error"}
+        return self.rng.choice([500, 502, 503]), {"error": "Internal server error"}
+
+    async def handle(self, method: str, target: str, headers: Dict[str, str],
+                     body: bytes) -> Tuple[int, Any, Dict[str, str], Optional[float]]:
+        """Returns (status, body, extra headers, trickle ms); awaits the simulated latency"""
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if url.path.startswith("/__sim/"):
+            return self.control(method, url.path, body) + ({}, None)
+
+        prefix = next((prefix for prefix in PREFIXES if url.path.startswith(prefix + "/")), None)
+        if not prefix:
+            return 404, {"error": f"No simulated provider at {url.path}"}, {}, None
+        provider = PREFIXES[prefix]
+        state = self.providers[provider]
+        settings = state.settings
+        counts = state.counts
+        counts["requests"] += 1
+        rng = self.rng
+
+        if rng.random() < settings["hang_rate"]:
+            counts["hung"] += 1
+            await asyncio.sleep(settings["hang_ms"] / 1000)
+            raise ConnectionAbortedError("simulated hang")
+
+        await asyncio.sleep(state.sample_latency(rng) / 1000)
+        extra = {}
+        if self.require_keys and self._missing_key(provider, headers, query):
+            status, payload = self._unauthorized(provider)
+        elif not state.take_quota():
+            counts["quota_exhausted"] += 1
+            status, payload = self._rate_limited(provider, exhausted=True)
+            extra["Retry-After"] = str(state.quota_reset_in())
+        elif rng.random() < settings["rate_limit_rate"]:
+            counts["rate_limited"] += 1
+            status, payload = self._rate_limited(provider, exhausted=False)
+            extra["Retry-After"] = "1"
+        elif rng.random() < settings["error_rate"]:
+            counts["errors"] += 1
+            status, payload = self._server_error(provider)
+        else:
+            status, payload = getattr(self, provider)(method, url.path[len(prefix):], query, body)
+            if status == 200:
+                counts["ok"] += 1
+
+        trickle = None
+        if status == 200 and rng.random() < settings["slow_body_rate"]:
+            counts["slow_bodies"] += 1
+            trickle = settings["slow_body_ms"]
+        return status, payload, extra, trickle
+
+    # ---- Control endpoints ----------------------------------------------------
+
+    def control(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """GET /__sim/stats, POST /__sim/config {provider: {setting: value}}, POST /__sim/reset"""
+        if method == "GET" and path == "/__sim/stats":
+            return 200, {"pid": os.getpid(), "uptime": round(time.time() - self.started, 1),
+                         "providers": {name: state.stats() for name, state in self.providers.items()}}
+        if method == "POST" and path == "/__sim/reset":
+            for state in self.providers.values():
+                state.reset()
+            return 200, {"success": True}
+        if method == "POST" and path == "/__sim/config":
+            try:
+                changes = json.loads(body or b"{}")
+                for name, settings in changes.items():
+                    targets = PROVIDERS if name == "*" else [name]
+                    for target in targets:
+                        self.providers[target].update(settings)
+            except (ValueError, KeyError, AttributeError) as e:
+                return 400, {"success": False, "message": str(e)}
+            return 200, {"success": True,
+                         "providers": {name: state.settings for name, state in self.providers.items()}}
+        return 404, {"success": False, "message": "Unknown control endpoint"}
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[tuple]:
+    """One HTTP/1.1 request: (method, target, version, headers, body), or None at EOF"""
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, version = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b"".join(chunks)
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+    return method.upper(), target, version, headers, body
+
+
+async def write_response(writer: asyncio.StreamWriter, status: int, payload: Any,
+                         extra: Dict[str, str], keep_alive: bool, trickle_ms: Optional[float]):
+    body = json.dumps(payload).encode()
+    head = [f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    head += [f"{name}: {value}" for name, value in extra.items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode())
+
+    if not trickle_ms:
+        writer.write(body)
+        await writer.drain()
+        return
+
+    # Headers now, body in small pieces spread over trickle_ms
+    pieces = max(1, min(20, len(body)))
+    step = math.ceil(len(body) / pieces)
+    for start in range(0, len(body), step):
+        writer.write(body[start:start + step])
+        await writer.drain()
+        await asyncio.sleep(trickle_ms / 1000 / pieces)
+
+
+def serve(host: str, port: int, simulator: Simulator, reuse_port: bool = False):
+    async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                status, payload, extra, trickle = await simulator.handle(method, target, headers, body)
+                await write_response(writer, status, payload, extra, keep_alive, trickle)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(connection, host, port, reuse_port=reuse_port,
+                                            backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+def build_settings(overrides: List[str], config_path: Optional[str],
+                   defaults: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Per-provider settings: built-in defaults, then --config, then --set"""
+    settings = {name: {**DEFAULT_SETTINGS, **PROVIDER_DEFAULTS.get(name, {})} for name in PROVIDERS}
+    for name in PROVIDERS:
+        settings[name].update(defaults)
+
+    if config_path:
+        with open(config_path) as handle:
+            for name, values in json.load(handle).items():
+                for target in (PROVIDERS if name == "*" else [name]):
+                    settings[target].update(values)
+
+    for override in overrides:
+        key, _, value = override.partition("=")
+        name, _, setting = key.partition(".")
+        if not setting or (name != "*" and name not in PROVIDERS):
+            raise ValueError(f"bad --set '{override}' (use provider.setting=value)")
+        for target in (PROVIDERS if name == "*" else [name]):
+            settings[target][setting] = value
+
+    for name in PROVIDERS:
+        settings[name] = {key: coerce(key, value) for key, value in settings[name].items()}
+    return settings
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Simulate Plant.id, Hugging Face, OpenWeatherMap and Perenual")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port (default: %(default)s)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="server processes sharing the port; counters and quotas are per process")
+    parser.add_argument("--seed", type=int, help="random seed for response content and faults")
+    parser.add_argument("--latency", help="latency for every provider, e.g. fixed:50, uniform:20:200, "
+                                          "normal:100:30, lognormal:80:0.4, exp:100 (ms)")
+    parser.add_argument("--error-rate", type=float, help="share of requests answered with a 5xx")
+    parser.add_argument("--rate-limit-rate", type=float, help="share of requests answered with a 429")
+    parser.add_argument("--quota", type=int, help="requests allowed per --quota-window, then 429")
+    parser.add_argument("--quota-window", type=float, help="quota window in seconds (default: 86400)")
+    parser.add_argument("--slow-body-rate", type=float, help="share of responses whose body is trickled")
+    parser.add_argument("--slow-body-ms", type=float, help="time taken to trickle a slow body")
+    parser.add_argument("--hang-rate", type=float, help="share of requests that never get an answer")
+    parser.add_argument("--hang-ms", type=float, help="how long a hanging request holds the connection")
+    parser.add_argument("--set", action="append", default=[], metavar="PROVIDER.SETTING=VALUE",
+                        help="per-provider setting, e.g. plantid.quota=100 or huggingface.error_rate=0.2 "
+                             "('*' for all); repeatable")
+    parser.add_argument("--config", metavar="PATH",
+                        help='JSON file of settings, e.g. {"plantid": {"latency": "fixed:3000"}}')
+    parser.add_argument("--species", type=int, default=10000,
+                        help="species served by the Perenual species list (default: %(default)s)")
+    parser.add_argument("--require-keys", action="store_true",
+                        help="answer 401 when the provider's API key is missing")
+    return parser.parse_args()
+
+
+def run_process(args: argparse.Namespace, settings: Dict[str, Dict[str, Any]], index: int):
+    seed = None if args.seed is None else args.seed + index
+    simulator = Simulator(settings, seed=seed, species=args.species, require_keys=args.require_keys)
+    serve(args.host, args.port, simulator, reuse_port=args.processes > 1)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    defaults = {key: getattr(args, key) for key in DEFAULT_SETTINGS if getattr(args, key) is not None}
+    try:
+        settings = build_settings(args.set, args.config, defaults)
+    except (ValueError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    base = f"http://{'localhost' if args.host in ('127.0.0.1', '0.0.0.0') else args.host}:{args.port}"
+    print("🛰️  UrbanEos Provider Simulator")
+    print(f"🌐 Listening on {args.host}:{args.port} ({args.processes} process{'es' if args.processes > 1 else ''})")
+    for prefix, name in PREFIXES.items():
+        options = settings[name]
+        print(f"   {name:<12} {base}{prefix:<24} latency {options['latency']}, "
+              f"errors {options['error_rate']:g}, 429s {options['rate_limit_rate']:g}, "
+              f"quota {options['quota'] or 'none'}")
+    print(f"📊 Stats: {base}/__sim/stats   Config: POST {base}/__sim/config")
+    print("=" * 60)
+
+    if args.processes > 1:
+        if not hasattr(socket, "SO_REUSEPORT"):
+            print("❌ --processes needs SO_REUSEPORT (Linux)")
+            sys.exit(1)
+        workers = [multiprocessing.Process(target=run_process, args=(args, settings, index))
+                   for index in range(args.processes)]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+    else:
+        run_process(args, settings, 0)
@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+"""
+UrbanEos Synthetic Data Seeder
+Fills a MongoDB database with a reproducible, production-sized dataset
+(users, plants, tasks and community posts) for scale and performance testing.
+
+Documents follow the payload shapes used by UrbanEosBackendTester, with the
+fields the server adds on write (timestamps, derived plant health, post
+scores). Each post comes with the PostLike and Reply rows its counters
+describe. They are generated in fixed blocks, each from its own seeded random
+generator, and written with unordered insert_many calls from a pool of
+processes. The same --seed, --anchor and sizes always produce the same
+documents and ids, so an interrupted run can simply be started again:
+blocks already written are skipped as duplicates.
+
+Requires pymongo (pip install pymongo). Every seeded user can sign in with
+the tester's password.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+
+try:
+    from bson import ObjectId
+    from pymongo import MongoClient
+    from pymongo.errors import BulkWriteError
+except ImportError:
+    print("❌ seed_data.py needs pymongo: pip install pymongo")
+    sys.exit(1)
+
+from backend_test import DEFAULT_BASE_URL, UrbanEosBackendTester
+
+DEFAULT_MONGODB_URI = "mongodb://localhost:27017/urbaneos"
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "backend", "data", "plantCatalog.json")
+
+# Documents generated and inserted per job. Part of the dataset definition:
+# changing it changes what a given seed produces.
+BLOCK_SIZE = 1000
+
+# users, plants, tasks, posts
+SCALES = {
+    "small": (1000, 20000, 100000, 4000),
+    "medium": (10000, 200000, 1000000, 40000),
+    "full": (50000, 1000000, 5000000, 200000),
+}
+
+# Insert order; later collections reference earlier ones
+COLLECTIONS = ["users", "plants", "tasks", "posts"]
+# Rows written alongside their parent collection's blocks
+RELATED_COLLECTIONS = {"posts": ["postlikes", "replies"]}
+KIND_CODES = {"users": 1, "plants": 2, "tasks": 3, "posts": 4, "postlikes": 5, "replies": 6}
+
+DAY = timedelta(days=1)
+
+# Division -> (share of users, [(district, [areas])])
+DIVISIONS = {
+    "Dhaka": (0.36, [("Dhaka", ["Gulshan", "Dhanmondi", "Mirpur", "Uttara", "Mohammadpur", "Banani"]),
+                     ("Gazipur", ["Tongi", "Joydebpur"]),
+                     ("Narayanganj", ["Fatullah", "Siddhirganj"])]),
+    "Chattogram": (0.20, [("Chattogram", ["Agrabad", "Khulshi", "Panchlaish", "Halishahar"]),
+                          ("Cox's Bazar", ["Kolatoli", "Jhilongja"]),
+                          ("Cumilla", ["Kandirpar", "Tomsom Bridge"])]),
+    "Rajshahi": (0.10, [("Rajshahi", ["Shaheb Bazar", "Uposhohor"]), ("Bogura", ["Satmatha"])]),
+    "Khulna": (0.10, [("Khulna", ["Sonadanga", "Boyra"]), ("Jashore", ["Chanchra"])]),
+    "Sylhet": (0.07, [("Sylhet", ["Zindabazar", "Ambarkhana", "Upashahar"])]),
+    "Rangpur": (0.07, [("Rangpur", ["Jahaj Company More", "Dhap"]), ("Dinajpur", ["Balubari"])]),
+    "Barishal": (0.05, [("Barishal", ["Sadar Road", "Nathullabad"])]),
+    "Mymensingh": (0.05, [("Mymensingh", ["Ganginarpar", "Charpara"])]),
+}
+
+FIRST_NAMES = ["Tanvir", "Nusrat", "Rahim", "Fatema", "Arif", "Sadia", "Imran", "Farhana", "Kamal",
+               "Taslima", "Rafiq", "Jannat", "Sohel", "Mitu", "Habib", "Ayesha", "Mahmud", "Rumana",
+               "Shakil", "Nasrin", "Tauhid", "Sharmin", "Jahid", "Lamia"]
+LAST_NAMES = ["Rahman", "Hossain", "Islam", "Ahmed", "Chowdhury", "Akter", "Khan", "Uddin",
+              "Sarker", "Begum", "Talukder", "Haque", "Biswas", "Das", "Roy", "Miah"]
+
+GARDEN_TYPES = ["balcony", "rooftop", "indoor", "backyard"]
+SPACE_SIZES = ["small", "medium", "large"]
+EXPERIENCE = ["beginner", "intermediate", "expert"]
+LEVELS = [(500, "Budding Gardener"), (1500, "Growing Gardener"), (3000, "Blooming Gardener"),
+          (5000, "Expert Gardener"), (float("inf"), "Master Gardener")]
+
+PLANT_STATUSES = [("healthy", 70), ("attention", 15), ("sick", 5), ("harvested", 7), ("dead", 3)]
+PLANT_LOCATIONS = ["Rooftop Garden", "Kitchen Window", "Front Garden", "Balcony", "Backyard", "Living Room"]
+WATERING = [("Daily", 1), ("Every 2 days", 2), ("twice a week", 4), ("Weekly", 7)]
+NOTE_TYPES = ["observation", "action", "issue", "harvest"]
+NOTE_PHRASES = [
+    "New leaves coming in", "Soil was dry two inches down", "Moved to a sunnier spot",
+    "Added compost around the base", "Spotted aphids under the leaves, sprayed neem oil",
+    "Heavy rain overnight, checked drainage", "Flowers have started to set fruit",
+    "Yellowing on the lower leaves", "Pinched back the tips to make it bushier",
+    "Repotted into a larger tub with cocopeat mix", "Humidity is high this week",
+    "Staked the main stem before the storm",
+]
+HARVEST_UNITS = ["g", "kg", "pieces", "bunches"]
+HARVEST_QUALITY = ["excellent", "good", "fair", "poor"]
+
+TASK_TYPES = [("watering", 45), ("fertilizing", 15), ("pruning", 12), ("pest-control", 10),
+              ("harvesting", 8), ("other", 10)]
+TASK_VERBS = {"watering": "Water", "fertilizing": "Fertilize", "pruning": "Prune",
+              "pest-control": "Check for pests on", "harvesting": "Harvest", "other": "Look after"}
+PRIORITIES = ["low", "medium", "high"]
+TIMES = ["Morning", "Afternoon", "Evening", "Anytime"]
+
+POST_CATEGORIES = [("General", 20), ("Beginner Questions", 20), ("Plant Care", 20),
+                   ("Success Stories", 10), ("Problems", 15), ("DIY Projects", 8), ("Seasonal Tips", 7)]
+POST_TAGS = ["rooftop", "balcony", "tomato", "chili", "herbs", "compost", "pests", "monsoon",
+             "winter", "organic", "hydroponics", "seeds", "dhaka", "watering", "fertilizer"]
+POST_SENTENCES = [
+    "I started this garden on my rooftop last winter with a few tubs and some seeds from the local market.",
+    "The monsoon rain has been heavy, so I raised the pots on bricks to stop waterlogging.",
+    "Does anyone know why the leaves on my chili plants are curling upwards?",
+    "Mixing cocopeat with garden soil and vermicompost made a huge difference to drainage.",
+    "Neem oil spray every week has kept the aphids under control so far.",
+    "Tomatoes did really well in the rabi season, much better than my summer attempt.",
+    "I water early in the morning now because the afternoon sun dries everything out.",
+    "My balcony only gets four hours of sun, so herbs like mint and coriander work best.",
+    "Harvested almost two kilos of cucumbers this month from just three plants.",
+    "Any tips for keeping pigeons away from seedlings on an open roof?",
+]
+
+# Feed ranking, as in backend/utils/ranking.js
+HOT_EPOCH_SECONDS = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+HOT_DECAY_SECONDS = 45000
+REPLY_WEIGHT = 2
+EXCERPT_LENGTH = 200
+# Replies seeded per post at most; the Pareto tail is otherwise unbounded
+MAX_REPLIES = 500
+
+# Plant health, as in backend/utils/plantHealth.js
+OVERDUE_PENALTY_PER_DAY = 5
+STATUS_PENALTY = {"attention": 10, "sick": 30}
+
+
+def weighted(rng: random.Random, choices: List[tuple]) -> Any:
+    """Pick a value from (value, weight) pairs"""
+    return rng.choices([value for value, _ in choices], [weight for _, weight in choices])[0]
+
+
+def load_species() -> List[Dict[str, str]]:
+    """Plant names and types from the bundled catalogue, plus the tester's plants"""
+    species = []
+    try:
+        with open(CATALOG_PATH) as handle:
+            species = [{"name": entry["name"], "type": entry["type"], "image": entry.get("image", "🌱")}
+                       for entry in json.load(handle)]
+    except (OSError, ValueError):
+        pass
+    for payload in UrbanEosBackendTester(verbose=False).build_plant_payloads():
+        species.append({"name": payload["name"], "type": payload["type"],
+                        "variety": payload.get("variety"), "image": "🌱"})
+    return species
+
+
+class SeedPlan:
+    """Sizes, seed and timeline of a dataset, and the id and date of every
+    document in it. Anything one collection needs to know about another
+    (owner, ids, creation dates, species) is derived from indexes here, so
+    any block can be generated on its own."""
+
+    def __init__(self, seed: int, anchor: datetime, users: int, plants: int, tasks: int,
+                 posts: int, history_days: int, email_domain: str, password_hash: str):
+        self.seed = seed
+        self.anchor = anchor
+        self.counts = {"users": users, "plants": plants, "tasks": tasks, "posts": posts}
+        self.start = anchor - timedelta(days=history_days)
+        self.email_domain = email_domain
+        self.password_hash = password_hash
+        self.species = load_species()
+        self.template_user = UrbanEosBackendTester(verbose=False).test_user
+
+    def fraction(self, label: str, index: int) -> float:
+        """Stable pseudo-random number in [0, 1) for one document"""
+        digest = hashlib.blake2b(f"{self.seed}:{label}:{index}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2 ** 64
+
+    def rng(self, kind: str, block: int) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}:{block}")
+
+    def object_id(self, kind: str, index: int, created: datetime) -> ObjectId:
+        """Creation time, collection code and index, so ids sort by time and never collide"""
+        return ObjectId(int(created.timestamp()).to_bytes(4, "big")
+                        + bytes([KIND_CODES[kind]]) + index.to_bytes(7, "big"))
+
+    # Users sign up evenly over the history window
+    def user_created(self, index: int) -> datetime:
+        span = self.anchor - DAY - self.start
+        return self.start + span * ((index + 0.5) / self.counts["users"])
+
+    def user_id(self, index: int) -> ObjectId:
+        return self.object_id("users", index, self.user_created(index))
+
+    def user_plant_count(self, index: int) -> int:
+        users, plants = self.counts["users"], self.counts["plants"]
+        return plants // users + (1 if index < plants % users else 0)
+
+    # Plants are dealt round-robin to users and added after sign-up
+    def plant_owner(self, index: int) -> int:
+        return index % self.counts["users"]
+
+    def plant_created(self, index: int) -> datetime:
+        joined = self.user_created(self.plant_owner(index))
+        return joined + (self.anchor - joined) * self.fraction("plant-created", index)
+
+    def plant_id(self, index: int) -> ObjectId:
+        return self.object_id("plants", index, self.plant_created(index))
+
+    def plant_species(self, index: int) -> Dict[str, str]:
+        return self.species[int(self.fraction("plant-species", index) * len(self.species))]
+
+    # Early members write most posts
+    def post_author(self, index: int) -> int:
+        return int(self.counts["users"] * self.fraction("post-author", index) ** 2)
+
+    def post_row_id(self, kind: str, post: int, row: int, created: datetime) -> ObjectId:
+        """Id of the row-th like or reply of a post"""
+        return self.object_id(kind, (post << 24) + row, created)
+
+
+def build_user(plan: SeedPlan, rng: random.Random, index: int) -> Dict[str, Any]:
+    divisions = list(DIVISIONS)
+    division = rng.choices(divisions, [DIVISIONS[name][0] for name in divisions])[0]
+    district, areas = rng.choice(DIVISIONS[division][1])
+    created = plan.user_created(index)
+    full_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    points = int(rng.paretovariate(1.2) * 100) - 100
+    plant_count = plan.user_plant_count(index)
+
+    user = dict(plan.template_user)
+    user.update({
+        "_id": plan.user_id(index),
+        "fullName": full_name,
+        "email": f"gardener{index:07d}@{plan.email_domain}",
+        "password": plan.password_hash,
+        "avatar": full_name[0].upper(),
+        "location": {"city": district, "division": division, "district": district,
+                     "area": rng.choice(areas)},
+        "gardenType": rng.choice(GARDEN_TYPES),
+        "spaceSize": rng.choice(SPACE_SIZES),
+        "experience": rng.choices(EXPERIENCE, [55, 35, 10])[0],
+        "plants": sorted({species["name"] for species in rng.sample(plan.species, min(3, len(plan.species)))}),
+        "level": next(name for limit, name in LEVELS if points < limit),
+        "points": points,
+        "plantsGrown": plant_count,
+        "harvestsCompleted": rng.randint(0, plant_count),
+        "isEmailVerified": rng.random() < 0.6,
+        "isActive": rng.random() < 0.97,
+        "lastLogin": created + (plan.anchor - created) * rng.random(),
+        "createdAt": created,
+        "updatedAt": created,
+        "__v": 0
+    })
+    return user
+
+
+def build_plant(plan: SeedPlan, rng: random.Random, index: int) -> Dict[str, Any]:
+    species = plan.plant_species(index)
+    created = plan.plant_created(index)
+    planted = created - timedelta(days=rng.randint(0, 30))
+    status = weighted(rng, PLANT_STATUSES)
+    frequency, interval = rng.choice(WATERING)
+    last_watered = max(planted, plan.anchor - timedelta(days=rng.randint(0, interval + 6)))
+    next_watering = last_watered + timedelta(days=interval)
+
+    age_days = max(1, (plan.anchor - created).days)
+    notes = []
+    for _ in range(min(rng.randint(0, 15), age_days)):
+        notes.append({
+            "_id": ObjectId(rng.getrandbits(96).to_bytes(12, "big")),
+            "date": created + timedelta(days=rng.uniform(0, age_days)),
+            "content": ". ".join(rng.sample(NOTE_PHRASES, rng.randint(1, 3))),
+            "type": rng.choice(NOTE_TYPES)
+        })
+    notes.sort(key=lambda note: note["date"])
+
+    harvests = []
+    if species["type"] in ("Vegetable", "Fruit", "Herb") and age_days > 45:
+        for _ in range(rng.randint(0, 10)):
+            harvests.append({
+                "_id": ObjectId(rng.getrandbits(96).to_bytes(12, "big")),
+                "date": created + timedelta(days=rng.uniform(45, age_days)),
+                "quantity": round(rng.uniform(0.1, 3) if rng.random() < 0.5 else rng.randint(1, 40), 2),
+                "unit": rng.choice(HARVEST_UNITS),
+                "quality": rng.choice(HARVEST_QUALITY),
+                "notes": rng.choice(["", "First harvest of the season", "Smaller than last time",
+                                     "Shared with the neighbours"])
+            })
+        harvests.sort(key=lambda harvest: harvest["date"])
+
+    overdue = max(0, (plan.anchor - next_watering).days)
+    plant = {
+        "_id": plan.plant_id(index),
+        "user": plan.user_id(plan.plant_owner(index)),
+        "name": species["name"],
+        "type": species["type"],
+        "variety": species.get("variety") or rng.choice(["Local", "Hybrid", "Deshi", "Imported"]),
+        "image": species["image"],
+        "plantedDate": planted,
+        "daysGrowing": (plan.anchor - planted).days,
+        "health": max(0, min(100, 100 - overdue * OVERDUE_PENALTY_PER_DAY - STATUS_PENALTY.get(status, 0))),
+        "wateringOverdueDays": overdue,
+        "status": status,
+        "location": rng.choice(PLANT_LOCATIONS),
+        "careSchedule": {
+            "watering": {"frequency": frequency, "lastWatered": last_watered, "nextWatering": next_watering},
+            "fertilizing": {"frequency": rng.choice(["Every 2 weeks", "Monthly"])}
+        },
+        "notes": notes,
+        "harvestLog": harvests,
+        "isActive": status != "dead" or rng.random() < 0.5,
+        "createdAt": created,
+        "updatedAt": max([created] + [entry["date"] for entry in notes + harvests]),
+        "__v": 0
+    }
+    if species["type"] in ("Vegetable", "Fruit"):
+        plant["expectedHarvestDate"] = planted + timedelta(days=rng.randint(45, 120))
+    return plant
+
+
+def build_task(plan: SeedPlan, rng: random.Random, index: int) -> Dict[str, Any]:
+    plants = plan.counts["plants"]
+    # Most tasks belong to a plant; the rest are general garden chores
+    plant_index = index % plants if plants and rng.random() < 0.85 else None
+    if plant_index is not None:
+        owner = plan.plant_owner(plant_index)
+        created = plan.plant_created(plant_index)
+        plant_name = plan.plant_species(plant_index)["name"]
+    else:
+        owner = index % plan.counts["users"]
+        created = plan.user_created(owner)
+        plant_name = "General Garden"
+
+    task_type = weighted(rng, TASK_TYPES)
+    due = created + (plan.anchor + 14 * DAY - created) * rng.random()
+    if due < plan.anchor - DAY:
+        status = rng.choices(["completed", "cancelled", "pending"], [80, 5, 15])[0]
+    else:
+        status = rng.choices(["pending", "in-progress"], [85, 15])[0]
+    created = min(created + timedelta(hours=rng.uniform(0, 48)), due)
+
+    task = {
+        "_id": plan.object_id("tasks", index, created),
+        "user": plan.user_id(owner),
+        "plantName": plant_name,
+        "task": f"{TASK_VERBS[task_type]} {plant_name.lower()}",
+        "taskType": task_type,
+        "priority": rng.choices(PRIORITIES, [30, 50, 20])[0],
+        "status": status,
+        "dueDate": due,
+        "time": rng.choice(TIMES),
+        "reminder": {"enabled": rng.random() < 0.8},
+        "recurring": {"enabled": False},
+        "source": "user",
+        "createdAt": created,
+        "updatedAt": created,
+        "__v": 0
+    }
+    if plant_index is not None:
+        task["plant"] = plan.plant_id(plant_index)
+    if rng.random() < 0.3:
+        task["notes"] = rng.choice(NOTE_PHRASES)
+    if status == "completed":
+        task["completedAt"] = due + timedelta(hours=rng.uniform(-12, 36))
+        task["updatedAt"] = task["completedAt"]
+    return task
+
+
+def build_post(plan: SeedPlan, rng: random.Random, index: int) -> Dict[str, Any]:
+    author = plan.post_author(index)
+    joined = plan.user_created(author)
+    created = joined + (plan.anchor - joined) * rng.random()
+    category = weighted(rng, POST_CATEGORIES)
+    title = rng.choice(POST_SENTENCES).rstrip(".")
+    content = " ".join(rng.choice(POST_SENTENCES) for _ in range(rng.randint(2, 20)))
+    likes = min(int(rng.paretovariate(1.3)) - 1, plan.counts["users"])
+    replies = min(int(rng.paretovariate(1.6)) - 1, MAX_REPLIES)
+    score = likes + REPLY_WEIGHT * replies
+    last_activity = min(created + timedelta(hours=rng.uniform(0, 72)), plan.anchor) if replies else created
+
+    return {
+        "_id": plan.object_id("posts", index, created),
+        "author": plan.user_id(author),
+        "title": title if len(title) <= 80 else title[:80].rsplit(" ", 1)[0] + "…",
+        "content": content,
+        "category": category,
+        "tags": rng.sample(POST_TAGS, rng.randint(0, 4)),
+        "images": [],
+        "excerpt": (content[:EXCERPT_LENGTH].rstrip() + "…") if len(content) > EXCERPT_LENGTH else content,
+        "likeCount": likes,
+        "replyCount": replies,
+        "views": likes * rng.randint(5, 30) + rng.randint(0, 50),
+        "score": score,
+        "hotScore": math.log10(max(score, 1)) + (created.timestamp() - HOT_EPOCH_SECONDS) / HOT_DECAY_SECONDS,
+        "lastActivityAt": last_activity,
+        "isPinned": False,
+        "isResolved": category == "Problems" and rng.random() < 0.4,
+        "isActive": rng.random() < 0.98,
+        "createdAt": created,
+        "updatedAt": last_activity,
+        "__v": 0
+    }
+
+
+def build_post_activity(plan: SeedPlan, rng: random.Random, index: int,
+                        post: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """PostLike and Reply rows matching a post's likeCount and replyCount.
+
+    Likers are distinct users. Replies fall between the post and its
+    lastActivityAt, the last one exactly on it."""
+    created, last_activity = post["createdAt"], post["lastActivityAt"]
+
+    likes = []
+    for row, liker in enumerate(rng.sample(range(plan.counts["users"]), post["likeCount"])):
+        liked = min(created + timedelta(hours=rng.uniform(0, 72)), plan.anchor)
+        likes.append({"_id": plan.post_row_id("postlikes", index, row, liked), "post": post["_id"],
+                      "user": plan.user_id(liker), "createdAt": liked, "__v": 0})
+
+    offsets = sorted(rng.random() for _ in range(post["replyCount"] - 1)) + [1.0]
+    replies = []
+    for row, offset in enumerate(offsets[:post["replyCount"]]):
+        replied = created + (last_activity - created) * offset
+        replies.append({"_id": plan.post_row_id("replies", index, row, replied), "post": post["_id"],
+                        "author": plan.user_id(plan.post_author(rng.randrange(plan.counts["posts"]))),
+                        "content": rng.choice(POST_SENTENCES), "createdAt": replied,
+                        "updatedAt": replied, "__v": 0})
+
+    return {"postlikes": likes, "replies": replies}
+
+
+BUILDERS = {"users": build_user, "plants": build_plant, "tasks": build_task, "posts": build_post}
+RELATED_BUILDERS = {"posts": build_post_activity}
+
+# Per-process state for pool workers
+_plan: Optional[SeedPlan] = None
+_db = None
+
+
+def _init_worker(uri: str, plan: SeedPlan):
+    global _plan, _db
+    _plan = plan
+    _db = MongoClient(uri).get_default_database()
+
+
+def insert_documents(collection: str, documents: List[Dict[str, Any]]) -> tuple:
+    """Unordered insert; returns (inserted, skipped as already present)"""
+    if not documents:
+        return 0, 0
+    try:
+        _db[collection].insert_many(documents, ordered=False, bypass_document_validation=True)
+    except BulkWriteError as error:
+        errors = error.details.get("writeErrors", [])
+        if any(write_error["code"] != 11000 for write_error in errors):
+            raise
+        return error.details.get("nInserted", 0), len(errors)
+    return len(documents), 0
+
+
+def seed_block(kind: str, block: int) -> Dict[str, float]:
+    """Generate and insert one block, with its related rows; documents already
+    present are skipped"""
+    started = time.perf_counter()
+    first = block * BLOCK_SIZE
+    last = min(first + BLOCK_SIZE, _plan.counts[kind])
+    rng = _plan.rng(kind, block)
+    documents = {collection: [] for collection in [kind] + RELATED_COLLECTIONS.get(kind, [])}
+    for index in range(first, last):
+        document = BUILDERS[kind](_plan, rng, index)
+        documents[kind].append(document)
+        if kind in RELATED_BUILDERS:
+            for collection, rows in RELATED_BUILDERS[kind](_plan, rng, index, document).items():
+                documents[collection].extend(rows)
+    generated = time.perf_counter()
+
+    inserted = skipped = 0
+    for collection, batch in documents.items():
+        added, present = insert_documents(collection, batch)
+        inserted += added
+        skipped += present
+
+    return {
+        "inserted": inserted,
+        "skipped": skipped,
+        "generate_s": generated - started,
+        "insert_s": time.perf_counter() - generated
+    }
+
+
+class DatasetSeeder:
+    """Seeds each collection in turn, blocks in parallel across processes"""
+
+    def __init__(self, uri: str, plan: SeedPlan, workers: int):
+        self.uri = uri
+        self.plan = plan
+        self.workers = workers
+
+    def _seed_collection(self, pool: ProcessPoolExecutor, kind: str) -> Dict[str, float]:
+        total = self.plan.counts[kind]
+        blocks = (total + BLOCK_SIZE - 1) // BLOCK_SIZE
+        totals = {"documents": total, "inserted": 0, "skipped": 0, "generate_s": 0.0, "insert_s": 0.0}
+        if blocks == 0:
+            totals.update({"elapsed_s": 0.0, "docs_per_s": 0.0})
+            return totals
+
+        related = RELATED_COLLECTIONS.get(kind)
+        extra = f" (plus their {' and '.join(related)})" if related else ""
+        print(f"\n  📦 {kind}: {total:,} documents{extra} in {blocks:,} blocks")
+        started = time.perf_counter()
+        next_report = 0.1
+        jobs = [pool.submit(seed_block, kind, block) for block in range(blocks)]
+        for done, job in enumerate(as_completed(jobs), 1):
+            for key, value in job.result().items():
+                totals[key] += value
+            if done / blocks >= next_report or done == blocks:
+                elapsed = time.perf_counter() - started
+                written = totals["inserted"] + totals["skipped"]
+                print(f"    {done / blocks:>4.0%}  {written:>10,} docs  {written / elapsed:>9,.0f}/s")
+                next_report += 0.1
+
+        totals["elapsed_s"] = time.perf_counter() - started
+        totals["docs_per_s"] = totals["inserted"] / totals["elapsed_s"] if totals["elapsed_s"] > 0 else 0.0
+        return totals
+
+    def run(self) -> Dict[str, Dict[str, float]]:
+        counts = self.plan.counts
+        print("🌾 Starting UrbanEos Data Seeder")
+        print(f"🗄️  Database: {self.uri}")
+        print(f"🎲 Seed {self.plan.seed}, anchor {self.plan.anchor.date().isoformat()}, {self.workers} workers")
+        print(f"📐 {counts['users']:,} users, {counts['plants']:,} plants, "
+              f"{counts['tasks']:,} tasks, {counts['posts']:,} posts")
+        print("=" * 60)
+
+        report = {}
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.uri, self.plan)) as pool:
+            for kind in COLLECTIONS:
+                report[kind] = self._seed_collection(pool, kind)
+
+        self.print_report(report)
+        return report
+
+    def print_report(self, report: Dict[str, Dict[str, float]]):
+        print("\n" + "=" * 60)
+        print("🏁 SEEDING SUMMARY")
+        print("=" * 60)
+        print(f"{'Collection':<12}{'Inserted':>12}{'Skipped':>10}{'Elapsed':>10}{'Docs/s':>11}{'Gen %':>8}")
+        inserted = elapsed = 0.0
+        for kind, totals in report.items():
+            busy = totals["generate_s"] + totals["insert_s"]
+            generate_share = totals["generate_s"] / busy * 100 if busy > 0 else 0.0
+            print(f"{kind:<12}{totals['inserted']:>12,}{totals['skipped']:>10,}"
+                  f"{totals['elapsed_s']:>9.1f}s{totals['docs_per_s']:>11,.0f}{generate_share:>7.0f}%")
+            inserted += totals["inserted"]
+            elapsed += totals["elapsed_s"]
+        if elapsed > 0:
+            print(f"\nOverall: {inserted:,.0f} documents in {elapsed:.1f}s ({inserted / elapsed:,.0f}/s)")
+        print("'Gen %' is the share of worker time spent building documents rather than inserting them.")
+        print("Start the server (or run npm run audit:indexes) to build indexes, and "
+              "npm run recompute:health to refresh derived plant fields later.")
+
+
+def resolve_password_hash(args: argparse.Namespace, uri: str) -> str:
+    """bcrypt hash of the tester's password, for every seeded user.
+
+    Uses --password-hash, else the bcrypt package, else registers one
+    account through the API and copies the hash the server stored.
+    """
+    if args.password_hash:
+        return args.password_hash
+
+    password = UrbanEosBackendTester(verbose=False).test_user["password"]
+    try:
+        import bcrypt
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(10, prefix=b"2a")).decode()
+    except ImportError:
+        pass
+
+    tester = UrbanEosBackendTester(args.base_url, email=f"seed_template_{args.seed}@{args.email_domain}",
+                                   verbose=False)
+    tester.test_user_registration()
+    stored = MongoClient(uri).get_default_database()["users"].find_one(
+        {"email": tester.test_user["email"]}, {"password": 1})
+    if not stored:
+        print("❌ Could not get a password hash: install bcrypt, pass --password-hash, "
+              "or point --base-url at a running server")
+        sys.exit(1)
+    return stored["password"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed MongoDB with a reproducible UrbanEos dataset")
+    parser.add_argument("--mongodb-uri", default=os.environ.get("MONGODB_URI", DEFAULT_MONGODB_URI),
+                        help="database to fill (default: $MONGODB_URI or %(default)s)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small",
+                        help="preset sizes: small, medium, or full (50k users, 1M plants, 5M tasks, 200k posts)")
+    parser.add_argument("--users", type=int, help="override the preset user count")
+    parser.add_argument("--plants", type=int, help="override the preset plant count")
+    parser.add_argument("--tasks", type=int, help="override the preset task count")
+    parser.add_argument("--posts", type=int, help="override the preset post count")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: %(default)s)")
+    parser.add_argument("--anchor", help="'today' for the dataset as YYYY-MM-DD (default: today, UTC)")
+    parser.add_argument("--history-days", type=int, default=730,
+                        help="days of history before the anchor (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="parallel generator/insert processes (default: CPU count)")
+    parser.add_argument("--email-domain", default="seed.urbaneos.com",
+                        help="domain for seeded user emails (default: %(default)s)")
+    parser.add_argument("--password-hash", help="bcrypt hash to store for every seeded user")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL,
+                        help="API used to obtain a password hash when bcrypt is not installed")
+    parser.add_argument("--drop", action="store_true",
+                        help="drop the users, plants, tasks, posts, postlikes and replies collections first")
+    parser.add_argument("--report", metavar="PATH", help="write the throughput report as JSON")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    users, plants, tasks, posts = SCALES[args.scale]
+    users = args.users if args.users is not None else users
+    plants = args.plants if args.plants is not None else plants
+    tasks = args.tasks if args.tasks is not None else tasks
+    posts = args.posts if args.posts is not None else posts
+    if users < 1:
+        print("❌ At least one user is needed")
+        sys.exit(1)
+
+    if args.anchor:
+        anchor = datetime.strptime(args.anchor, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    else:
+        anchor = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if args.drop:
+        database = MongoClient(args.mongodb_uri).get_default_database()
+        dropped = COLLECTIONS + [related for kind in COLLECTIONS for related in RELATED_COLLECTIONS.get(kind, [])]
+        for collection in dropped:
+            database.drop_collection(collection)
+        print(f"🗑️  Dropped {', '.join(dropped)}")
+
+    plan = SeedPlan(args.seed, anchor, users, plants, tasks, posts, args.history_days,
+                    args.email_domain, resolve_password_hash(args, args.mongodb_uri))
+    report = DatasetSeeder(args.mongodb_uri, plan, args.workers).run()
+
+    if args.report:
+        with open(args.report, "w") as handle:
+            json.dump({
+                "meta": {"seed": args.seed, "anchor": anchor.date().isoformat(),
+                         "workers": args.workers, "block_size": BLOCK_SIZE, "counts": plan.counts},
+                "collections": report
+            }, handle, indent=2)
+        print(f"\n💾 Report written to {os.path.abspath(args.report)}")